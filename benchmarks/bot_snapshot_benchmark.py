@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures the memory retained by BotSnapshot instances and the time spent
+building them from the decoded player data, per frame (two snapshots),
+against a baseline snapshot keeping its fields in a dict and converting
+every enum and flag eagerly, the way BotSnapshot used to.
+
+Run from the repository root:
+    python -m benchmarks.bot_snapshot_benchmark
+"""
+import argparse
+import random
+import sys
+import timeit
+import tracemalloc
+
+from config import ReloadableConfig
+from constants.battle import BattleSide, CharacterIDs
+from constants.input import InputAttack, InputDirection
+from log import LogUtils
+from tekken.bot_snapshot import BotSnapshot
+# pylint: disable=wildcard-import
+from MoveInfoEnums import *  # NOQA
+
+from .synthetic_frames import get_bot_data_dict
+
+class DictBotSnapshot():
+    """
+    Baseline snapshot, with an instance dict and the enums and flags
+    converted when built.
+    """
+    def __init__(self, data_dict):
+        """
+        """
+        self.move_id = data_dict['PlayerDataAddress.move_id']
+        self.simple_state = SimpleMoveStates(
+            data_dict['PlayerDataAddress.simple_move_state']
+        )
+        self.attack_type = AttackType(
+            data_dict['PlayerDataAddress.attack_type']
+        )
+        self.startup = data_dict['PlayerDataAddress.attack_startup']
+        self.startup_end = data_dict['PlayerDataAddress.attack_startup_end']
+        self.attack_damage = data_dict['PlayerDataAddress.attack_damage']
+        self.complex_state = ComplexMoveStates(
+            data_dict['PlayerDataAddress.complex_move_state']
+        )
+        self.damage_taken = data_dict['PlayerDataAddress.damage_taken']
+        self.move_timer = data_dict['PlayerDataAddress.move_timer']
+        self.recovery = data_dict['PlayerDataAddress.recovery']
+        self.char_id = data_dict['PlayerDataAddress.char_id']
+        self.throw_flag = data_dict['PlayerDataAddress.throw_flag']
+        self.rage_flag = data_dict['PlayerDataAddress.rage_flag']
+        self.input_counter = data_dict['PlayerDataAddress.input_counter']
+        self.input_direction = InputDirection(
+            data_dict['PlayerDataAddress.input_direction']
+        )
+        try:
+            self.input_button = InputAttack(
+                data_dict['PlayerDataAddress.input_attack']
+            )
+        except ValueError:
+            self.input_button = InputAttack.NULL
+        self.rage_button_flag = (
+            data_dict['PlayerDataAddress.input_attack']
+            >= InputAttack.B_RAGE.value
+        )
+        self.stun_state = StunStates(data_dict['PlayerDataAddress.stun_type'])
+        self.is_power_crush = data_dict['PlayerDataAddress.power_crush'] > 0
+
+        cancel_window_bitmask = data_dict['PlayerDataAddress.cancel_window']
+        recovery_window_bitmask = data_dict['PlayerDataAddress.recovery']
+        self.is_cancelable = (
+            (CancelStatesBitmask.CANCELABLE.value & cancel_window_bitmask)
+            == CancelStatesBitmask.CANCELABLE.value
+        )
+        self.is_bufferable = (
+            (CancelStatesBitmask.BUFFERABLE.value & cancel_window_bitmask)
+            == CancelStatesBitmask.BUFFERABLE.value
+        )
+        self.is_parry1 = (
+            (CancelStatesBitmask.PARRYABLE_1.value & cancel_window_bitmask)
+            == CancelStatesBitmask.PARRYABLE_1.value
+        )
+        self.is_parry2 = (
+            (CancelStatesBitmask.PARRYABLE_2.value & cancel_window_bitmask)
+            == CancelStatesBitmask.PARRYABLE_2.value
+        )
+        self.is_recovering = (
+            (ComplexMoveStates.RECOVERING.value & recovery_window_bitmask)
+            == ComplexMoveStates.RECOVERING.value
+        )
+        self.is_starting = self.startup > 0 and self.move_timer <= self.startup
+        self.throw_tech = ThrowTechs(data_dict['PlayerDataAddress.throw_tech'])
+        self.skeleton = (
+            data_dict['PlayerDataAddress.x'], data_dict['PlayerDataAddress.y'],
+            data_dict['PlayerDataAddress.z']
+        )
+        self.active_xyz = (
+            data_dict['PlayerDataAddress.activebox_x'],
+            data_dict['PlayerDataAddress.activebox_y'],
+            data_dict['PlayerDataAddress.activebox_z']
+        )
+        self.is_jump = (
+            data_dict['PlayerDataAddress.jump_flags']
+            & JumpFlagBitmask.JUMP.value == JumpFlagBitmask.JUMP.value
+        )
+        self.hit_outcome = HitOutcome(
+            data_dict['PlayerDataAddress.hit_outcome']
+        )
+        self.mystery_state = data_dict['PlayerDataAddress.mystery_state']
+        self.current_side = BattleSide(
+            data_dict['PlayerDataAddress.current_side']
+        )
+        self.wins = data_dict['EndBlockPlayerDataAddress.round_wins']
+        self.combo_counter = (
+            data_dict['EndBlockPlayerDataAddress.display_combo_counter']
+        )
+        self.combo_damage = (
+            data_dict['EndBlockPlayerDataAddress.display_combo_damage']
+        )
+        self.juggle_damage = (
+            data_dict['EndBlockPlayerDataAddress.display_juggle_damage']
+        )
+        self.use_opponents_movelist = data_dict['use_opponent_movelist']
+        self.movelist_parser = data_dict['movelist_parser']
+        try:
+            self.character_name = CharacterIDs(
+                data_dict['PlayerDataAddress.char_id']
+            ).name
+        except ValueError:
+            self.character_name = 'UNKNOWN'
+
+def measure(snapshot_class, data_dicts):
+    """
+    Return the bytes retained and peak, and the seconds spent, per frame,
+    building the snapshots of every frame with the given class.
+    """
+    # the lookup tables and loggers are not part of the per frame cost
+    snapshot_class(data_dicts[0][0])
+
+    tracemalloc.start()
+    start_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    snapshots = [
+        (snapshot_class(bot_data), snapshot_class(opp_data))
+        for bot_data, opp_data in data_dicts
+    ]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = timeit.timeit(
+        lambda: [
+            (snapshot_class(bot_data), snapshot_class(opp_data))
+            for bot_data, opp_data in data_dicts
+        ],
+        number=1
+    )
+    return (
+        (size - start_size) / len(snapshots),
+        (peak - start_size) / len(snapshots),
+        seconds / len(snapshots)
+    )
+
+def main():
+    """
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    LogUtils()
+    config = ReloadableConfig('data/memory_address.ini', parse=True)
+    generator = random.Random(args.seed)
+    data_dicts = [
+        (
+            get_bot_data_dict(config, generator, frame, False),
+            get_bot_data_dict(config, generator, frame, True)
+        )
+        for frame in range(args.frames)
+    ]
+
+    results = dict()
+    for name, snapshot_class in (
+            ('baseline', DictBotSnapshot), ('BotSnapshot', BotSnapshot)
+    ):
+        results[name] = measure(snapshot_class, data_dicts)
+        sys.stdout.write(
+            '{:>11} {} frames: {:.0f} bytes retained, {:.0f} bytes peak, '
+            '{:.2f} us per frame\n'.format(
+                name, len(data_dicts), results[name][0], results[name][1],
+                results[name][2] * 1e6
+            )
+        )
+    sys.stdout.write(
+        '{:.2f}x less memory retained, {:.2f}x faster\n'.format(
+            results['baseline'][0] / results['BotSnapshot'][0],
+            results['baseline'][2] / results['BotSnapshot'][2]
+        )
+    )
+
+if __name__ == '__main__':
+    main()
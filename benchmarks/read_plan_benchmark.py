@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares reading the whole rollback copies of the player data block against
+reading only the ranges of the compiled read plan.
+
+Run from the repository root:
+    python -m benchmarks.read_plan_benchmark
+"""
+import argparse
+import ctypes
+import os
+import sys
+import timeit
+
+from config import ReloadableConfig
+from memory.source import MemorySource
+from tekken.game_reader import TekkenGameReader
+from tekken.read_plan import ReadPlan, SparseBlock
+
+def main():
+    """
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--blocks', type=int, default=1)
+    parser.add_argument('--polls', type=int, default=2000)
+    parser.add_argument(
+        '--gap-threshold', type=lambda x: int(x, 0), default=None
+    )
+    args = parser.parse_args()
+
+    config = ReloadableConfig('data/memory_address.ini', parse=True)
+    read_plan = ReadPlan.from_config(config, args.gap_threshold)
+    block_size = config['MemoryAddressOffsets']['rollback_frame_offset']
+
+    # the own process memory stands in for the rollback copies of the game
+    blocks = bytearray(
+        os.urandom(TekkenGameReader.ROLLBACK_FRAMES * block_size)
+    )
+    base_address = ctypes.addressof(
+        (ctypes.c_char * len(blocks)).from_buffer(blocks)
+    )
+    addresses = [
+        base_address + i * block_size for i in range(args.blocks)
+    ]
+    memory_source = MemorySource.for_platform()
+    pid = os.getpid()
+
+    full_requests = [(address, block_size) for address in addresses]
+    sparse_requests = list()
+    for address in addresses:
+        sparse_requests.extend(read_plan.get_requests(address))
+
+    def read_full():
+        return memory_source.readv(pid, full_requests)
+
+    def read_sparse():
+        buffer = bytearray(len(addresses) * read_plan.size)
+        memory_source.readv_into(pid, sparse_requests, buffer)
+        view = memoryview(buffer)
+        return [
+            SparseBlock(read_plan, view[offset:offset + read_plan.size])
+            for offset in range(0, len(buffer), read_plan.size)
+        ]
+
+    for full_block, sparse_block in zip(read_full(), read_sparse()):
+        for start, size in read_plan.ranges:
+            assert full_block[start:start + size] == (
+                sparse_block[start:start + size]
+            )
+
+    sys.stdout.write('{}\n'.format(read_plan))
+    for name, function, requests in (
+            ('full', read_full, full_requests),
+            ('sparse', read_sparse, sparse_requests)
+    ):
+        seconds = timeit.timeit(function, number=args.polls)
+        sys.stdout.write(
+            '{:>6}: {:>4} ranges, {:>7} bytes, {:8.2f} us per poll\n'.format(
+                name, len(requests), sum(size for _, size in requests),
+                seconds / args.polls * 1e6
+            )
+        )
+    memory_source.invalidate()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Replays recorded matches through the launcher pipeline and reports, for
+every stage of a poll, the mean, 99th percentile and max time per call, and
+the memory it allocates, as JSON, so runs can be compared across commits.
+
+The recordings must use the RAW encoding of the FrameRecorder. Run from the
+repository root:
+    python -m benchmarks.stage_benchmark recordings/*.tkrec \
+        --output stages.json
+"""
+import argparse
+import copy
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from constants.event import EncyclopediaEvent
+from log import LogUtils
+from patterns.observer import Subscriber
+from tekken import Launcher
+from tekken.parsers import MovelistParser
+from tekken.recording import RecordKind, RecordingReader, ReplayIOManager
+from tekken.recording import recording_format
+
+STAGES = (
+    'block_decode', 'bot_snapshot', 'update_game_state', 'cyclopedia_p1',
+    'cyclopedia_p2', 'movelist_parser', 'overlay_strings'
+)
+
+class StageTimer():
+    """
+    Wraps the functions of a stage to record the time of every call, or,
+    when tracing allocations, the bytes allocated by every call.
+    """
+    def __init__(self, trace_allocations):
+        self.trace_allocations = trace_allocations
+        self.samples = {stage: list() for stage in STAGES}
+
+    def wrap(self, stage, function):
+        """
+        """
+        samples = self.samples[stage]
+        if self.trace_allocations:
+            def traced_function(*args, **kwargs):
+                tracemalloc.reset_peak()
+                start_size, _ = tracemalloc.get_traced_memory()
+                result = function(*args, **kwargs)
+                _, peak = tracemalloc.get_traced_memory()
+                samples.append(peak - start_size)
+                return result
+            return traced_function
+
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter_ns()
+            result = function(*args, **kwargs)
+            samples.append(time.perf_counter_ns() - start)
+            return result
+        return timed_function
+
+class NullStream():
+    """
+    Standard output replacement converting the console messages of the
+    encyclopedias to strings, the way the console does, and dropping them.
+    """
+    def write(self, data):
+        """
+        """
+        str(data)
+
+    def flush(self):
+        """
+        """
+
+def replay(path, stage_timer, frame_data_entries):
+    """
+    Run the launcher over a recording with its stages wrapped, and collect
+    the frame data entries published by the encyclopedias.
+    """
+    launcher = Launcher(None, game_io_manager=ReplayIOManager(path))
+    # the encyclopedia keeps updating the entry of each move
+    launcher.encyclopedia_publisher.register(
+        EncyclopediaEvent.FRAME_DATA, Subscriber(),
+        lambda frame_data_entry, is_player_one: frame_data_entries.append(
+            copy.copy(frame_data_entry)
+        )
+    )
+    game_state = launcher.game_state
+    reader = game_state.get_reader()
+    decoder = reader.get_player_data_decoder()
+    decoder.decode = stage_timer.wrap('block_decode', decoder.decode)
+    reader.initialize_bots = stage_timer.wrap(
+        'bot_snapshot', reader.initialize_bots
+    )
+    # private, dropped frame catch up included
+    game_state._TekkenGameState__update_game_state = stage_timer.wrap(
+        'update_game_state', game_state._TekkenGameState__update_game_state
+    )
+    launcher.cyclopedia_p1.update = stage_timer.wrap(
+        'cyclopedia_p1', launcher.cyclopedia_p1.update
+    )
+    launcher.cyclopedia_p2.update = stage_timer.wrap(
+        'cyclopedia_p2', launcher.cyclopedia_p2.update
+    )
+
+    stdout = sys.stdout
+    sys.stdout = NullStream()
+    try:
+        launcher.run_headless()
+    finally:
+        sys.stdout = stdout
+    return len(game_state.match_history)
+
+def parse_movelists(path, stage_timer):
+    """
+    """
+    parse = stage_timer.wrap('movelist_parser', MovelistParser)
+    for kind, body in RecordingReader(path).iterate_records():
+        if kind == RecordKind.MOVELIST:
+            _, movelist_address = (
+                recording_format.MOVELIST_HEADER.unpack_from(body)
+            )
+            parse(
+                bytes(body[recording_format.MOVELIST_HEADER.size:]),
+                movelist_address
+            )
+
+def process_overlay_strings(frame_data_entries, stage_timer):
+    """
+    Render the frame data entries into the columns of the frame data
+    overlay, the way its write_frame_data does before inserting them into
+    its textbox. Return the reason the stage was skipped, if the GUI
+    dependencies are missing.
+    """
+    try:
+        from constants.overlay.frame_data import Columns
+        from gui.my_tkinter.overlay.frame_data_overlay import (
+            FrameDataOverlay
+        )
+    except ImportError as exception:
+        return str(exception)
+    # private static helper, the rest of the processing updates widgets
+    generate_column_string = (
+        FrameDataOverlay._FrameDataOverlay__generate_column_string
+    )
+
+    def process_entry(frame_data_entry):
+        return generate_column_string(
+            *[
+                (column.value, frame_data_entry.get_column_string(column))
+                for column in Columns
+            ]
+        )
+
+    process_entry = stage_timer.wrap('overlay_strings', process_entry)
+    for frame_data_entry in frame_data_entries:
+        process_entry(frame_data_entry)
+    return None
+
+def get_percentile(sorted_samples, percentile):
+    """
+    """
+    index = round(percentile / 100 * (len(sorted_samples) - 1))
+    return sorted_samples[index]
+
+def get_commit():
+    """
+    """
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', 'HEAD'), capture_output=True, check=True,
+            text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(paths, trace_allocations):
+    """
+    Return the stage samples of every recording, and the number of frames
+    and the overlay skip reason.
+    """
+    stage_timer = StageTimer(trace_allocations)
+    frame_data_entries = list()
+    frames = 0
+    for path in paths:
+        frames += replay(path, stage_timer, frame_data_entries)
+        parse_movelists(path, stage_timer)
+    overlay_skip_reason = process_overlay_strings(
+        frame_data_entries, stage_timer
+    )
+    return stage_timer.samples, frames, overlay_skip_reason
+
+def main():
+    """
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('recordings', nargs='+')
+    parser.add_argument(
+        '--output', help='JSON file, the standard output by default'
+    )
+    args = parser.parse_args()
+
+    LogUtils()
+    time_samples, frames, overlay_skip_reason = run(args.recordings, False)
+    tracemalloc.start()
+    allocation_samples, _, _ = run(args.recordings, True)
+    tracemalloc.stop()
+
+    stages = dict()
+    for stage in STAGES:
+        times = sorted(time_samples[stage])
+        allocations = sorted(allocation_samples[stage])
+        if not times:
+            stages[stage] = {
+                'calls': 0,
+                'skipped': overlay_skip_reason
+                if stage == 'overlay_strings' else None
+            }
+            continue
+        stages[stage] = {
+            'calls': len(times),
+            'mean_us': sum(times) / len(times) / 1e3,
+            'p99_us': get_percentile(times, 99) / 1e3,
+            'max_us': times[-1] / 1e3,
+            'mean_allocated_bytes': sum(allocations) / len(allocations),
+            'p99_allocated_bytes': get_percentile(allocations, 99),
+            'max_allocated_bytes': allocations[-1]
+        }
+
+    result = json.dumps(
+        {
+            'commit': get_commit(),
+            'python': platform.python_version(),
+            'recordings': args.recordings,
+            'frames': frames,
+            'stages': stages
+        },
+        indent=4
+    )
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(result + '\n')
+    else:
+        sys.stdout.write(result + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the game state history queries scanning the snapshots, as they
+used to, against the same queries over the columnar state log, on a full
+window of synthetic frames.
+
+Run from the repository root:
+    python -m benchmarks.state_log_benchmark
+"""
+import argparse
+import random
+import sys
+import timeit
+
+from config import ReloadableConfig
+from log import LogUtils
+from MoveDataReport import MoveDataReport
+from tekken.bot_snapshot import BotSnapshot
+from tekken.game_snapshot import GameSnapshot
+from tekken.game_state import TekkenGameState
+from tekken.state_log import StateLog
+
+from .synthetic_frames import get_bot_data_dict
+
+def get_recovery_of_move_id(state_log, move_id):
+    """
+    """
+    largest_time = -1
+    for state in reversed(state_log):
+        if state.bot.move_id == move_id:
+            largest_time = max(largest_time, state.bot.move_timer)
+    return largest_time
+
+def get_last_move_id(state_log):
+    """
+    """
+    for state in reversed(state_log):
+        if state.bot.startup > 0:
+            return state.bot.move_id
+    return -1
+
+def get_opp_technical_states(state_log, startup):
+    """
+    """
+    frames = [list() for _ in range(11)]
+    previous_state = None
+    skipped_frames_counter = 0
+    for i, state in enumerate(reversed(state_log[-startup:])):
+        if previous_state is not None:
+            is_skipped = (
+                state.opp.move_timer != previous_state.opp.move_timer - 1
+            )
+            if is_skipped:
+                skipped_frames_counter += 1
+            is_frozen = state.bot.move_timer == previous_state.bot.move_timer
+        else:
+            is_skipped = False
+            is_frozen = False
+        if skipped_frames_counter + i <= startup:
+            for frame_list, value in zip(
+                    frames, (
+                        state.opp.is_technical_crouch(),
+                        state.opp.is_technical_jump(),
+                        state.opp.is_bufferable, state.opp.is_cancelable,
+                        state.opp.is_power_crush, state.opp.is_homing1(),
+                        state.opp.is_homing2(), is_skipped, is_frozen,
+                        state.opp.is_parry1, state.opp.is_parry2
+                    )
+            ):
+                frame_list.append(value)
+        previous_state = state
+    return [MoveDataReport('', frame_list) for frame_list in frames[:9]]
+
+def get_report_pairs(reports):
+    """
+    """
+    return [report.start_stop_pairs for report in reports]
+
+def main():
+    """
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--frames', type=int, default=StateLog.DEFAULT_CAPACITY
+    )
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    LogUtils()
+    config = ReloadableConfig('data/memory_address.ini', parse=True)
+    generator = random.Random(args.seed)
+    game_state = TekkenGameState()
+    for frame in range(args.frames):
+        game_state.state_log.append(
+            GameSnapshot(
+                BotSnapshot(
+                    get_bot_data_dict(config, generator, frame, False)
+                ),
+                BotSnapshot(
+                    get_bot_data_dict(config, generator, frame, True)
+                ),
+                frame, 0, True, '', True
+            )
+        )
+
+    state_log = game_state.state_log
+    startup = 15
+    queries = (
+        (
+            'get_recovery_of_move_id',
+            lambda: get_recovery_of_move_id(state_log, 101),
+            lambda: game_state.get_recovery_of_move_id(101)
+        ),
+        (
+            'get_last_move_id',
+            lambda: get_last_move_id(state_log),
+            game_state.get_last_move_id
+        ),
+        (
+            'get_opp_technical_states',
+            lambda: get_report_pairs(
+                get_opp_technical_states(state_log, startup)
+            ),
+            lambda: get_report_pairs(
+                game_state.get_opp_technical_states(startup)
+            )
+        )
+    )
+
+    sys.stdout.write(
+        '{} frames, {} calls per query\n'.format(len(state_log), args.repeat)
+    )
+    for name, snapshot_query, columnar_query in queries:
+        assert snapshot_query() == columnar_query(), name
+        snapshot_seconds = timeit.timeit(snapshot_query, number=args.repeat)
+        columnar_seconds = timeit.timeit(columnar_query, number=args.repeat)
+        sys.stdout.write(
+            '{:<40} snapshots {:8.2f} us, columns {:8.2f} us\n'.format(
+                name,
+                snapshot_seconds / args.repeat * 1e6,
+                columnar_seconds / args.repeat * 1e6
+            )
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Synthetic game frames shared by the benchmarks.
+"""
+# pylint: disable=wildcard-import
+from MoveInfoEnums import *  # NOQA
+
+def get_bot_data_dict(config, generator, frame, is_attacking):
+    """
+    Build the BotSnapshot data dictionary of a player repeating 20 frame
+    long moves, that sometimes skip frames, while the other player blocks
+    them.
+    """
+    data_dict = {
+        'PlayerDataAddress.' + data_type: 0
+        for data_type in config['PlayerDataAddress']
+    }
+    data_dict.update({
+        'EndBlockPlayerDataAddress.' + data_type: 0
+        for data_type in config['EndBlockPlayerDataAddress']
+    })
+    move_timer = frame % 20 + 1
+    if generator.random() < 0.05:
+        move_timer += 1
+    if is_attacking:
+        complex_state = generator.choice(
+            (
+                ComplexMoveStates.S_PLUS, ComplexMoveStates.S,
+                ComplexMoveStates.F_MINUS
+            )
+        )
+    else:
+        complex_state = ComplexMoveStates.BLOCK
+    data_dict.update({
+        'PlayerDataAddress.move_id': 100 + frame // 20 % 3,
+        'PlayerDataAddress.move_timer': move_timer,
+        'PlayerDataAddress.attack_startup': 10 if is_attacking else 0,
+        'PlayerDataAddress.attack_startup_end': 12 if is_attacking else 0,
+        'PlayerDataAddress.recovery': 20,
+        'PlayerDataAddress.input_direction': InputDirectionCodes.N.value,
+        'PlayerDataAddress.simple_move_state': generator.choice(
+            list(SimpleMoveStates)
+        ).value,
+        'PlayerDataAddress.complex_move_state': complex_state.value,
+        'PlayerDataAddress.cancel_window': generator.choice(
+            list(CancelStatesBitmask)
+        ).value,
+        'PlayerDataAddress.jump_flags': generator.choice(
+            (0, JumpFlagBitmask.JUMP.value)
+        ),
+        'PlayerDataAddress.power_crush': generator.choice((0, 1)),
+        'use_opponent_movelist': False,
+        'movelist_parser': None
+    })
+    return data_dict
@@ -68,7 +68,8 @@ class DefaultSettings():
                 getattr(Columns.OPPONENT_FRAMES, 'name'),
                 getattr(Columns.NOTES, 'name')
             ],
-            'display_log_level': getattr(LogLevel.INFO, 'name')
+            'display_log_level': getattr(LogLevel.INFO, 'name'),
+            'recording_enable': False
         }
     }
 
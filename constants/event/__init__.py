@@ -27,6 +27,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+from .encyclopedia import EncyclopediaEvent
 from .game_state import GameStateEvent
 from .graphic_settings_change import GraphicSettingsChangeEvent
 from .punish_window import PunishWindowEvent
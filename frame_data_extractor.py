@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Builds character frame data sheets out of a folder of match recordings, in
+a pool of processes.
+
+    python frame_data_extractor.py recordings --output frame_data.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from log import LogUtils
+from tekken.recording import FrameDataTable, extract_frame_data_batch
+from tekken.recording import recording_format
+
+def main():
+    """
+    """
+    parser = argparse.ArgumentParser(
+        description='Extract the frame data of RAW match recordings.'
+    )
+    parser.add_argument(
+        'recordings', nargs='+',
+        help='recording files, or folders searched recursively'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=os.cpu_count(),
+        help='number of processes, the number of cores by default'
+    )
+    parser.add_argument(
+        '--output', help='JSON file, the standard output by default'
+    )
+    args = parser.parse_args()
+
+    LogUtils()
+    paths = list()
+    for path in args.recordings:
+        if os.path.isdir(path):
+            paths.extend(
+                sorted(
+                    glob.glob(
+                        os.path.join(
+                            path, '**',
+                            '*' + recording_format.FILE_EXTENSION
+                        ),
+                        recursive=True
+                    )
+                )
+            )
+        else:
+            paths.append(path)
+
+    table = FrameDataTable()
+    start = time.perf_counter()
+    for path, result in extract_frame_data_batch(paths, args.workers):
+        if isinstance(result, Exception):
+            sys.stderr.write('Skipping {}: {}\n'.format(path, result))
+        else:
+            table.merge(result)
+    elapsed_time = time.perf_counter() - start
+    sys.stderr.write(
+        '{} recordings, {} frames, {} moves in {:.2f} s ({:.0f} frames/s)\n'
+        .format(
+            len(paths), table.frames, len(table), elapsed_time,
+            table.frames / elapsed_time if elapsed_time else 0
+        )
+    )
+
+    result = json.dumps(table.to_dict(), indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(result + '\n')
+    else:
+        sys.stdout.write(result + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -41,14 +41,17 @@ from constants.graphic_settings import ScreenMode
 from constants.log import LogLevel
 from constants.overlay import OverlayLayout, OverlayPosition, OverlaySettings
 from gui.model import OverlayModel
-from gui.my_tkinter import StdStreamRedirector
+from gui.my_tkinter import StdStreamRedirector, StdStreamWriter
 from gui.my_tkinter.overlay import OverlayManager
 from gui.view import TekkenBotPrimeView
 from log import Formatter, LogUtils
 from network import NoInternetConnectionError
 from patterns.observer import Subscriber
 from tekken.coach import PunishCoach
+from tekken.frame_data_cache import FrameDataCache
 from tekken.launcher import Launcher
+from tekken.match_stat_store import MatchStatStore
+from tekken.recording import FrameRecorder
 
 from .memory_override_panel_controller import MemoryOverwritePanelController
 
@@ -92,6 +95,7 @@ class TekkenBotPrimeController():
         self.__redirect_stdout_to_console(self.view.console)
 
         self.launcher = None
+        self.frame_recorder = None
         self.overlay_manager = None
         self.mop_controller = None
         self.punish_coach_alarm = None
@@ -236,7 +240,14 @@ class TekkenBotPrimeController():
             )
 
     def __on_delete_window(self):
+        if self.frame_recorder:
+            self.frame_recorder.stop()
+        if self.launcher:
+            self.launcher.frame_data_cache.close()
+            self.launcher.match_stat_store.close()
+            self.launcher.game_state.game_io_manager.close()
         sys.stdout.close()
+        sys.stderr.close()
         sys.stdout = self.original_stdout
         sys.stderr = self.original_stderr
         self.root.destroy()
@@ -262,7 +273,15 @@ class TekkenBotPrimeController():
             )
 
     def __post_console_initialization(self):
-        self.launcher = Launcher(self.root, extended_print=False)
+        self.launcher = Launcher(
+            self.root, extended_print=False,
+            frame_data_cache=FrameDataCache(),
+            match_stat_store=MatchStatStore()
+        )
+        if self.reloadable_initial_settings.config['DEFAULT'].get(
+                'recording_enable'
+        ):
+            self.frame_recorder = FrameRecorder(self.launcher)
 
         self.launcher.game_state.graphic_settings_publisher.register(
             GraphicSettingsChangeEvent.SCREEN_MODE, Subscriber(),
@@ -283,6 +302,8 @@ class TekkenBotPrimeController():
                 'display_log_level'
             )
         ]
+        # a single thread and file handle keep both streams in order
+        writer = StdStreamWriter()
         sys.stdout = StdStreamRedirector(
             widget,
             {
@@ -295,7 +316,7 @@ class TekkenBotPrimeController():
                 'save_to_file': self.save_to_file,
                 'write_mode': 'a'
             },
-            callback=self.original_stdout.write
+            callback=self.original_stdout.write, writer=writer
         )
         sys.stderr = StdStreamRedirector(
             widget,
@@ -309,12 +330,13 @@ class TekkenBotPrimeController():
                 'save_to_file': self.save_to_file,
                 'write_mode': 'a'
             },
-            callback=self.original_stderr.write
+            callback=self.original_stderr.write, writer=writer
         )
 
         LogUtils(sys.stdout)
 
         self.logger.removeHandler(self.file_handler)
+        self.file_handler.close()
 
         stdout_handler = logging.StreamHandler(sys.stdout)
         stdout_handler.setFormatter(Formatter())
@@ -28,6 +28,9 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from gui.my_tkinter.combobox import Combobox
+from gui.my_tkinter.console import Console
 from gui.my_tkinter.label import EnumLabel
-from gui.my_tkinter.std_stream_redirector import StdStreamRedirector
+from gui.my_tkinter.std_stream_redirector import (
+    StdStreamRedirector, StdStreamWriter
+)
 from gui.my_tkinter.textbox import Textbox
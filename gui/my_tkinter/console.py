@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+"""
+import collections
+import os
+import tkinter as tk
+import tkinter.scrolledtext as tkst
+
+class Console(tkst.ScrolledText):
+    """
+    Read only scrolled text keeping at most MAX_LINES lines in the widget.
+
+    The lines above them are moved to an in-memory scrollback ring, and the
+    ones falling off the ring are appended to the scrollback file, if any.
+    Scrolling to the top pages the ring lines back in, moving the bottom
+    lines out to a forward buffer that gets paged back in when scrolling to
+    the bottom, so the widget never holds more than MAX_LINES plus a page.
+    The scrollback file is overwritten by the first lines of every run.
+    """
+    DEFAULT_SCROLLBACK_PATH = 'TekkenData/console_scrollback.txt'
+    MAX_LINES = 1000
+    PAGE_LINES = 200
+    SCROLLBACK_LINES = 100000
+
+    def __init__(self, master=None, scrollback_path=None, **kwargs):
+        kwargs['state'] = 'disabled'
+        super().__init__(master, **kwargs)
+        self.scrollback_path = scrollback_path
+        self.__scrollback_file = None
+        # (text, tags) of every line, oldest first
+        self.__scrollback = collections.deque()
+        self.__lines = collections.deque()
+        self.__forward = collections.deque()
+        self.__is_paging = False
+        self.configure(yscrollcommand=self.__on_scroll)
+
+    def append(self, text, tags=None, scroll=False):
+        """
+        Add text at the end of the console, scrolling to it if scroll is
+        True. While earlier lines are paged in, the text waits in the forward
+        buffer, unless scroll is True.
+        """
+        if self.__forward and (
+                scroll or len(self.__forward) > Console.SCROLLBACK_LINES
+        ):
+            self.__return_to_end()
+        if self.__forward:
+            Console.__add_lines(self.__forward, text, tags)
+            return
+
+        self.configure(state='normal')
+        self.insert(tk.END, text, tags if tags is not None else ())
+        Console.__add_lines(self.__lines, text, tags)
+        excess = len(self.__lines) - Console.MAX_LINES
+        if excess > 0:
+            self.__trim_top(excess, keep_view=not scroll)
+        self.configure(state='disabled')
+        if scroll:
+            self.see(tk.END)
+
+    def clear(self):
+        """
+        """
+        self.configure(state='normal')
+        self.delete('1.0', tk.END)
+        self.configure(state='disabled')
+        self.__scrollback.clear()
+        self.__lines.clear()
+        self.__forward.clear()
+
+    def destroy(self):
+        if self.__scrollback_file:
+            self.__scrollback_file.close()
+            self.__scrollback_file = None
+        super().destroy()
+
+    @staticmethod
+    def __add_lines(lines, text, tags):
+        for line in text.splitlines(keepends=True):
+            if lines and not lines[-1][0].endswith('\n'):
+                line = lines.pop()[0] + line
+            lines.append((line, tags))
+
+    @staticmethod
+    def __get_insert_args(lines):
+        args = []
+        for text, tags in lines:
+            args.append(text)
+            args.append(tags if tags is not None else ())
+        return args
+
+    def __on_scroll(self, first, last):
+        self.vbar.set(first, last)
+        if not self.__is_paging:
+            if float(first) <= 0 and self.__scrollback:
+                self.__is_paging = True
+                self.after_idle(self.__page_back)
+            elif float(last) >= 1 and self.__forward:
+                self.__is_paging = True
+                self.after_idle(self.__page_forward)
+
+    def __page_back(self):
+        count = min(Console.PAGE_LINES, len(self.__scrollback))
+        lines = [self.__scrollback.pop() for _ in range(count)]
+        lines.reverse()
+
+        self.configure(state='normal')
+        self.insert('1.0', *Console.__get_insert_args(lines))
+        self.__lines.extendleft(reversed(lines))
+        excess = len(self.__lines) - Console.MAX_LINES
+        if excess > 0:
+            self.delete(
+                '{}.0'.format(len(self.__lines) - excess + 1), tk.END
+            )
+            self.__forward.extendleft(
+                self.__lines.pop() for _ in range(excess)
+            )
+        self.configure(state='disabled')
+        # keep the line that was at the top of the view there
+        self.yview('{}.0'.format(count + 1))
+        self.__is_paging = False
+
+    def __page_forward(self):
+        count = min(Console.PAGE_LINES, len(self.__forward))
+        lines = [self.__forward.popleft() for _ in range(count)]
+
+        self.configure(state='normal')
+        self.insert(tk.END, *Console.__get_insert_args(lines))
+        self.__lines.extend(lines)
+        excess = len(self.__lines) - Console.MAX_LINES
+        if excess > 0:
+            self.__trim_top(excess, keep_view=True)
+        self.configure(state='disabled')
+        self.__is_paging = False
+
+    def __return_to_end(self):
+        self.__scrollback.extend(self.__lines)
+        self.__scrollback.extend(self.__forward)
+        self.__lines.clear()
+        self.__forward.clear()
+        for _ in range(min(Console.MAX_LINES, len(self.__scrollback))):
+            self.__lines.appendleft(self.__scrollback.pop())
+        self.__spill_scrollback()
+
+        self.configure(state='normal')
+        self.delete('1.0', tk.END)
+        if self.__lines:
+            self.insert(tk.END, *Console.__get_insert_args(self.__lines))
+        self.configure(state='disabled')
+
+    def __spill_scrollback(self):
+        excess = len(self.__scrollback) - Console.SCROLLBACK_LINES
+        if excess <= 0:
+            return
+        lines = [self.__scrollback.popleft()[0] for _ in range(excess)]
+        if not self.scrollback_path:
+            return
+        try:
+            if not self.__scrollback_file:
+                directory = os.path.dirname(self.scrollback_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.__scrollback_file = open(
+                    self.scrollback_path, 'w', encoding='utf-8'
+                )
+            self.__scrollback_file.writelines(lines)
+        except OSError:
+            # writing to the standard output would end up in the console
+            self.scrollback_path = None
+
+    def __trim_top(self, count, keep_view=False):
+        top_line = int(self.index('@0,0').split('.')[0])
+        self.delete('1.0', '{}.0'.format(count + 1))
+        self.__scrollback.extend(
+            self.__lines.popleft() for _ in range(count)
+        )
+        self.__spill_scrollback()
+        if keep_view:
+            self.yview('{}.0'.format(max(1, top_line - count)))
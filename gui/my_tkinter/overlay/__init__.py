@@ -32,3 +32,4 @@ from .command_input_overlay import CommandInputOverlay
 from .overlay import Overlay
 from .overlay_manager import OverlayManager
 from .punish_alarm_overlay import PunishAlarmOverlay
+from .svg_image_cache import SvgImageCache
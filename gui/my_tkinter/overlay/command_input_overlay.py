@@ -29,21 +29,18 @@
 
 """
 """
+import collections
 import math
-import io
 import itertools
 from pathlib import Path
 import tkinter as tk
 
-from PIL import Image, ImageTk
-from svglib.svglib import svg2rlg
-from reportlab.graphics import renderPM
-
 from constants.battle import BattleSide, MoveProperty
 from constants.input import InputAttack, InputDirection
 from constants.overlay import OverlayMode
 
 from .overlay import Overlay
+from .svg_image_cache import SvgImageCache
 
 class CommandInputOverlay(Overlay):
     """
@@ -62,6 +59,9 @@ class CommandInputOverlay(Overlay):
         'font_pixel_height': 16
     }
 
+    # horizontal resolutions whose images get rasterized in the background
+    __PREWARM_RESOLUTION_WIDTHS = (1280, 1366, 1600, 1920, 2560, 3840)
+
     __CANCEL_PROPERTY_COLORS = {
         MoveProperty.STARTING: 'green4',
         MoveProperty.RECOVERING: 'red4',
@@ -102,7 +102,11 @@ class CommandInputOverlay(Overlay):
         self.frame_move_property = list()
         self.last_frame_inputs = list()
         self.last_frame_cancels = list()
+        # canvas item ids of every painted frame, oldest first
+        self.input_columns = collections.deque()
+        self.unpainted_frame_number = 0
 
+        self.svg_image_cache = SvgImageCache()
         self.svg_arrow_images = dict()
         self.svg_button_images = dict()
         self.arrow_images = dict()
@@ -144,36 +148,19 @@ class CommandInputOverlay(Overlay):
                 frame_index_id, fill=self.text_color
             )
         self.button_folder = theme_dict.get('button_style')
-        if self.overlay_scale:
-            scale = [
-                overlay_scale_size * tekken_scale_size
-                for overlay_scale_size, tekken_scale_size in zip(
-                    self.overlay_scale, self._tekken_scale
-                )
-            ]
-        else:
-            scale = self._tekken_scale
+        scale = CommandInputOverlay.__combine_scales(
+            self.overlay_scale, self._tekken_scale
+        )
 
         if scale is None:
             self.__load_resources(only_buttons=True)
         else:
             self.__load_resources(only_buttons=True, scale=scale)
         self.__paint_input(restore=True)
+        self.__prewarm_images()
 
     def __initialize_frame_indexes(self, scale=(1, 1,), expand=False):
-        if expand:
-            self.step_length = (
-                (
-                    self.window_dimensions[0]
-                    - self.canvas_step_number
-                )
-                / self.canvas_step_number
-            )
-        else:
-            self.step_length = (
-                CommandInputOverlay.__COMMAND_INPUT_CANVAS_CONFIG['step_length']
-                * scale[0]
-            )
+        self.step_length = self.__get_step_length(scale, expand)
 
         self.font, _, height = Overlay._get_fitting_font(
             scale,
@@ -287,17 +274,10 @@ class CommandInputOverlay(Overlay):
         return width, height
 
     def _resize_overlay_widgets(self, overlay_scale=None):
-        expand_canvas = False
-        if overlay_scale:
-            scale = [
-                overlay_scale_size * tekken_scale_size
-                for overlay_scale_size, tekken_scale_size in zip(
-                    overlay_scale, self._tekken_scale
-                )
-            ]
-            expand_canvas = True
-        else:
-            scale = self._tekken_scale
+        expand_canvas = bool(overlay_scale)
+        scale = CommandInputOverlay.__combine_scales(
+            overlay_scale, self._tekken_scale
+        )
 
         self.command_input_canvas.delete('all')
         self.__initialize_frame_indexes(scale, expand_canvas)
@@ -378,12 +358,9 @@ class CommandInputOverlay(Overlay):
                         != enum_member
                         != InputDirection.NEUTRAL
                 ):
-                    svg_drawing = svg2rlg(
-                        'data/images/arrows/{}.svg'.format(
-                            enum_member.symbol
-                        )
+                    self.svg_arrow_images[enum_member.symbol] = (
+                        'data/images/arrows/{}.svg'.format(enum_member.symbol)
                     )
-                    self.svg_arrow_images[enum_member.symbol] = svg_drawing
 
         for enum_member in InputAttack:
             str_button = getattr(enum_member, 'printable_name', None)
@@ -398,8 +375,7 @@ class CommandInputOverlay(Overlay):
                     input_path = str_input_path.replace(
                         self.button_folder, 'common'
                     )
-                svg_drawing = svg2rlg(input_path)
-                self.svg_button_images[str_button] = svg_drawing
+                self.svg_button_images[str_button] = input_path
         self.arrow_images = self.scale_svg_images(
             self.svg_arrow_images, scale
         )
@@ -409,45 +385,84 @@ class CommandInputOverlay(Overlay):
 
     def scale_svg_images(self, svg_image_dict, scale):
         image_dict = svg_image_dict.copy()
-        for key, svg_drawing in image_dict.items():
-            if svg_drawing:
-                scaled_frame_min_margin = (
-                    CommandInputOverlay.__COMMAND_INPUT_CANVAS_CONFIG[
-                        'frame_image_min_margin'
-                    ]
-                    * scale[0]
-                )
-                if scaled_frame_min_margin < 1:
-                    scaled_frame_min_margin = 1
-
-                svg_width_scale = (
-                    (
-                        self.step_length
-                        - 2
-                        * scaled_frame_min_margin
-                    )
-                    / svg_drawing.width
+        image_width = CommandInputOverlay.__get_image_width(
+            self.step_length, scale
+        )
+        background = self.__tkcolor_to_int(self.background)
+        for key, svg_path in image_dict.items():
+            if svg_path:
+                image_dict[key] = self.svg_image_cache.get_image(
+                    svg_path, image_width, background
                 )
-                svg_drawing.scale(
-                    svg_width_scale, svg_width_scale
+        return image_dict
+
+    def __get_step_length(self, scale, expand):
+        if expand:
+            return (
+                (
+                    self.window_dimensions[0]
+                    - self.canvas_step_number
                 )
+                / self.canvas_step_number
+            )
+        return (
+            CommandInputOverlay.__COMMAND_INPUT_CANVAS_CONFIG['step_length']
+            * scale[0]
+        )
 
-                svg_drawing.width *= svg_width_scale
-                svg_drawing.height *= svg_width_scale
+    @staticmethod
+    def __combine_scales(overlay_scale, tekken_scale):
+        if overlay_scale:
+            return [
+                overlay_scale_size * tekken_scale_size
+                for overlay_scale_size, tekken_scale_size in zip(
+                    overlay_scale, tekken_scale
+                )
+            ]
+        return tekken_scale
 
-                image_stream = io.BytesIO()
-                renderPM.drawToFile(
-                    svg_drawing,
-                    image_stream,
-                    bg=self.__tkcolor_to_int(self.background),
-                    fmt='PNG'
+    @staticmethod
+    def __get_image_width(step_length, scale):
+        scaled_frame_min_margin = (
+            CommandInputOverlay.__COMMAND_INPUT_CANVAS_CONFIG[
+                'frame_image_min_margin'
+            ]
+            * scale[0]
+        )
+        if scaled_frame_min_margin < 1:
+            scaled_frame_min_margin = 1
+        return step_length - 2 * scaled_frame_min_margin
+
+    def __prewarm_images(self):
+        # same scale as _resize_overlay_widgets for each game resolution,
+        # keeping the current overlay scale
+        expand_canvas = bool(self.overlay_scale)
+        image_widths = list()
+        for resolution_width in (
+                CommandInputOverlay.__PREWARM_RESOLUTION_WIDTHS
+        ):
+            tekken_scale = (resolution_width / Overlay.WIDTH,) * 2
+            scale = CommandInputOverlay.__combine_scales(
+                self.overlay_scale, tekken_scale
+            )
+            image_widths.append(
+                CommandInputOverlay.__get_image_width(
+                    self.__get_step_length(scale, expand_canvas), scale
                 )
-                image_dict[key] = ImageTk.PhotoImage(Image.open(image_stream))
-        return image_dict
+            )
+        self.svg_image_cache.prewarm(
+            [
+                *self.svg_arrow_images.values(),
+                *self.svg_button_images.values()
+            ],
+            image_widths,
+            self.__tkcolor_to_int(self.background)
+        )
 
     def _update_input(self, input_state, move_color):
         self.frame_inputs.append(input_state)
         self.frame_move_property.append(move_color)
+        self.unpainted_frame_number += 1
 
         if len(self.frame_inputs) >= self.canvas_step_number:
             self.frame_inputs = self.frame_inputs[-self.canvas_step_number:]
@@ -459,8 +474,41 @@ class CommandInputOverlay(Overlay):
                 self.last_frame_inputs = self.frame_inputs.copy()
                 self.last_frame_cancels = self.frame_move_property.copy()
 
-                self.command_input_canvas.delete(self.input_tag)
-                self.__paint_input()
+                self.__scroll_input()
+
+    def __scroll_input(self):
+        """
+        Shift the painted frames to the left by the number of frames added
+        since the last paint, deleting the ones going out of the canvas and
+        painting only the new ones.
+        """
+        frame_number = self.unpainted_frame_number
+        if(
+                frame_number >= len(self.input_columns)
+                or len(self.input_columns) != len(self.frame_inputs)
+        ):
+            self.__paint_input()
+            return
+
+        self.command_input_canvas.delete(
+            *itertools.chain.from_iterable(
+                self.input_columns.popleft()
+                for _ in range(frame_number)
+            )
+        )
+        self.command_input_canvas.move(
+            self.input_tag, -frame_number * (self.step_length + 1), 0
+        )
+        for index in range(
+                len(self.frame_inputs) - frame_number, len(self.frame_inputs)
+        ):
+            self.input_columns.append(
+                self.__paint_frame(
+                    index, self.frame_inputs[index],
+                    self.frame_move_property[index]
+                )
+            )
+        self.unpainted_frame_number = 0
 
     def __paint_input(self, restore=False):
         if restore:
@@ -469,60 +517,76 @@ class CommandInputOverlay(Overlay):
         else:
             frame_inputs = self.frame_inputs
             frame_cancels = self.frame_move_property
+            self.unpainted_frame_number = 0
 
-        for index, (direction_code, side, input_code, _) in enumerate(
-                frame_inputs
-        ):
-            coordinate_x = (
-                (
-                    index
-                    * self.step_length
-                    + index
-                    + self.step_length
-                    / 2
-                )
+        self.command_input_canvas.delete(self.input_tag)
+        self.input_columns.clear()
+        for index, frame_input in enumerate(frame_inputs):
+            self.input_columns.append(
+                self.__paint_frame(index, frame_input, frame_cancels[index])
             )
-            if(
-                    InputDirection.NEUTRAL
-                    != direction_code
-                    != InputDirection.NULL
-            ):
-                if side == BattleSide.LEFT:
+
+    def __paint_frame(self, index, frame_input, cancel_color):
+        direction_code, side, input_code, _ = frame_input
+        item_ids = list()
+        coordinate_x = (
+            (
+                index
+                * self.step_length
+                + index
+                + self.step_length
+                / 2
+            )
+        )
+        if(
+                InputDirection.NEUTRAL
+                != direction_code
+                != InputDirection.NULL
+        ):
+            if side == BattleSide.LEFT:
+                arrow_symbol = direction_code.symbol
+            else:
+                try:
+                    arrow_symbol = direction_code.flipped_symbol
+                except AttributeError:
                     arrow_symbol = direction_code.symbol
-                else:
-                    try:
-                        arrow_symbol = direction_code.flipped_symbol
-                    except AttributeError:
-                        arrow_symbol = direction_code.symbol
 
+            item_ids.append(
                 self.command_input_canvas.create_image(
                     coordinate_x,
                     self.arrow_image_coordinate_y0,
                     image=self.arrow_images[arrow_symbol],
                     tag=self.input_tag
                 )
+            )
 
-            input_code = InputAttack(input_code)
-            if input_code != InputAttack.NULL:
+        input_code = InputAttack(input_code)
+        if input_code != InputAttack.NULL:
+            item_ids.append(
                 self.command_input_canvas.create_image(
                     coordinate_x,
                     self.button_image_coordinate_y0,
                     image=self.button_images[input_code.printable_name],
                     tag=self.input_tag
                 )
+            )
 
-            coordinate_x -= self.cancel_rect_size / 2
+        coordinate_x -= self.cancel_rect_size / 2
+        item_ids.append(
             self.command_input_canvas.create_rectangle(
                 coordinate_x,
                 self.cancel_rect_coordinate_y0,
                 coordinate_x + self.cancel_rect_size,
                 self.cancel_rect_coordinate_y1,
-                fill=frame_cancels[index],
+                fill=cancel_color,
                 tag=self.input_tag
             )
+        )
+        return item_ids
 
     def __clear(self, player=None, empty_lists=False):
         self.command_input_canvas.delete(self.input_tag)
+        self.input_columns.clear()
         if player:
             for _ in itertools.repeat(None, (self.canvas_step_number)):
                 self.frame_inputs.append(player.get_input_state())
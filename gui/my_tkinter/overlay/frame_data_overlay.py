@@ -29,8 +29,8 @@
 
 """
 """
+import copy
 import math
-import re
 import tkinter as tk
 import tkinter.font as tkfont
 
@@ -54,7 +54,6 @@ class FrameDataOverlay(Overlay, Writable):
 
         self.p1_tag = 'p1: '
         self.p2_tag = 'p2: '
-        self.frame_advantage_tag = 'NOW:'
 
         self.max_attack_log_length = 5
         self.attack_log = list()
@@ -155,11 +154,26 @@ class FrameDataOverlay(Overlay, Writable):
             frame_advantage_backgrounds, advantage_text_color
         )
 
-    def write(self, string):
-        if self.frame_advantage_tag in string:
-            display_string, player_tag = self.__process_string(string)
-            if display_string:
-                self.textbox.insert(tk.END, display_string, player_tag)
+    def write_frame_data(self, frame_data_entry, is_player_one):
+        # the encyclopedia keeps updating the entry of each move
+        frame_data_entry = copy.copy(frame_data_entry)
+        self.__insert_columns_to_log(frame_data_entry)
+        self.textbox.insert(
+            tk.END,
+            ''.join(
+                [
+                    self.__generate_visible_column_string(frame_data_entry),
+                    '\n'
+                ]
+            ),
+            self.p1_tag if is_player_one else self.p2_tag
+        )
+        self.__update_frame_advantage(
+            frame_data_entry.currentFrameAdvantage, player_1=is_player_one
+        )
+
+    def write_frame_advantage(self, frame_advantage, is_player_one):
+        self.__update_frame_advantage(frame_advantage, player_1=is_player_one)
 
     def _resize_overlay_widgets(self, overlay_scale=None):
         if overlay_scale:
@@ -267,38 +281,6 @@ class FrameDataOverlay(Overlay, Writable):
         padding.grid(sticky='NSEW')
         return padding
 
-    def __process_string(self, string):
-        player_tag = None
-        if self.p1_tag in string:
-            player_tag = self.p1_tag
-            display_string = string.replace(self.p1_tag, '')
-        else:
-            player_tag = self.p2_tag
-            display_string = string.replace(self.p2_tag, '')
-
-        display_string, frame_advantage = re.split(
-            self.frame_advantage_tag, display_string
-        )
-        if display_string:
-            all_columns_values = FrameDataOverlay.__generate_columns(
-                display_string
-            )
-            self.__insert_columns_to_log(all_columns_values)
-            display_string = self.__generate_visible_column_string(
-                all_columns_values
-            )
-            display_string = ''.join([display_string, '\n'])
-        else:
-            display_string = None
-        self.__update_frame_advantage(
-            frame_advantage, player_1=(player_tag == self.p1_tag)
-        )
-        return display_string, player_tag
-
-    @staticmethod
-    def __generate_columns(string):
-        return [column.strip() for column in string.split('|')]
-
     @staticmethod
     def __generate_column_string(*column_tuples):
         display_columns = []
@@ -317,20 +299,25 @@ class FrameDataOverlay(Overlay, Writable):
             display_columns.append(''.join(['|', column]))
         return  ''.join([*display_columns, '|'])
 
-    def __generate_visible_column_string(self, column_values):
-        visible_columns = [
-            (index, column_values[index])
-            for index in self.display_columns
-        ]
+    def __generate_visible_column_string(self, log_entry):
+        if isinstance(log_entry, list):
+            visible_columns = [
+                (index, log_entry[index]) for index in self.display_columns
+            ]
+        else:
+            visible_columns = [
+                (index, log_entry.get_column_string(Columns(index)))
+                for index in self.display_columns
+            ]
         return FrameDataOverlay.__generate_column_string(*visible_columns)
 
-    def __insert_columns_to_log(self, columns, tag=None):
+    def __insert_columns_to_log(self, log_entry, tag=None):
         if len(self.attack_log) >= self.max_attack_log_length:
             self.attack_log.pop(1)
-        self.attack_log.append([tag, columns])
+        self.attack_log.append([tag, log_entry])
 
     def __update_frame_advantage(self, frame_advantage, player_1=True):
-        if '?' not in frame_advantage:
+        if '?' not in str(frame_advantage):
             frame_advantage = int(frame_advantage)
             current_frame_advantage_enum = None
             for frame_advantage_enum in FrameAdvantage:
@@ -33,7 +33,12 @@ from abc import abstractmethod, ABC
 
 class Writable(ABC):
     """
+    Overlay displaying the events the encyclopedias publish.
     """
     @abstractmethod
-    def write(self, string):
+    def write_frame_data(self, frame_data_entry, is_player_one):
+        pass
+
+    @abstractmethod
+    def write_frame_advantage(self, frame_advantage, is_player_one):
         pass
@@ -33,7 +33,7 @@ import logging
 import sys
 
 from config import DefaultSettings
-from constants.event import GraphicSettingsChangeEvent
+from constants.event import EncyclopediaEvent, GraphicSettingsChangeEvent
 from constants.overlay import OverlayMode, OverlayPosition, OverlayLayout
 from gui.model import OverlayModel
 from log import Formatter
@@ -77,7 +77,15 @@ class OverlayManager(metaclass=Singleton):
         self.overlay_factory = OverlayFactory()
         self.overlays = dict()
 
-        sys.stdout.callback = self.write_to_overlays
+        encyclopedia_publisher = self.launcher.encyclopedia_publisher
+        encyclopedia_publisher.register(
+            EncyclopediaEvent.FRAME_DATA, subscriber,
+            self.__write_frame_data_to_overlays
+        )
+        encyclopedia_publisher.register(
+            EncyclopediaEvent.FRAME_ADVANTAGE, subscriber,
+            self.__write_frame_advantage_to_overlays
+        )
 
         self.tekken_position = None
         self.tekken_resolution = None
@@ -328,15 +336,6 @@ class OverlayManager(metaclass=Singleton):
             frame_data_overlay = self.__add_overlay(OverlayMode.FRAMEDATA)
         frame_data_overlay.set_display_columns(column_settings)
 
-    def write_to_overlays(self, string):
-        for overlay_id in self.overlay_slots:
-            overlay = self.overlays.get(overlay_id)
-            if(
-                    isinstance(overlay, Writable)
-                    and overlay.enabled
-            ):
-                overlay.write(string)
-
     def __add_overlay(self, overlay_mode, previous_overlay=None):
         self.logger.debug('overlays before creation: %s', self.overlays)
         self.logger.debug('creating %s overlay', overlay_mode.name)
@@ -368,6 +367,15 @@ class OverlayManager(metaclass=Singleton):
         self.logger.debug('overlays after creation: %s', self.overlays)
         return self.overlays[overlay_id]
 
+    def __get_writable_overlays(self):
+        for overlay_id in self.overlay_slots:
+            overlay = self.overlays.get(overlay_id)
+            if(
+                    isinstance(overlay, Writable)
+                    and overlay.enabled
+            ):
+                yield overlay
+
     def __position_change(self, position):
         self.tekken_position = position
         for overlay in self.overlays.values():
@@ -382,3 +390,13 @@ class OverlayManager(metaclass=Singleton):
         self.tekken_screen_mode = screen_mode
         for overlay in self.overlays.values():
             overlay.set_tekken_screen_mode(screen_mode)
+
+    def __write_frame_data_to_overlays(self, frame_data_entry, is_player_one):
+        for overlay in self.__get_writable_overlays():
+            overlay.write_frame_data(frame_data_entry, is_player_one)
+
+    def __write_frame_advantage_to_overlays(
+            self, frame_advantage, is_player_one
+    ):
+        for overlay in self.__get_writable_overlays():
+            overlay.write_frame_advantage(frame_advantage, is_player_one)
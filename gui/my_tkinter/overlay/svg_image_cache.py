@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+"""
+import collections
+import hashlib
+import io
+import os
+import threading
+
+from PIL import Image, ImageTk
+from svglib.svglib import svg2rlg
+from reportlab.graphics import renderPM
+
+from patterns.singleton import Singleton
+
+class SvgImageCache(metaclass=Singleton):
+    """
+    Two-level cache of the SVG images rasterized to a given width over a
+    given background color.
+
+    The PhotoImages are kept in a least recently used memory cache, and the
+    PNG files in a folder, keyed by the path and modification time of the
+    SVG file, the width in whole pixels and the background color, so every
+    size only gets rasterized once. Rasterizing is serialized, as it can
+    happen both on the Tk thread and on the pre-warming one.
+    """
+    DEFAULT_DIRECTORY = 'data/images/cache'
+    MAX_IMAGES = 256
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_images=MAX_IMAGES):
+        self.directory = directory
+        self.max_images = max_images
+        self.__images = collections.OrderedDict()
+        self.__render_lock = threading.Lock()
+
+    def get_image(self, svg_path, width, background):
+        """
+        Return the PhotoImage of an SVG file scaled to the given width, over
+        the given background color as an RGB integer. Must be called from
+        the Tk thread.
+        """
+        # sub-pixel widths would be rasterized to the same image
+        width = round(width)
+        key = (svg_path, width, background)
+        image = self.__images.get(key)
+        if image is not None:
+            self.__images.move_to_end(key)
+            return image
+        image = ImageTk.PhotoImage(
+            Image.open(io.BytesIO(self.__get_png(svg_path, width, background)))
+        )
+        self.__images[key] = image
+        if len(self.__images) > self.max_images:
+            self.__images.popitem(last=False)
+        return image
+
+    def prewarm(self, svg_paths, widths, background):
+        """
+        Rasterize to disk in a background thread every SVG file in each of
+        the given widths that is not cached yet.
+        """
+        widths = sorted({round(width) for width in widths})
+
+        def _prewarm():
+            for width in widths:
+                for svg_path in svg_paths:
+                    try:
+                        self.__get_png(svg_path, width, background)
+                    except (OSError, ValueError):
+                        pass
+
+        threading.Thread(target=_prewarm, daemon=True).start()
+
+    def __get_png(self, svg_path, width, background):
+        svg_stat = os.stat(svg_path)
+        png_path = os.path.join(
+            self.directory,
+            '{}.png'.format(
+                hashlib.sha1(
+                    repr(
+                        (
+                            os.path.abspath(svg_path), svg_stat.st_mtime_ns,
+                            svg_stat.st_size, width, background
+                        )
+                    ).encode()
+                ).hexdigest()
+            )
+        )
+        try:
+            with open(png_path, 'rb') as r_file:
+                return r_file.read()
+        except OSError:
+            pass
+
+        with self.__render_lock:
+            svg_drawing = svg2rlg(svg_path)
+            svg_scale = width / svg_drawing.width
+            svg_drawing.scale(svg_scale, svg_scale)
+            svg_drawing.width *= svg_scale
+            svg_drawing.height *= svg_scale
+            image_stream = io.BytesIO()
+            renderPM.drawToFile(
+                svg_drawing, image_stream, bg=background, fmt='PNG'
+            )
+        png = image_stream.getvalue()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary_path = '{}.{}.tmp'.format(
+                png_path, threading.get_ident()
+            )
+            with open(temporary_path, 'wb') as w_file:
+                w_file.write(png)
+            os.replace(temporary_path, png_path)
+        except OSError:
+            pass
+        return png
@@ -29,19 +29,117 @@
 
 """
 """
-import time
+import collections
 import queue
 import threading
+import time
 
 from constants.log import LogLevel
 
+class StdStreamWriter():
+    """
+    Single long-lived thread writing the messages of the redirectors sharing
+    it, in the order they were written. The files are opened once per path,
+    so the redirectors saving to the same file share its handle, and they
+    are flushed together on an interval or once enough bytes are buffered.
+    """
+    MAX_QUEUE_SIZE = 4096
+    FLUSH_INTERVAL = 1
+    FLUSH_SIZE = 64 * 1024
+
+    __STOP = object()
+
+    def __init__(self):
+        self.queue = queue.Queue(StdStreamWriter.MAX_QUEUE_SIZE)
+        self.__files = dict()
+        self.__redirector_count = 0
+        self.__lock = threading.Lock()
+        self.__buffered_size = 0
+        self.__last_flush_time = time.monotonic()
+
+        self.__thread = threading.Thread(
+            target=self.__write_messages, daemon=True
+        )
+        self.__thread.start()
+
+    def register(self):
+        """
+        Count a redirector sharing the writer.
+        """
+        with self.__lock:
+            self.__redirector_count += 1
+
+    def unregister(self):
+        """
+        Stop writing once the last redirector sharing the writer is closed,
+        flushing and closing the files.
+        """
+        with self.__lock:
+            self.__redirector_count -= 1
+            if self.__redirector_count:
+                return
+        self.queue.put(StdStreamWriter.__STOP)
+        self.__thread.join()
+        for file in self.__files.values():
+            file.close()
+        self.__files.clear()
+
+    def write_file(self, path, write_mode, message):
+        """
+        Buffer a message on the file of the given path, only from the writer
+        thread.
+        """
+        file = self.__files.get(path)
+        if file is None:
+            file = open(path, write_mode, encoding='utf-8')
+            self.__files[path] = file
+        file.write(message)
+        self.__buffered_size += len(message)
+
+    def __flush_files(self):
+        for file in self.__files.values():
+            file.flush()
+        self.__buffered_size = 0
+        self.__last_flush_time = time.monotonic()
+
+    def __write_messages(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=StdStreamWriter.FLUSH_INTERVAL)
+            except queue.Empty:
+                item = None
+            if item is StdStreamWriter.__STOP:
+                break
+            if item:
+                function, argument = item
+                function(argument)
+            if self.__files and (
+                    self.__buffered_size >= StdStreamWriter.FLUSH_SIZE
+                    or time.monotonic() - self.__last_flush_time
+                    >= StdStreamWriter.FLUSH_INTERVAL
+            ):
+                self.__flush_files()
+        self.__flush_files()
+
 class StdStreamRedirector():
     """
+    Standard stream replacement writing the messages on a Console widget,
+    optionally on a file, and on a callback.
+
+    Writers only put their messages in the bounded queue of a
+    StdStreamWriter, which can be shared with other redirectors, like the
+    one of the other standard stream, to keep their messages in order. The
+    messages not fitting in the queue are dropped and counted instead of
+    blocking the writer. Its thread filters them by log level and buffers
+    them on the file. The messages for the widget are inserted with a single
+    call on every tick of the Tk main loop, which also calls the callback
+    with the messages.
     """
-    INITIAL_SHORT_DELAY = 2
+    UPDATE_INTERVAL = 16
 
     def __init__(
-            self, widget, widget_config, file_config=None, callback=None
+            self, widget, widget_config, file_config=None, callback=None,
+            writer=None
     ):
         self.widget = widget
         self.tag = widget_config.get('tag')
@@ -57,135 +155,119 @@ class StdStreamRedirector():
         ]
 
         self.save_to_file = False
-        self.file = None
+        self.file_path = None
+        self.write_mode = 'w'
         if file_config:
             self.file_path = file_config.get('file_path')
+            self.write_mode = file_config.get('write_mode', 'w')
             if self.file_path:
                 self.save_to_file = file_config.get('save_to_file', True)
-                if self.save_to_file:
-                    self.file = open(
-                        self.file_path,
-                        file_config.get('write_mode', 'w'),
-                        encoding='utf-8'
-                    )
         self.callback = callback
 
-        self.queue = queue.Queue()
-        self.__run_queue_checker = False
-        self.widget_updater = None
+        if writer is None:
+            writer = StdStreamWriter()
+        self.writer = writer
+        self.writer.register()
+        self.is_closed = False
+        self.dropped_message_count = 0
+        self.__reported_dropped_message_count = 0
+        self.__widget_messages = collections.deque()
+        self.__callback_messages = collections.deque()
 
-        self.last_executed_time = None
-        self.delay = StdStreamRedirector.INITIAL_SHORT_DELAY
+        self.widget.after(
+            StdStreamRedirector.UPDATE_INTERVAL, self.__update_widget
+        )
 
     def write(self, *args):
-        if args:
-            if self.__run_queue_checker:
-                self.__async_write(*args)
+        if args and not self.is_closed:
+            if len(args) == 1:
+                string = str(args[0])
             else:
-                self.__sync_write(*args)
+                string = str(args)
+            if not string:
+                return
+            if string[-1] != '\n':
+                string = ''.join([string, '\n'])
+            # the poll loop never waits for a writer falling behind
+            try:
+                self.writer.queue.put_nowait((self.__write_message, string))
+            except queue.Full:
+                self.dropped_message_count += 1
 
     def write_file(self, file_path, callback=None):
         def _read_file(file_path):
             with open(file_path, 'r') as r_file:
                 for line in r_file:
-                    self.queue.put(line)
-                self.queue.put('\n')
-            self.queue.put(False)
+                    self.writer.queue.put((self.__write_message, line))
+                self.writer.queue.put((self.__write_message, '\n'))
+            if callback:
+                self.writer.queue.put(
+                    (self.__widget_messages.append, callback)
+                )
 
-        self.__run_queue_checker = True
-        self.__update_widget(callback=callback)
         threading.Thread(target=_read_file, args=(file_path,)).start()
 
     def flush(self):
         pass
 
     def close(self):
-        if self.file:
-            self.file.close()
+        if not self.is_closed:
+            self.is_closed = True
+            self.writer.unregister()
+            self.__call_callback()
 
     def set_file_path(self, path):
         self.file_path = path
 
     def enable_save_to_file(self, enable):
+        if enable and not self.file_path:
+            raise Exception('save to file enabled, but file path is None')
         self.save_to_file = enable
-        if enable and not self.file:
-            if not self.file_path:
-                raise Exception('save to file enabled, but file path is None')
-            self.file = open(self.file_path, 'w')
 
     def enable_auto_scroll(self, enable):
         self.auto_scroll = enable
 
-    def __async_write(self, *args):
-        def _write(args):
-            if len(args) == 1:
-                string = str(args[0])
-            else:
-                string = str(args)
-            if string and string[-1] != '\n':
-                self.queue.put(''.join([string, '\n']))
-            elif string:
-                self.queue.put(string)
-
-        threading.Thread(target=_write, args=(args,)).start()
-
-    def __sync_write(self, *args):
-        if len(args) == 1:
-            string = str(args[0])
-        else:
-            string = str(args)
-        if string and string[-1] != '\n':
-            self.__write_on_widget(''.join([string, '\n']))
-        elif string:
-            self.__write_on_widget(string)
-
-    def __write_to_file(self, string):
-        self.file.write(string)
-        self.file.flush()
-
-    def __write_on_widget(self, message):
+    def __write_message(self, message):
+        dropped_message_count = self.dropped_message_count
+        if dropped_message_count != self.__reported_dropped_message_count:
+            message = ''.join([
+                '{} messages dropped\n'.format(
+                    dropped_message_count
+                    - self.__reported_dropped_message_count
+                ),
+                message
+            ])
+            self.__reported_dropped_message_count = dropped_message_count
         if all(
                 log_level not in message
                 for log_level in self.filter_log_level_tags
         ):
-            self.widget.configure(state='normal')
-            self.widget.insert('end', message, (self.tag,))
-            self.widget.configure(state='disabled')
-            if self.auto_scroll:
-                self.widget.see('end')
+            self.__widget_messages.append(message)
         if self.save_to_file:
-            threading.Thread(
-                target=self.__write_to_file,
-                args=(message,)
-            ).start()
+            self.writer.write_file(self.file_path, self.write_mode, message)
         if self.callback:
-            self.callback(message)
-
-    def __update_widget(self, callback=None):
-        try:
-            message = self.queue.get_nowait()
-            if isinstance(message, str):
-                self.__write_on_widget(message)
-                self.__update_delay()
-            else:
-                self.__run_queue_checker = False
-        except queue.Empty:
-            pass
-        if self.__run_queue_checker:
-            self.widget.after(
-                self.delay,
-                lambda: self.__update_widget(callback=callback)
+            self.__callback_messages.append(message)
+
+    def __call_callback(self):
+        while self.__callback_messages:
+            self.callback(self.__callback_messages.popleft())
+
+    def __update_widget(self):
+        messages = []
+        callbacks = []
+        while self.__widget_messages:
+            message = self.__widget_messages.popleft()
+            if callable(message):
+                callbacks.append(message)
+                break
+            messages.append(message)
+        if messages:
+            self.widget.append(
+                ''.join(messages), (self.tag,), scroll=self.auto_scroll
             )
-        elif callback:
+        for callback in callbacks:
             callback()
-
-    def __update_delay(self):
-        if self.last_executed_time is None:
-            self.last_executed_time = time.time()
-        else:
-            now = time.time()
-            elapsed_time = 1000 * (now - self.last_executed_time)
-            avg_delay = (self.delay * 0.8 + elapsed_time * 0.2) / 2
-            if avg_delay > StdStreamRedirector.INITIAL_SHORT_DELAY:
-                self.delay = int(avg_delay)
-            self.last_executed_time = now
+        self.__call_callback()
+        self.widget.after(
+            StdStreamRedirector.UPDATE_INTERVAL, self.__update_widget
+        )
@@ -32,9 +32,9 @@
 import logging
 import itertools
 import tkinter as tk
-import tkinter.scrolledtext as tkst
 
 from constants.overlay import OverlayLayout, OverlayPosition, OverlaySettings
+from gui.my_tkinter import Console
 from log import Formatter
 
 class TekkenBotPrimeView():
@@ -159,7 +159,9 @@ class TekkenBotPrimeView():
 
         self.memory_overwride_panel = None
 
-        self.console = tkst.ScrolledText(root, state='disabled')
+        self.console = Console(
+            root, scrollback_path=Console.DEFAULT_SCROLLBACK_PATH
+        )
         self.console.grid(column=0, row=1, sticky='NSEW')
 
         root.grid_rowconfigure(1, weight=1)
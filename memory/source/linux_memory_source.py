@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+"""
+import ctypes
+import errno
+import os
+import select
+import threading
+import time
+
+from .memory_source import MemorySource
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class LinuxMemorySource(MemorySource):
+    """
+    Reads through process_vm_readv, falling back to /proc/<pid>/mem when the
+    system call is not available, and writes through /proc/<pid>/mem, which
+    unlike process_vm_writev also reaches read-only pages. Modules are
+    located through /proc/<pid>/maps, so Wine/Proton processes are supported
+    as long as the PE image is mapped from its file.
+    """
+    PLATFORM = 'linux'
+    PROC_FOLDER = '/proc'
+    IOV_MAX = 1024
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__mem_files = dict()
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.__process_vm_readv = getattr(libc, 'process_vm_readv', None)
+        if self.__process_vm_readv:
+            self.__process_vm_readv.argtypes = [
+                ctypes.c_int,
+                ctypes.POINTER(_IOVec), ctypes.c_ulong,
+                ctypes.POINTER(_IOVec), ctypes.c_ulong,
+                ctypes.c_ulong
+            ]
+            self.__process_vm_readv.restype = ctypes.c_ssize_t
+
+    def get_pid(self, process_name):
+        for entry in os.listdir(LinuxMemorySource.PROC_FOLDER):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(self.__proc_path(entry, 'cmdline'), 'rb') as file:
+                    arguments = file.read().split(b'\0')
+            except OSError:
+                continue
+            executable = LinuxMemorySource.__basename(
+                arguments[0].decode('utf-8', 'replace')
+            )
+            if executable == process_name:
+                return int(entry)
+        return -1
+
+    def get_module_base_address(self, pid, module_name):
+        module_address = None
+        try:
+            with open(self.__proc_path(pid, 'maps'), 'r') as file:
+                for line in file:
+                    fields = line.split(maxsplit=5)
+                    if(
+                            len(fields) == 6
+                            and int(fields[2], 16) == 0
+                            and LinuxMemorySource.__basename(
+                                fields[5].rstrip('\n')
+                            ) == module_name
+                    ):
+                        start_address = int(fields[0].split('-')[0], 16)
+                        if(
+                                module_address is None
+                                or start_address < module_address
+                        ):
+                            module_address = start_address
+        except OSError:
+            return None
+        return module_address
+
+    def read(self, pid, address, size):
+        buffer = bytearray(size)
+        return bytes(buffer[:self.read_into(pid, address, buffer)])
+
+    def read_into(self, pid, address, buffer):
+        view = memoryview(buffer)
+        return self.__readv_into(pid, [(address, len(view))], view)
+
+    def readv(self, pid, ranges):
+        ranges = list(ranges)
+        buffer = bytearray(sum(size for _, size in ranges))
+        bytes_read = self.readv_into(pid, ranges, buffer)
+
+        view = memoryview(buffer)
+        data = list()
+        offset = 0
+        for _, size in ranges:
+            available = max(0, min(size, bytes_read - offset))
+            data.append(bytes(view[offset:offset + available]))
+            offset += size
+        return data
+
+    def readv_into(self, pid, ranges, buffer):
+        ranges = list(ranges)
+        view = memoryview(buffer)
+        bytes_read = 0
+        offset = 0
+        for index in range(0, len(ranges), LinuxMemorySource.IOV_MAX):
+            chunk = ranges[index:index + LinuxMemorySource.IOV_MAX]
+            chunk_size = sum(size for _, size in chunk)
+            chunk_read = self.__readv_into(
+                pid, chunk, view[offset:offset + chunk_size]
+            )
+            bytes_read += chunk_read
+            offset += chunk_size
+            if chunk_read < chunk_size:
+                break
+        return bytes_read
+
+    def write(self, pid, address, data):
+        return os.pwrite(self.__get_mem_file(pid), data, address)
+
+    def register_termination_callback(self, pid, callback):
+        def wait_for_termination():
+            try:
+                pid_fd = os.pidfd_open(pid)
+            except (AttributeError, OSError):
+                pid_fd = None
+            if pid_fd is not None:
+                try:
+                    select.select([pid_fd], [], [])
+                finally:
+                    os.close(pid_fd)
+            else:
+                while os.path.exists(self.__proc_path(pid)):
+                    time.sleep(1)
+            callback()
+
+        threading.Thread(target=wait_for_termination, daemon=True).start()
+
+    def invalidate(self):
+        with self.__lock:
+            for mem_file in self.__mem_files.values():
+                try:
+                    os.close(mem_file)
+                except OSError:
+                    pass
+            self.__mem_files.clear()
+
+    def __readv_into(self, pid, ranges, view):
+        # The remote ranges are gathered back to back into a single local
+        # buffer, so only one local iovec is needed.
+        if not len(view):
+            return 0
+        if self.__process_vm_readv:
+            count = len(ranges)
+            local_iov = _IOVec(
+                ctypes.addressof(
+                    (ctypes.c_char * len(view)).from_buffer(view)
+                ),
+                len(view)
+            )
+            remote_iov = (_IOVec * count)(*ranges)
+            bytes_read = self.__process_vm_readv(
+                pid, ctypes.byref(local_iov), 1, remote_iov, count, 0
+            )
+            if bytes_read >= 0:
+                return bytes_read
+            error = ctypes.get_errno()
+            if error != errno.ENOSYS:
+                raise OSError(error, os.strerror(error))
+            self.__process_vm_readv = None
+
+        bytes_read = 0
+        offset = 0
+        mem_file = self.__get_mem_file(pid)
+        for address, size in ranges:
+            try:
+                read = os.preadv(
+                    mem_file, [view[offset:offset + size]], address
+                )
+            except OSError:
+                if not bytes_read:
+                    raise
+                break
+            bytes_read += read
+            offset += size
+            if read < size:
+                break
+        return bytes_read
+
+    def __get_mem_file(self, pid):
+        with self.__lock:
+            mem_file = self.__mem_files.get(pid)
+            if mem_file is None:
+                for cached_file in self.__mem_files.values():
+                    os.close(cached_file)
+                self.__mem_files.clear()
+                mem_file = os.open(self.__proc_path(pid, 'mem'), os.O_RDWR)
+                self.__mem_files[pid] = mem_file
+            return mem_file
+
+    @staticmethod
+    def __proc_path(pid, *entries):
+        return os.path.join(LinuxMemorySource.PROC_FOLDER, str(pid), *entries)
+
+    @staticmethod
+    def __basename(path):
+        return path.replace('\\', '/').rsplit('/', 1)[-1]
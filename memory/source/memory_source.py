@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Backend through which ProcessIO reads and writes the memory of another
+process.
+"""
+from abc import ABC, abstractmethod
+import sys
+
+class MemorySource(ABC):
+    """
+    """
+    PLATFORM = None
+
+    @staticmethod
+    def for_platform(platform=sys.platform):
+        """
+        Return a memory source instance for the given platform, by default the
+        one the bot is running on.
+        """
+        for cls in MemorySource.__subclasses__():
+            if cls.PLATFORM and platform.startswith(cls.PLATFORM):
+                return cls()
+        raise ValueError('unsupported platform: {}'.format(platform))
+
+    @abstractmethod
+    def get_pid(self, process_name):
+        """
+        Return the identifier of the process known to have an unique process
+        name. If not found, returns -1.
+        """
+
+    @abstractmethod
+    def get_module_base_address(self, pid, module_name):
+        """
+        Return the base address of a module given its name and process
+        identifier, None if the module is not found.
+        """
+
+    @abstractmethod
+    def read(self, pid, address, size):
+        """
+        Return up to size bytes read from address. The result is shorter than
+        the requested size if the memory range was only partially readable.
+        Raises OSError if nothing could be read.
+        """
+
+    @abstractmethod
+    def read_into(self, pid, address, buffer):
+        """
+        Fill the given writable buffer with the memory at address and return
+        the number of bytes read. Raises OSError if nothing could be read.
+        """
+
+    def readv(self, pid, ranges):
+        """
+        Scatter read of an iterable of (address, size) tuples. Returns a list
+        with the bytes of each range, following the same rules as read.
+        """
+        return [self.read(pid, address, size) for address, size in ranges]
+
+    def readv_into(self, pid, ranges, buffer):
+        """
+        Gather read of an iterable of (address, size) tuples, stored back to
+        back into the given writable buffer. Returns the number of bytes read,
+        which stops at the first range that could not be fully read.
+        """
+        view = memoryview(buffer)
+        bytes_read = 0
+        for address, size in ranges:
+            read = self.read_into(
+                pid, address, view[bytes_read:bytes_read + size]
+            )
+            bytes_read += read
+            if read < size:
+                break
+        return bytes_read
+
+    @abstractmethod
+    def write(self, pid, address, data):
+        """
+        Write the given bytes at address and return the number of bytes
+        written.
+        """
+
+    @abstractmethod
+    def register_termination_callback(self, pid, callback):
+        """
+        Call callback, without arguments and from another thread, once the
+        process terminates.
+        """
+
+    def invalidate(self):
+        """
+        Release every cached resource (handles, file descriptors...) bound to
+        the current process.
+        """
+
+    def close(self):
+        """
+        Release every resource held by the memory source, which is not used
+        afterwards.
+        """
+        self.invalidate()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+"""
+import threading
+
+import win32.kernel32 as kernel32
+
+class ProcessHandleManager():
+    """
+    Keeps the read and write handles of a process open between polls and
+    shares them among the reader, the writer and the overwriters.
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__pid = -1
+        self.__handles = dict()
+
+    def get_read_handle(self, pid):
+        """
+        """
+        return self.__get_handle(pid, kernel32.PROCESS_VM_READ)
+
+    def get_write_handle(self, pid):
+        """
+        """
+        return self.__get_handle(pid, kernel32.PROCESS_ALL_ACCESS)
+
+    def invalidate(self):
+        """
+        Closes every cached handle, the next request reopens them.
+        """
+        with self.__lock:
+            self.__close_handles()
+            self.__pid = -1
+
+    def __get_handle(self, pid, desired_access):
+        with self.__lock:
+            if pid != self.__pid:
+                self.__close_handles()
+                self.__pid = pid
+            handle = self.__handles.get(desired_access)
+            if handle is None:
+                handle = kernel32.open_process(desired_access, False, pid)
+                self.__handles[desired_access] = handle
+            return handle
+
+    def __close_handles(self):
+        for handle in self.__handles.values():
+            try:
+                kernel32.close_handle(handle)
+            except OSError:
+                pass
+        self.__handles.clear()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+"""
+import module_enumerator
+import pid_searcher
+import win32.kernel32 as kernel32
+
+from .memory_source import MemorySource
+from .process_handle_manager import ProcessHandleManager
+
+class Win32MemorySource(MemorySource):
+    """
+    Reads and writes through ReadProcessMemory/WriteProcessMemory, keeping
+    the process handles open between calls.
+    """
+    PLATFORM = 'win32'
+
+    def __init__(self):
+        self.__handle_manager = ProcessHandleManager()
+        self.__wait_callback = None
+        self.__wait_handle = None
+        self.__synchronize_handle = None
+
+    def get_pid(self, process_name):
+        return pid_searcher.get_pid_by_unique_process_name(process_name)
+
+    def get_module_base_address(self, pid, module_name):
+        return module_enumerator.get_module_base_address(pid, module_name)
+
+    def read(self, pid, address, size):
+        return kernel32.read_process_memory(
+            self.__handle_manager.get_read_handle(pid), address, size
+        )
+
+    def read_into(self, pid, address, buffer):
+        return kernel32.read_process_memory_into(
+            self.__handle_manager.get_read_handle(pid), address, buffer
+        )
+
+    def readv(self, pid, ranges):
+        # There is no vectored ReadProcessMemory, batch the calls on the
+        # same handle instead.
+        process_handle = self.__handle_manager.get_read_handle(pid)
+        return [
+            kernel32.read_process_memory(process_handle, address, size)
+            for address, size in ranges
+        ]
+
+    def readv_into(self, pid, ranges, buffer):
+        process_handle = self.__handle_manager.get_read_handle(pid)
+        view = memoryview(buffer)
+        bytes_read = 0
+        for address, size in ranges:
+            read = kernel32.read_process_memory_into(
+                process_handle, address, view[bytes_read:bytes_read + size]
+            )
+            bytes_read += read
+            if read < size:
+                break
+        return bytes_read
+
+    def write(self, pid, address, data):
+        return kernel32.write_process_memory(
+            self.__handle_manager.get_write_handle(pid), address, data
+        )
+
+    def register_termination_callback(self, pid, callback):
+        def process_terminated(_lp_paramenter, _time_or_wait_fired):
+            callback()
+            try:
+                kernel32.unregister_wait(self.__wait_handle)
+            except OSError:
+                pass
+            self.__wait_handle = None
+
+        self.__release_termination_wait()
+        self.__wait_callback = kernel32.wait_or_timer_callback(
+            process_terminated
+        )
+        self.__synchronize_handle = kernel32.open_process(
+            kernel32.SYNCHRONIZE, False, pid
+        )
+        self.__wait_handle = kernel32.register_wait_for_single_object(
+            self.__synchronize_handle,
+            self.__wait_callback,
+            None,
+            dw_flags=kernel32.WT_EXECUTEONLYONCE
+        )
+
+    def invalidate(self):
+        self.__handle_manager.invalidate()
+
+    def close(self):
+        self.__release_termination_wait()
+        self.invalidate()
+
+    def __release_termination_wait(self):
+        if self.__wait_handle is not None:
+            try:
+                kernel32.unregister_wait(self.__wait_handle)
+            except OSError:
+                pass
+            self.__wait_handle = None
+        if self.__synchronize_handle is not None:
+            kernel32.close_handle(self.__synchronize_handle)
+            self.__synchronize_handle = None
@@ -29,6 +29,7 @@
 
 """
 """
+import operator
 
 from constants.battle import BattleSide, CharacterIDs
 from constants.input import InputAttack, InputDirection
@@ -38,33 +39,68 @@ from log import LogUtils
 # pylint: disable=unused-wildcard-import,wildcard-import
 from MoveInfoEnums import *  # NOQA
 
+def _enum_property(enum_class, raw_attribute):
+    """
+    Property decoding the raw value of an enum through a lookup table built
+    once, instead of going through the enum constructor on every frame.
+    """
+    lookup_table = {member.value: member for member in enum_class}
+    get_raw_value = operator.attrgetter(raw_attribute)
+
+    def decode(self):
+        raw_value = get_raw_value(self)
+        try:
+            return lookup_table[raw_value]
+        except KeyError:
+            return enum_class(raw_value)
+    return property(decode)
+
+def _bitmask_property(bitmask, raw_attribute):
+    """
+    Property telling if every bit of the bitmask is set in the raw value.
+    """
+    get_raw_value = operator.attrgetter(raw_attribute)
+    return property(lambda self: get_raw_value(self) & bitmask == bitmask)
+
 class BotSnapshot:
     """
+    Player state of a single frame. Only the raw integers read from memory
+    are stored, enums and flags are decoded when accessed.
     """
+    __slots__ = (
+        'move_id', 'startup', 'startup_end', 'attack_damage', 'damage_taken',
+        'move_timer', 'recovery', 'char_id', 'throw_flag', 'rage_flag',
+        'input_counter', 'mystery_state', 'wins', 'combo_counter',
+        'combo_damage', 'juggle_damage', 'use_opponents_movelist',
+        'movelist_parser', 'skeleton', 'active_xyz', 'raw_simple_state',
+        'raw_attack_type', 'raw_complex_state', 'raw_input_direction',
+        'raw_input_attack', 'raw_stun_state', 'raw_power_crush',
+        'raw_cancel_window', 'raw_throw_tech', 'raw_jump_flags',
+        'raw_hit_outcome', 'raw_current_side', 'movelist_to_use'
+    )
 
     __logger = None
+    __INPUT_BUTTONS = {member.value: member for member in InputAttack}
+    __CHARACTER_NAMES = {member.value: member.name for member in CharacterIDs}
 
     def __init__(self, data_dict):
         """
         """
-        if not BotSnapshot.__logger:
-            BotSnapshot.__logger = LogUtils.initialize_module_logger(__name__)
-
         # self.xyz = (
         #    data_dict['PlayerDataAddress.x'], data_dict['PlayerDataAddress.y'],
         #    data_dict['PlayerDataAddress.z']
         # )
         self.move_id = data_dict['PlayerDataAddress.move_id']
-        self.simple_state = SimpleMoveStates(
-            data_dict['PlayerDataAddress.simple_move_state'])
-        self.attack_type = AttackType(
-            data_dict['PlayerDataAddress.attack_type']
+        self.raw_simple_state = (
+            data_dict['PlayerDataAddress.simple_move_state']
         )
+        self.raw_attack_type = data_dict['PlayerDataAddress.attack_type']
         self.startup = data_dict['PlayerDataAddress.attack_startup']
         self.startup_end = data_dict['PlayerDataAddress.attack_startup_end']
         self.attack_damage = data_dict['PlayerDataAddress.attack_damage']
-        self.complex_state = ComplexMoveStates(
-            data_dict['PlayerDataAddress.complex_move_state'])
+        self.raw_complex_state = (
+            data_dict['PlayerDataAddress.complex_move_state']
+        )
         self.damage_taken = data_dict['PlayerDataAddress.damage_taken']
         self.move_timer = data_dict['PlayerDataAddress.move_timer']
         self.recovery = data_dict['PlayerDataAddress.recovery']
@@ -72,52 +108,14 @@ class BotSnapshot:
         self.throw_flag = data_dict['PlayerDataAddress.throw_flag']
         self.rage_flag = data_dict['PlayerDataAddress.rage_flag']
         self.input_counter = data_dict['PlayerDataAddress.input_counter']
-        self.input_direction = InputDirection(
+        self.raw_input_direction = (
             data_dict['PlayerDataAddress.input_direction']
         )
-        try:
-            self.input_button = InputAttack(
-                data_dict['PlayerDataAddress.input_attack']
-                # % InputAttackCodes.xRAGE.value
-            )
-        except ValueError:
-            self.__logger.debug(
-                'unknown input attack: %d',
-                data_dict['PlayerDataAddress.input_attack']
-            )
-            self.input_button = InputAttack.NULL
-        self.rage_button_flag = (
-            data_dict['PlayerDataAddress.input_attack']
-            >= InputAttack.B_RAGE.value
-        )
-        self.stun_state = StunStates(data_dict['PlayerDataAddress.stun_type'])
-        self.is_power_crush = data_dict['PlayerDataAddress.power_crush'] > 0
-
-        cancel_window_bitmask = data_dict['PlayerDataAddress.cancel_window']
-        recovery_window_bitmask = data_dict['PlayerDataAddress.recovery']
-
-        self.is_cancelable = (
-            (CancelStatesBitmask.CANCELABLE.value & cancel_window_bitmask)
-            == CancelStatesBitmask.CANCELABLE.value
-        )
-        self.is_bufferable = (
-            (CancelStatesBitmask.BUFFERABLE.value & cancel_window_bitmask)
-            == CancelStatesBitmask.BUFFERABLE.value
-        )
-        self.is_parry1 = (
-            (CancelStatesBitmask.PARRYABLE_1.value & cancel_window_bitmask)
-            == CancelStatesBitmask.PARRYABLE_1.value
-        )
-        self.is_parry2 = (
-            (CancelStatesBitmask.PARRYABLE_2.value & cancel_window_bitmask)
-            == CancelStatesBitmask.PARRYABLE_2.value
-        )
-        self.is_recovering = (
-            (ComplexMoveStates.RECOVERING.value & recovery_window_bitmask)
-            == ComplexMoveStates.RECOVERING.value
-        )
-        self.is_starting = self.startup > 0 and self.move_timer <= self.startup
-        self.throw_tech = ThrowTechs(data_dict['PlayerDataAddress.throw_tech'])
+        self.raw_input_attack = data_dict['PlayerDataAddress.input_attack']
+        self.raw_stun_state = data_dict['PlayerDataAddress.stun_type']
+        self.raw_power_crush = data_dict['PlayerDataAddress.power_crush']
+        self.raw_cancel_window = data_dict['PlayerDataAddress.cancel_window']
+        self.raw_throw_tech = data_dict['PlayerDataAddress.throw_tech']
 
         #self.highest_y = max(data_dict['PlayerDataAddress.y'])
         # self.lowest_y = min(data_dict['PlayerDataAddress.y'])
@@ -140,20 +138,13 @@ class BotSnapshot:
             data_dict['PlayerDataAddress.activebox_z']
         )
 
-        self.is_jump = (
-            data_dict['PlayerDataAddress.jump_flags']
-            & JumpFlagBitmask.JUMP.value == JumpFlagBitmask.JUMP.value
-        )
-        self.hit_outcome = HitOutcome(
-            data_dict['PlayerDataAddress.hit_outcome']
-        )
+        self.raw_jump_flags = data_dict['PlayerDataAddress.jump_flags']
+        self.raw_hit_outcome = data_dict['PlayerDataAddress.hit_outcome']
         self.mystery_state = data_dict['PlayerDataAddress.mystery_state']
 
-        #self.movelist_to_use = data_dict['PlayerDataAddress.movelist_to_use']
+        self.movelist_to_use = data_dict['PlayerDataAddress.movelist_to_use']
 
-        self.current_side = BattleSide(
-            data_dict['PlayerDataAddress.current_side']
-        )
+        self.raw_current_side = data_dict['PlayerDataAddress.current_side']
 
         self.wins = data_dict['EndBlockPlayerDataAddress.round_wins']
         self.combo_counter = (
@@ -169,12 +160,74 @@ class BotSnapshot:
         self.use_opponents_movelist = data_dict['use_opponent_movelist']
         self.movelist_parser = data_dict['movelist_parser']
 
+    simple_state = _enum_property(SimpleMoveStates, 'raw_simple_state')
+    attack_type = _enum_property(AttackType, 'raw_attack_type')
+    complex_state = _enum_property(ComplexMoveStates, 'raw_complex_state')
+    input_direction = _enum_property(InputDirection, 'raw_input_direction')
+    stun_state = _enum_property(StunStates, 'raw_stun_state')
+    throw_tech = _enum_property(ThrowTechs, 'raw_throw_tech')
+    hit_outcome = _enum_property(HitOutcome, 'raw_hit_outcome')
+    current_side = _enum_property(BattleSide, 'raw_current_side')
+
+    is_cancelable = _bitmask_property(
+        CancelStatesBitmask.CANCELABLE.value, 'raw_cancel_window'
+    )
+    is_bufferable = _bitmask_property(
+        CancelStatesBitmask.BUFFERABLE.value, 'raw_cancel_window'
+    )
+    is_parry1 = _bitmask_property(
+        CancelStatesBitmask.PARRYABLE_1.value, 'raw_cancel_window'
+    )
+    is_parry2 = _bitmask_property(
+        CancelStatesBitmask.PARRYABLE_2.value, 'raw_cancel_window'
+    )
+    is_recovering = _bitmask_property(
+        ComplexMoveStates.RECOVERING.value, 'recovery'
+    )
+    is_jump = _bitmask_property(JumpFlagBitmask.JUMP.value, 'raw_jump_flags')
+
+    @property
+    def input_button(self):
+        """
+        """
         try:
-            self.character_name = CharacterIDs(
-                data_dict['PlayerDataAddress.char_id']
-            ).name
+            return BotSnapshot.__INPUT_BUTTONS[
+                self.raw_input_attack
+                # % InputAttackCodes.xRAGE.value
+            ]
         except KeyError:
-            self.character_name = "UNKNOWN"
+            if not BotSnapshot.__logger:
+                BotSnapshot.__logger = LogUtils.initialize_module_logger(
+                    __name__
+                )
+            self.__logger.debug(
+                'unknown input attack: %d', self.raw_input_attack
+            )
+            return InputAttack.NULL
+
+    @property
+    def rage_button_flag(self):
+        """
+        """
+        return self.raw_input_attack >= InputAttack.B_RAGE.value
+
+    @property
+    def is_power_crush(self):
+        """
+        """
+        return self.raw_power_crush > 0
+
+    @property
+    def is_starting(self):
+        """
+        """
+        return self.startup > 0 and self.move_timer <= self.startup
+
+    @property
+    def character_name(self):
+        """
+        """
+        return BotSnapshot.__CHARACTER_NAMES.get(self.char_id, 'UNKNOWN')
 
     # def print_y_info(self):
     #     print('{:.4f}, {:.4f}, {:.4f}'.format(
@@ -445,4 +498,4 @@ class BotSnapshot:
         """
 
         """
-        return self.get_movelist_to_use
+        return self.movelist_to_use
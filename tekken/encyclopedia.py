@@ -8,23 +8,38 @@ import sys
 import time
 
 from constants.battle import MainMenus, PunishResult
+from constants.event import EncyclopediaEvent
+from constants.overlay.frame_data import Columns
 from log import LogUtils
+from patterns.observer import Publisher
 from MoveInfoEnums import AttackType
 from MoveInfoEnums import ThrowTechs
 from MoveInfoEnums import ComplexMoveStates
 
+from .frame_data_cache import FrameDataCache
 from .game_state import TekkenGameState
+from .match_stat_store import MatchStatStore
 
 class TekkenEncyclopedia:
 
     __logger = None
 
-    def __init__(self, is_player_one=False, print_extended_frame_data=False):
+    def __init__(
+            self, is_player_one=False, print_extended_frame_data=False,
+            frame_data_cache=None, match_stat_store=None, publisher=None
+    ):
         self.frame_data = {}
+        self.frame_data_cache = frame_data_cache
+        self.__frame_data_cache_key = None
+        self.__loaded_frame_data_cache_key = None
+        self.__pending_frame_data = None
         self.game_events = []
         self.current_game_event = None
         self.is_player_one = is_player_one
         self.print_extended_frame_data = print_extended_frame_data
+        if publisher is None:
+            publisher = Publisher(EncyclopediaEvent)
+        self.publisher = publisher
 
         self.active_frame_wait = 1
         self.punish_window_counter = 0
@@ -32,9 +47,7 @@ class TekkenEncyclopedia:
         self.was_fight_being_reacquired = True
         self.is_match_recorded = False
 
-        self.stat_filename = "TekkenData/matches.txt"
-        if self.is_player_one:
-            self.load_stats()
+        self.match_stat_store = match_stat_store
 
         self.current_punish_window = None
         self.punish_windows = []
@@ -46,54 +59,21 @@ class TekkenEncyclopedia:
                 __name__
             )
 
-    def load_stats(self):
-        self.stat_dict = {}
-        self.stat_dict['char_stats'] = {}
-        self.stat_dict['matchup_stats'] = {}
-        self.stat_dict['opponent_stats'] = {}
-        try:
-            with open(self.stat_filename, 'r') as r_file:
-                lines = r_file.readlines()
-            for line in lines:
-                if '|' in line:
-                    args = line.split('|')
-                    result = args[0].strip()
-                    player_char = args[2].strip()
-                    opponent_name = args[4].strip()
-                    opponent_char = args[5].strip()
-                    self.add_stat(
-                        result, player_char, opponent_name, opponent_char
-                    )
-        except FileNotFoundError:
-            pass
-
-    def add_stat(self, result, player_char, opponent_name, opponent_char):
-        if not opponent_char in self.stat_dict['char_stats']:
-            self.stat_dict['char_stats'][opponent_char] = [0, 0, 0]
-        if not opponent_name in self.stat_dict['opponent_stats']:
-            self.stat_dict['opponent_stats'][opponent_name] = [0, 0, 0]
-        matchup_string = "{} vs {}".format(player_char, opponent_char)
-        if not matchup_string in self.stat_dict['matchup_stats']:
-            self.stat_dict['matchup_stats'][matchup_string] = [0, 0, 0]
-
-        if 'WIN' in result:
-            index = 0
-        elif 'LOSS' in result:
-            index = 1
-        else:
-            index = 2
-
-        self.stat_dict['char_stats'][opponent_char][index] += 1
-        self.stat_dict['opponent_stats'][opponent_name][index] += 1
-        self.stat_dict['matchup_stats'][matchup_string][index] += 1
+    def add_stat(
+            self, result, player_char, opponent_name, opponent_char,
+            **kwargs
+    ):
+        if self.match_stat_store is not None:
+            self.match_stat_store.add_stat(
+                result, player_char, opponent_name, opponent_char, **kwargs
+            )
 
     def record_from_stat(self, catagory, lookup):
-        try:
-            stats = self.stat_dict[catagory][lookup]
-            wins = stats[0]
-            losses = stats[1]
-            draws = stats[2]
-        except KeyError:
+        if self.match_stat_store is not None:
+            wins, losses, draws = self.match_stat_store.get_record(
+                catagory, lookup
+            )
+        else:
             wins = 0
             losses = 0
             draws = 0
@@ -158,15 +138,67 @@ class TekkenEncyclopedia:
 
     def update(self, game_state: TekkenGameState):
         if self.is_player_one:
-            game_state.flip_mirror()
+            game_state = game_state.get_mirrored_view()
 
+        self.update_frame_data_cache(game_state)
         # self.check_jumpframe_data_fallback(game_state)
         self.determine_frame_data(game_state)
         self.determine_game_stats(game_state)
         self.determine_coaching_tips(game_state)
 
-        if self.is_player_one:
-            game_state.flip_mirror()
+    def update_frame_data_cache(self, game_state: TekkenGameState):
+        """
+        Request the stored frame data of the opponent character once the
+        names get resolved, and add and publish the entries of the moves not
+        observed yet when it gets loaded, so they are shown before the moves
+        are seen again.
+        """
+        if self.frame_data_cache is None:
+            return
+        reader = game_state.get_reader()
+        if reader.reacquire_names:
+            self.__frame_data_cache_key = None
+        elif self.__frame_data_cache_key is None:
+            self.__frame_data_cache_key = (
+                FrameDataCache.get_game_version(reader.config),
+                game_state.state_log[-1].opp.char_id
+            )
+            if(
+                    self.__frame_data_cache_key
+                    != self.__loaded_frame_data_cache_key
+            ):
+                # move ids are only unique for a character
+                self.frame_data = {}
+                self.__loaded_frame_data_cache_key = (
+                    self.__frame_data_cache_key
+                )
+                self.__pending_frame_data = self.frame_data_cache.load(
+                    *self.__frame_data_cache_key
+                )
+
+        if(
+                self.__pending_frame_data is not None
+                and self.__pending_frame_data.done()
+        ):
+            if self.__pending_frame_data.exception() is None:
+                prefix = self.get_player_string(game_state)
+                for move_id, values in sorted(
+                        self.__pending_frame_data.result().items()
+                ):
+                    if move_id not in self.frame_data:
+                        frame_data_entry = FrameDataEntry(
+                            self.print_extended_frame_data
+                        )
+                        frame_data_entry.move_id = move_id
+                        frame_data_entry.prefix = prefix
+                        for attribute, value in values.items():
+                            setattr(frame_data_entry, attribute, value)
+                        self.frame_data[move_id] = frame_data_entry
+                        self.publisher.dispatch(
+                            EncyclopediaEvent.FRAME_DATA, frame_data_entry,
+                            self.is_player_one
+                        )
+            self.__pending_frame_data = None
 
     def determine_coaching_tips(self, game_state: TekkenGameState):
         if self.previous_frame_data_entry != self.current_frame_data_entry:
@@ -240,10 +272,17 @@ class TekkenEncyclopedia:
                     self.close_punish_window(PunishResult.NO_PUNISH)
                 else:
                     self.close_punish_window(PunishResult.NO_WINDOW)
-            if self.current_punish_window is not None:
-                self.current_punish_window.adjust_window(
-                    game_state.get_opp_frames_till_next_move(),
-                    game_state.get_bot_frames_till_next_move()
+            if(
+                    self.current_punish_window is not None
+                    and self.current_punish_window.adjust_window(
+                        game_state.get_opp_frames_till_next_move(),
+                        game_state.get_bot_frames_till_next_move()
+                    )
+            ):
+                self.publisher.dispatch(
+                    EncyclopediaEvent.FRAME_ADVANTAGE,
+                    self.current_punish_window.get_frame_advantage(),
+                    self.is_player_one
                 )
 
             # perfect_punish = False
@@ -254,6 +293,10 @@ class TekkenEncyclopedia:
 
     def close_punish_window(self, result, do_close_frame_data_entries=True):
         self.current_punish_window.close_window(result)
+        self.publisher.dispatch(
+            EncyclopediaEvent.PUNISH, self.current_punish_window,
+            self.is_player_one
+        )
         self.current_punish_window = None
         if do_close_frame_data_entries:
             self.previous_frame_data_entry = None
@@ -375,6 +418,7 @@ class TekkenEncyclopedia:
 
                 round_number = game_state.get_round_number()
                 sys.stdout.write('!ROUND | {} | HIT'.format(round_number))
+                self.publisher.dispatch(EncyclopediaEvent.ROUND, round_number)
                 if(
                         (
                             game_state.state_log[-1].bot.wins == 3
@@ -405,19 +449,19 @@ class TekkenEncyclopedia:
                     else:
                         result = "LOSS"
 
+                    played = time.strftime('%Y_%m_%d_%H.%M')
                     match_result = (
                         '{} | {} | {} | vs | {} | {} | {}-{} | {}'.format(
                             result, player_name, player_char, opponent_name,
-                            opponent_char, player_wins, opponent_wins,
-                            time.strftime('%Y_%m_%d_%H.%M')
+                            opponent_char, player_wins, opponent_wins, played
                         )
                     )
                     sys.stdout.write('{}'.format(match_result))
                     self.add_stat(
-                        result, player_char, opponent_name, opponent_char
+                        result, player_char, opponent_name, opponent_char,
+                        player_name=player_name, player_wins=player_wins,
+                        opponent_wins=opponent_wins, played=played
                     )
-                    # with open(self.stat_filename, 'a') as a_file:
-                    #     a_file.write(match_result + '\n')
             if game_state.get_timer(frames_ago) < 3600 and self.game_events:
                 summary = RoundSummary(
                     self.game_events,
@@ -440,18 +484,21 @@ class TekkenEncyclopedia:
         return [
             '!RECORD | vs {}: {}'.format(
                 opponent_char,
-                self.record_from_stat('char_stats', opponent_char)
+                self.record_from_stat(
+                    MatchStatStore.CHAR_STATS, opponent_char
+                )
             ),
             '!RECORD | vs {}: {}'.format(
                 opponent_name,
-                self.record_from_stat('opponent_stats', opponent_name)
+                self.record_from_stat(
+                    MatchStatStore.OPPONENT_STATS, opponent_name
+                )
             ),
             '!RECORD | {} vs {}: {}'.format(
                 player_char, opponent_char,
                 self.record_from_stat(
-                    'matchup_stats', '{} vs {}'.format(
-                        player_char, opponent_char
-                    )
+                    MatchStatStore.MATCHUP_STATS,
+                    MatchStatStore.get_matchup(player_char, opponent_char)
                 )
             )
         ]
@@ -595,15 +642,18 @@ class TekkenEncyclopedia:
 
                     if game_state.is_bot_blocking():
                         frame_data_entry.onBlock = new_frame_advantage_calc
+                        frame_data_entry.lastObserved = 'onBlock'
                     else:
                         if game_state.is_bot_getting_counter_hit():
                             frame_data_entry.onCounterHit = (
                                 new_frame_advantage_calc
                             )
+                            frame_data_entry.lastObserved = 'onCounterHit'
                         else:
                             frame_data_entry.onNormalHit = (
                                 new_frame_advantage_calc
                             )
+                            frame_data_entry.lastObserved = 'onNormalHit'
 
                     frame_data_entry.hitRecovery = time_till_recovery_opp
                     frame_data_entry.blockRecovery = time_till_recovery_bot
@@ -614,6 +664,14 @@ class TekkenEncyclopedia:
                     frame_data_entry.prefix = self.get_player_string(game_state)
 
                     sys.stdout.write(frame_data_entry)
+                    self.publisher.dispatch(
+                        EncyclopediaEvent.FRAME_DATA, frame_data_entry,
+                        self.is_player_one
+                    )
+                    if self.__frame_data_cache_key is not None:
+                        self.frame_data_cache.store(
+                            *self.__frame_data_cache_key, frame_data_entry
+                        )
 
                     self.current_frame_data_entry = frame_data_entry
 
@@ -634,6 +692,8 @@ class FrameDataEntry:
         self.onBlock = '??'
         self.onCounterHit = '??'
         self.onNormalHit = '??'
+        # name of the frame advantage field updated by the last observation
+        self.lastObserved = None
         self.recovery = '??'
         self.damage = '??'
         self.blockFrames = '??'
@@ -663,8 +723,22 @@ class FrameDataEntry:
             s += "+R"
         return s
 
-    def __repr__(self):
-
+    def get_column_string(self, column: Columns):
+        """
+        Return the text of a single column of the frame data overlay.
+        """
+        if column == Columns.STARTUP_FRAMES:
+            return str(self.__get_notes_and_startup()[1])
+        if column == Columns.NOTES:
+            return self.__get_notes_and_startup()[0].strip()
+        return FrameDataEntry.__COLUMN_GETTERS[column](self)
+
+    def get_tracking_string(self):
+        return self.tracking.name.replace('_MINUS', '-').replace(
+            "_PLUS", '+'
+        ).replace(ComplexMoveStates.UNKN.name, '?')
+
+    def __get_notes_and_startup(self):
         notes = ''
 
         if self.throwTech != None and self.throwTech != ThrowTechs.NONE:
@@ -688,6 +762,15 @@ class FrameDataEntry:
             elif self.print_extended:
                 if report.is_present():
                     notes += str(report)
+
+        if self.calculated_startup != self.startup:
+            self.calculated_startup = str(self.calculated_startup) + "?"
+        return notes, self.calculated_startup
+
+    def __repr__(self):
+
+        notes, calculated_startup = self.__get_notes_and_startup()
+
         nerd_string = ""
         if self.print_extended:
             pass
@@ -695,20 +778,17 @@ class FrameDataEntry:
             #notes += ' a_recovery {}'.format(self.hitRecovery)
             #notes += "Total:" + str(self.recovery) + "f "
 
-        if self.calculated_startup != self.startup:
-            self.calculated_startup = str(self.calculated_startup) + "?"
-
         non_nerd_string = "{:^5}|{:^4}|{:^4}|{:^8}|{:^4}|{:^4}|{:^4}|{:^5}|{:^3}|{:^2}|{:^3}|{:^3}|{:^3}|".format(
             str(self.input),
             str(self.move_id),
             self.move_str,
             str(self.hitType)[:8],
-            str(self.calculated_startup),
+            str(calculated_startup),
             self.WithPlusIfNeeded(self.onBlock),
             self.WithPlusIfNeeded(self.onNormalHit),
             self.WithPlusIfNeeded(self.onCounterHit),
             (str(self.currentActiveFrame) + "/" + str(self.activeFrames)),
-            self.tracking.name.replace('_MINUS', '-').replace("_PLUS", '+').replace(ComplexMoveStates.UNKN.name, '?'),
+            self.get_tracking_string(),
             self.recovery,
             self.hitRecovery,
             self.blockRecovery
@@ -722,6 +802,29 @@ class FrameDataEntry:
             now_string = ' NOW:{}'.format(self.currentFrameAdvantage)
         return self.prefix + non_nerd_string + notes_string + now_string
 
+    __COLUMN_GETTERS = {
+        Columns.INPUT_COMMAND: lambda entry: str(entry.input),
+        Columns.MOVE_ID: lambda entry: str(entry.move_id),
+        Columns.MOVE_NAME: lambda entry: str(entry.move_str),
+        Columns.ATTACK_TYPE: lambda entry: str(entry.hitType)[:8],
+        Columns.ON_BLOCK_FRAMES: (
+            lambda entry: entry.WithPlusIfNeeded(entry.onBlock)
+        ),
+        Columns.ON_HIT_FRAMES: (
+            lambda entry: entry.WithPlusIfNeeded(entry.onNormalHit)
+        ),
+        Columns.COUNTER_HIT_FRAMES: (
+            lambda entry: entry.WithPlusIfNeeded(entry.onCounterHit)
+        ),
+        Columns.ACTIVE_FRAMES: lambda entry: '{}/{}'.format(
+            entry.currentActiveFrame, entry.activeFrames
+        ),
+        Columns.TRACKING: lambda entry: entry.get_tracking_string(),
+        Columns.TOTAL_FRAMES: lambda entry: str(entry.recovery),
+        Columns.RECOVERY_FRAMES: lambda entry: str(entry.hitRecovery),
+        Columns.OPPONENT_FRAMES: lambda entry: str(entry.blockRecovery)
+    }
+
 class GameStatEventEntry:
     class EntryType(Enum):
         COUNTER = 1
@@ -839,6 +942,9 @@ class PunishWindow:
         return 0 - self.hit_recovery - self.frames_locked
 
     def adjust_window(self, hit_recovery, block_recovery):
+        """
+        Return True if the frame advantage of the window has changed.
+        """
         #if block_recovery > self.block_recovery:
         self.hit_recovery = hit_recovery
 
@@ -863,6 +969,8 @@ class PunishWindow:
                 )
             )
             self.original_diff = self.get_frame_advantage()
+            return True
+        return False
 
     def close_window(self, result: PunishResult):
         self.result = result
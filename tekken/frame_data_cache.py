@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Persistent store of the frame data observed for each character.
+"""
+from concurrent.futures import Future
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+
+class FrameDataCache():
+    """
+    SQLite store of the frame data entries observed by the encyclopedias,
+    keyed by game version, character id and move id.
+
+    The database is only touched by a background thread, which owns the
+    connection: loads return a Future of the rows of a character, and stores
+    get queued and committed in batches, so the poll loop never waits on the
+    disk. Unknown values are stored as NULL, and storing an entry never
+    overwrites a known value with an unknown one: through an UPSERT on
+    SQLite 3.24 or later, or an INSERT OR IGNORE followed by an UPDATE on
+    older versions.
+    """
+    DEFAULT_PATH = 'TekkenData/frame_data.sqlite'
+
+    FIELDS = (
+        ('startup', 'startup'), ('active_frames', 'activeFrames'),
+        ('recovery', 'recovery'), ('on_block', 'onBlock'),
+        ('on_hit', 'onNormalHit'), ('on_counter_hit', 'onCounterHit'),
+        ('hit_type', 'hitType'), ('input', 'input'), ('name', 'move_str')
+    )
+
+    __CREATE_TABLE = (
+        'CREATE TABLE IF NOT EXISTS frame_data ('
+        'game_version TEXT NOT NULL, char_id INTEGER NOT NULL, '
+        'move_id INTEGER NOT NULL, {}, '
+        'PRIMARY KEY (game_version, char_id, move_id))'
+    ).format(', '.join(column for column, _ in FIELDS))
+    __SELECT = (
+        'SELECT move_id, {} FROM frame_data '
+        'WHERE game_version = ? AND char_id = ?'
+    ).format(', '.join(column for column, _ in FIELDS))
+    __UPSERT = (
+        'INSERT INTO frame_data (game_version, char_id, move_id, {}) '
+        'VALUES (?, ?, ?, {}) '
+        'ON CONFLICT (game_version, char_id, move_id) DO UPDATE SET {}'
+    ).format(
+        ', '.join(column for column, _ in FIELDS),
+        ', '.join('?' for _ in FIELDS),
+        ', '.join(
+            '{0} = COALESCE(excluded.{0}, {0})'.format(column)
+            for column, _ in FIELDS
+        )
+    )
+    __INSERT_OR_IGNORE = (
+        'INSERT OR IGNORE INTO frame_data (game_version, char_id, move_id) '
+        'VALUES (?, ?, ?)'
+    )
+    __UPDATE = (
+        'UPDATE frame_data SET {} '
+        'WHERE game_version = ? AND char_id = ? AND move_id = ?'
+    ).format(
+        ', '.join(
+            '{0} = COALESCE(?, {0})'.format(column) for column, _ in FIELDS
+        )
+    )
+    __HAS_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+    __STOP = object()
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.__queue = queue.Queue()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    @staticmethod
+    def get_game_version(config):
+        """
+        Return the SHA-256 hex digest of the expected module address and the
+        player data addresses of a parsed memory_address.ini, which change
+        with every game patch.
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    config['MemoryAddressOffsets']['expected_module_address'],
+                    config['PlayerDataAddress']
+                ],
+                sort_keys=True, default=str
+            ).encode()
+        ).hexdigest()
+
+    def load(self, game_version, char_id):
+        """
+        Return a Future of the dict of the stored rows of a character, by
+        move id, each one a dict of FrameDataEntry attribute names to their
+        known values.
+        """
+        future = Future()
+        self.__queue.put((future, game_version, char_id))
+        return future
+
+    def store(self, game_version, char_id, entry):
+        """
+        Queue the known values of a FrameDataEntry to be stored.
+        """
+        self.__queue.put((
+            game_version, char_id, entry.move_id,
+            *(
+                FrameDataCache.__get_value(getattr(entry, attribute))
+                for _, attribute in FrameDataCache.FIELDS
+            )
+        ))
+
+    def close(self):
+        """
+        Write the queued entries and stop the background thread.
+        """
+        self.__queue.put(FrameDataCache.__STOP)
+        self.__thread.join()
+
+    def __run(self):
+        directory = os.path.dirname(self.path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            connection.execute(FrameDataCache.__CREATE_TABLE)
+            connection.commit()
+        except sqlite3.Error as error:
+            sys.stdout.write(
+                'Unable to open the frame data cache {}: {}'.format(
+                    self.path, error
+                )
+            )
+            connection = None
+        is_running = True
+        while is_running:
+            items = [self.__queue.get()]
+            while True:
+                try:
+                    items.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = []
+            for item in items:
+                if item is FrameDataCache.__STOP:
+                    is_running = False
+                elif isinstance(item[0], Future):
+                    FrameDataCache.__store(connection, rows)
+                    rows = []
+                    FrameDataCache.__load(connection, *item)
+                else:
+                    rows.append(item)
+            FrameDataCache.__store(connection, rows)
+        if connection is not None:
+            connection.close()
+
+    @staticmethod
+    def __load(connection, future, game_version, char_id):
+        if not future.set_running_or_notify_cancel():
+            return
+        entries = {}
+        if connection is not None:
+            try:
+                for row in connection.execute(
+                        FrameDataCache.__SELECT, (game_version, char_id)
+                ):
+                    entries[row[0]] = {
+                        attribute: value
+                        for (_, attribute), value in zip(
+                            FrameDataCache.FIELDS, row[1:]
+                        )
+                        if value is not None
+                    }
+            except sqlite3.Error as error:
+                future.set_exception(error)
+                return
+        future.set_result(entries)
+
+    @staticmethod
+    def __store(connection, rows):
+        if not rows or connection is None:
+            return
+        try:
+            with connection:
+                if FrameDataCache.__HAS_UPSERT:
+                    connection.executemany(FrameDataCache.__UPSERT, rows)
+                else:
+                    connection.executemany(
+                        FrameDataCache.__INSERT_OR_IGNORE,
+                        (row[:3] for row in rows)
+                    )
+                    connection.executemany(
+                        FrameDataCache.__UPDATE,
+                        (row[3:] + row[:3] for row in rows)
+                    )
+        except sqlite3.Error as error:
+            sys.stdout.write('Unable to store frame data: {}'.format(error))
+
+    @staticmethod
+    def __get_value(value):
+        if value == '??' or value is None:
+            return None
+        if isinstance(value, (int, str)):
+            return value
+        return str(value)
@@ -38,7 +38,6 @@ from constants.battle.side import BattleSide
 
 # pylint: disable=unused-wildcard-import,wildcard-import
 from win32.defines import *  #NOQA
-import win32.kernel32 as kernel32
 import win32.user32 as user32
 import win32.utils.actual_rect as actual_rect
 
@@ -55,14 +54,19 @@ from .data.wrappers.graphic_settings import (
 from .bot_snapshot import BotSnapshot
 from .game_snapshot import GameSnapshot
 from .parsers import MovelistParser
+from .player_data_decoder import PlayerDataDecoder
 from .process_identifier import ProcessIO
+from .read_plan import ReadPlan, SparseBlock
 
 class TekkenGameReader(ProcessIO):
     """
     """
+    ROLLBACK_FRAMES = 8
 
-    def __init__(self, config, pid, module_address=None):
-        super().__init__(config, pid, module_address)
+    def __init__(
+            self, config, pid, module_address=None, memory_source=None
+    ):
+        super().__init__(config, pid, module_address, memory_source)
         self.reacquire_game_state = True
         self.reacquire_names = True
         self.original_facing = None
@@ -83,9 +87,15 @@ class TekkenGameReader(ProcessIO):
 
         self.is_in_battle = False
         self.side_menu_selection = None
+        # frame counts and sparse blocks read by the last update, from the
+        # oldest to the newest one
+        self.last_player_data_frames = list()
 
         self.window_handle = 0
-        self.__process_handle = 0
+
+        self.__read_plan = None
+        self.__player_data_decoder = None
+        self.__read_plan_sections = None
 
     def reacquire_everything(self):
         """
@@ -109,9 +119,7 @@ class TekkenGameReader(ProcessIO):
             t_size = SIZE_OF(ULONG)
 
         try:
-            data = kernel32.read_process_memory(
-                self.__process_handle, address, t_size
-            )
+            data = self.memory_source.read(self.pid, address, t_size)
             if is_string:
                 try:
                     return data.decode('utf-8')
@@ -124,12 +132,10 @@ class TekkenGameReader(ProcessIO):
                 return struct.unpack('<f', data)[0]
             else:
                 return int.from_bytes(data, byteorder='little')
-        except Exception:
+        except Exception as exception:
             if not is_64bit:
                 sys.stdout.write(
-                    'Read process memory. Error: Code {}'.format(
-                        kernel32.get_last_error()
-                    )
+                    'Read process memory. Error: {}'.format(exception)
                 )
                 self.reacquire_everything()
                 raise
@@ -139,9 +145,7 @@ class TekkenGameReader(ProcessIO):
         address = self.module_address
         for i, offset in enumerate(addresses):
             if i + 1 < len(addresses):
-                address = self.get_pointer_value(
-                    self.__process_handle, address + offset
-                )
+                address = self.get_pointer_value(address + offset)
                 if not address:
                     address = None
                     break
@@ -153,16 +157,124 @@ class TekkenGameReader(ProcessIO):
         """
         """
         try:
-            data = kernel32.read_process_memory(
-                self.__process_handle, address, size_of_block
+            data = self.memory_source.read(self.pid, address, size_of_block)
+        except OSError as exception:
+            sys.stdout.write(
+                'Getting Block of Data Error: {}'.format(exception)
             )
-        except OSError:
+            raise
+        return data
+
+    def get_block_data_list(self, addresses, size_of_block):
+        """
+        Read several blocks of the same size with a single vectored read.
+        """
+        try:
+            return self.memory_source.readv(
+                self.pid,
+                [(address, size_of_block) for address in addresses]
+            )
+        except OSError as exception:
             sys.stdout.write(
-                'Getting Block of Data Error: Code {}'.format(
-                    kernel32.get_last_error()
+                'Getting Block of Data Error: {}'.format(exception)
+            )
+            raise
+
+    def get_read_plan(self):
+        """
+        Return the read plan of the player data block, compiled again, along
+        with its decoder, whenever the memory address config gets reloaded.
+        """
+        sections = tuple(
+            self.config[section] for section in (
+                'MemoryAddressOffsets', 'GameDataAddress',
+                'PlayerDataAddress', 'EndBlockPlayerDataAddress'
+            )
+        )
+        if(
+                self.__read_plan_sections is None
+                or any(
+                    section is not previous_section
+                    for section, previous_section in zip(
+                        sections, self.__read_plan_sections
+                    )
                 )
+        ):
+            self.__read_plan = ReadPlan.from_config(self.config)
+            self.__player_data_decoder = PlayerDataDecoder(
+                self.config, self.__read_plan
             )
-        return data
+            self.__read_plan_sections = sections
+        return self.__read_plan
+
+    def get_player_data_decoder(self):
+        """
+        Return the decoder of the current read plan compact buffer.
+        """
+        self.get_read_plan()
+        return self.__player_data_decoder
+
+    def get_sparse_block_list(self, addresses):
+        """
+        Read the read plan ranges of several player data blocks with a single
+        vectored read.
+        """
+        read_plan = self.get_read_plan()
+        requests = list()
+        for address in addresses:
+            requests.extend(read_plan.get_requests(address))
+        buffer = bytearray(len(addresses) * read_plan.size)
+        try:
+            bytes_read = self.memory_source.readv_into(
+                self.pid, requests, buffer
+            )
+            if bytes_read < len(buffer):
+                raise OSError(
+                    'partial read of {} out of {} bytes'.format(
+                        bytes_read, len(buffer)
+                    )
+                )
+        except OSError as exception:
+            sys.stdout.write(
+                'Getting Block of Data Error: {}'.format(exception)
+            )
+            raise
+        view = memoryview(buffer)
+        return [
+            SparseBlock(read_plan, view[offset:offset + read_plan.size])
+            for offset in range(0, len(buffer), read_plan.size)
+        ]
+
+    def get_rollback_frames(self, second_address_base):
+        """
+        Return the (frame_count, address) pairs of the rollback copies of the
+        game state, sorted from the newest to the oldest one. Every frame
+        counter is fetched with a single vectored read.
+        """
+        # for rollback purposes, there are 8 copies of the game state, each
+        # one updatating once every 8 frames
+        addresses = [
+            second_address_base
+            + i * self.config['MemoryAddressOffsets']['rollback_frame_offset']
+            for i in range(TekkenGameReader.ROLLBACK_FRAMES)
+        ]
+        frame_counts = self.memory_source.readv(
+            self.pid,
+            [
+                (
+                    address + self.config['GameDataAddress']['frame_count'],
+                    SIZE_OF(ULONGLONG)
+                )
+                for address in addresses
+            ]
+        )
+        return sorted(
+            (
+                (struct.unpack('<Q', frame_count)[0], address)
+                for frame_count, address in zip(frame_counts, addresses)
+            ),
+            key=lambda x: -x[0]
+        )
 
     def get_value_from_data_block(
             self, frame, offset, player_2_offset=0x0, is_float=False
@@ -346,20 +458,20 @@ class TekkenGameReader(ProcessIO):
     def is_data_a_float(self, data):
         """
         """
-        return data in (
-            'x', 'y', 'z',
-            'activebox_x', 'activebox_y', 'activebox_z',
-            'distance'
-        )
+        return PlayerDataDecoder.is_data_a_float(data)
 
-    def get_updated_state(self, rollback_frame=0):
+    def get_updated_state(self, rollback_frame=0, last_frame_count=None):
         """
+        Besides the requested rollback frame, 'dropped_battles' holds the
+        snapshots of the frames newer than last_frame_count that are still
+        present in the rollback copies, sorted from the oldest to the newest
+        one. All of them come from the same vectored read.
         """
         if self.is_pid_valid() and self.module_address is not None:
-            game_state = {'battle': None, 'controllers': None, 'graphics': None}
-            self.__process_handle = kernel32.open_process(
-                kernel32.PROCESS_VM_READ, False, self.pid
-            )
+            game_state = {
+                'battle': None, 'dropped_battles': list(),
+                'controllers': None, 'graphics': None
+            }
             try:
                 if not self.window_handle:
                     try:
@@ -378,7 +490,7 @@ class TekkenGameReader(ProcessIO):
                 player_data_base_address = self.module_address
                 for i, offset in enumerate(self.player_data_pointer_offset):
                     player_data_base_address = self.get_pointer_value(
-                        self.__process_handle, player_data_base_address + offset
+                        player_data_base_address + offset
                     )
                     if not player_data_base_address:
                         break
@@ -402,27 +514,12 @@ class TekkenGameReader(ProcessIO):
                     except ValueError:
                         pass
                 else:
-                    last_eight_frames = []
                     second_address_base = self.get_value_from_address(
                         player_data_base_address, is_64bit=True
                     )
-                    # for rollback purposes, there are 8 copies of the
-                    # game state, each one updatating once every 8 frames
-                    for i in range(8):
-                        potential_second_address = (
-                            second_address_base
-                            + i
-                            * self.config
-                            ['MemoryAddressOffsets']
-                            ['rollback_frame_offset']
-                        )
-                        potential_frame_count = self.get_value_from_address(
-                            potential_second_address
-                            + self.config['GameDataAddress']['frame_count'],
-                            is_64bit=True
-                        )
-                        last_eight_frames.append(
-                            (potential_frame_count, potential_second_address))
+                    last_eight_frames = self.get_rollback_frames(
+                        second_address_base
+                    )
 
                     if rollback_frame >= len(last_eight_frames):
                         sys.stdout.write(
@@ -432,30 +529,51 @@ class TekkenGameReader(ProcessIO):
                         )
                         rollback_frame = len(last_eight_frames) - 1
 
-                    best_frame_count, player_data_second_address = sorted(
-                        last_eight_frames, key=lambda x: -x[0]
-                    )[rollback_frame]
+                    best_frame_count, player_data_second_address = (
+                        last_eight_frames[rollback_frame]
+                    )
 
-                    player_data_frame = self.get_block_data(
-                        player_data_second_address,
-                        self.config
-                        ['MemoryAddressOffsets']['rollback_frame_offset']
+                    dropped_frames = list()
+                    if last_frame_count is not None:
+                        dropped_frames = [
+                            (frame_count, address)
+                            for frame_count, address in reversed(
+                                last_eight_frames[rollback_frame + 1:]
+                            )
+                            if frame_count > last_frame_count
+                        ]
+
+                    player_data_frame, *dropped_data_frames = (
+                        self.get_sparse_block_list(
+                            [player_data_second_address] + [
+                                address for _, address in dropped_frames
+                            ]
+                        )
+                    )
+                    self.last_player_data_frames = [
+                        (frame_count, data_frame)
+                        for (frame_count, _), data_frame in zip(
+                            dropped_frames, dropped_data_frames
+                        )
+                    ]
+                    self.last_player_data_frames.append(
+                        (best_frame_count, player_data_frame)
                     )
                     # a = PlayersDataWrapper(player_data_frame)
                     # print(a)
                     # print(a.get_player_1())
                     # print(a.get_player_2())
 
-                    bot_facing = self.get_value_from_data_block(
-                        player_data_frame,
-                        self.config['GameDataAddress']['facing']
-                    )
-                    timer_in_frames = self.get_value_from_data_block(
-                        player_data_frame,
-                        self.config['GameDataAddress']['timer_in_frames']
+                    game_data, p1_bot_data_dict, p2_bot_data_dict = (
+                        self.get_player_data_decoder().decode(
+                            player_data_frame
+                        )
                     )
+                    bot_facing = game_data['facing']
+                    timer_in_frames = game_data['timer_in_frames']
                     p1_bot, p2_bot = self.initialize_bots(
-                        player_data_frame, bot_facing, best_frame_count
+                        p1_bot_data_dict, p2_bot_data_dict, bot_facing,
+                        best_frame_count
                     )
 
                     if self.reacquire_game_state:
@@ -533,91 +651,46 @@ class TekkenGameReader(ProcessIO):
                         self.is_player_player_one
                         # self.side_menu_selection,
                     )
+                    game_state['dropped_battles'] = [
+                        self.get_game_snapshot(data_frame, frame_count)
+                        for (frame_count, _), data_frame in zip(
+                            dropped_frames, dropped_data_frames
+                        )
+                    ]
             except (OSError, struct.error, TypeError):
                 traceback.print_exc()
                 self.reacquire_everything()
                 raise OSError
-            finally:
-                kernel32.close_handle(self.__process_handle)
             return game_state
         raise OSError('invalid PID or module address')
 
-    def initialize_bots(self, player_data_frame, bot_facing, best_frame_count):
+    def get_game_snapshot(self, player_data_frame, frame_count):
         """
+        Build the GameSnapshot of a player data block read with the read plan.
         """
-        p1_bot_data_dict = {}
-        p2_bot_data_dict = {}
-        for data_type, value in self.config['PlayerDataAddress'].items():
-            p1_value = self.get_value_from_data_block(
-                player_data_frame, value,
-                0, self.is_data_a_float(data_type)
-            )
-            p2_value = self.get_value_from_data_block(
-                player_data_frame, value,
-                self.config
-                ['MemoryAddressOffsets']
-                ['p2_data_offset'],
-                self.is_data_a_float(data_type)
-            )
-            p1_bot_data_dict['PlayerDataAddress.' + data_type] = p1_value
-            p2_bot_data_dict['PlayerDataAddress.' + data_type] = p2_value
+        game_data, p1_bot_data_dict, p2_bot_data_dict = (
+            self.get_player_data_decoder().decode(player_data_frame)
+        )
+        bot_facing = game_data['facing']
+        timer_in_frames = game_data['timer_in_frames']
+        p1_bot, p2_bot = self.initialize_bots(
+            p1_bot_data_dict, p2_bot_data_dict, bot_facing, frame_count
+        )
+        return GameSnapshot(
+            p1_bot, p2_bot, frame_count, timer_in_frames, bot_facing,
+            self.opponent_name, self.is_player_player_one
+        )
 
-        for data_type, value in (
-                self.config['EndBlockPlayerDataAddress'].items()
-        ):
-            p1_value = self.get_value_from_data_block(player_data_frame, value)
-            p2_value = self.get_value_from_data_block(
-                player_data_frame, value,
-                self.config
-                ['MemoryAddressOffsets']
-                ['p2_end_block_offset']
-            )
-            p1_bot_data_dict[
-                'EndBlockPlayerDataAddress.' + data_type
-            ] = p1_value
-            p2_bot_data_dict[
-                'EndBlockPlayerDataAddress.' + data_type
-            ] = p2_value
-
-        # pda = self.config['PlayerDataAddress']
-        # This is ugly and hacky
-        for axis, starting_address in (
-                (k, v) for k, v in
-                self.config['PlayerDataAddress'].items()
-                if k in ('x', 'y', 'z')
-        ):
-            # Our xyz coordinate is 32 bytes, a 4 byte x, y, and z value
-            # followed by five 4 byte values that don't change
-            position_offset = 32
-            p1_coord_array = []
-            p2_coord_array = []
-            for i in range(23):
-                p1_coord_array.append(
-                    self.get_value_from_data_block(
-                        player_data_frame,
-                        starting_address + i * position_offset,
-                        0, is_float=True
-                    )
-                )
-                p2_coord_array.append(
-                    self.get_value_from_data_block(
-                        player_data_frame,
-                        starting_address + i * position_offset,
-                        self.config
-                        ['MemoryAddressOffsets']
-                        ['p2_data_offset'],
-                        is_float=True
-                    )
-                )
-            p1_bot_data_dict['PlayerDataAddress.' + axis] = p1_coord_array
-            p2_bot_data_dict['PlayerDataAddress.' + axis] = p2_coord_array
-            # sys.stdout.write("numpy.array(" + str(p1_coord_array) + ")")
-        # list = p1_bot_data_dict[self.config['PlayerDataAddress']['y']]
-        # sys.stdout.write('{} [{}]'.format(max(list), list.index(max(list))))
-        # sys.stdout.write("--------------------")
-
-        # FIXME: This seems like it would always be true.
-        # The old code seems to be doing the same, so I don't know.
+    def initialize_bots(
+            self, p1_bot_data_dict, p2_bot_data_dict, bot_facing,
+            best_frame_count
+    ):
+        """
+        Build the bot snapshots out of the players data decoded by the
+        PlayerDataDecoder.
+        """
+        # a player uses the movelist of the opponent when its movelist
+        # pointer is the one the opponent started the match with
         p1_bot_data_dict['use_opponent_movelist'] = (
             p1_bot_data_dict[
                 'PlayerDataAddress.movelist_to_use'
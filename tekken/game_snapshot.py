@@ -50,15 +50,21 @@ class GameSnapshot:
         self.opponent_name = opponent_name
         self.is_player_player_one = is_player_player_one
         # self.side_menu_selection = side_menu_selection
+        self.__mirrored = None
 
     def from_mirrored(self):
         """
+        Return the snapshot from the other player perspective. It is built
+        the first time it is requested and reused afterwards.
         """
-        return GameSnapshot(
-            self.opp, self.bot, self.frame_count, self.timer_frames_remaining,
-            self.facing_bool, self.opponent_name, self.is_player_player_one,
-            # self.side_menu_selection,
-        )
+        if self.__mirrored is None:
+            self.__mirrored = GameSnapshot(
+                self.opp, self.bot, self.frame_count,
+                self.timer_frames_remaining, self.facing_bool,
+                self.opponent_name, self.is_player_player_one,
+                # self.side_menu_selection,
+            )
+        return self.__mirrored
 
     def is_camera_flipped(self):
         # return (
@@ -18,8 +18,11 @@ to block this frame?, what was the last move player 2 did?).
 from __future__ import annotations
 
 from collections import Counter, defaultdict
+import copy
+import itertools
 import logging
 import math
+import operator
 import typing
 import sys
 
@@ -40,7 +43,9 @@ from patterns.observer import Publisher
 import win32.kernel32 as kernel32
 import win32.user32 as user32
 
+from .match_history import MatchHistory
 from .process_io_manager import ProcessIOManager
+from .state_log import StateLog
 
 if typing.TYPE_CHECKING:
     from .game_snapshot import GameSnapshot
@@ -48,15 +53,17 @@ if typing.TYPE_CHECKING:
 class TekkenGameState:
     """
     """
-    def __init__(self):
-        self.game_io_manager = ProcessIOManager()
+    def __init__(self, game_io_manager=None):
+        if game_io_manager is None:
+            game_io_manager = ProcessIOManager()
+        self.game_io_manager = game_io_manager
         self.duplicate_frame_obtained = 0
-        self.state_log = []
+        self.state_log = StateLog(columnar=True, indexed=True)
+        self.match_history = MatchHistory()
         self.graphic_settings = None
         self.pad_controllers = defaultdict(lambda: None)
-        self.mirrored_state_log = []
+        self.mirrored_state_log = self.state_log.get_view(is_mirrored=True)
         self.is_mirrored = False
-        self.futurestate_log = None
 
         logging_handler = logging.StreamHandler(sys.stdout)
         logging_handler.setFormatter(Formatter())
@@ -78,7 +85,12 @@ class TekkenGameState:
     def update(self, buffer=0):
         """
         """
-        return self.__update_game_state(self.game_io_manager.update(buffer))
+        last_frame_count = None
+        if self.state_log:
+            last_frame_count = self.state_log[-1].frame_count
+        return self.__update_game_state(
+            self.game_io_manager.update(buffer, last_frame_count)
+        )
 
     def flip_mirror(self):
         self.state_log, self.mirrored_state_log = (
@@ -86,21 +98,36 @@ class TekkenGameState:
         )
         self.is_mirrored = not self.is_mirrored
 
+    def get_mirrored_view(self):
+        """
+        Return a shallow copy of the game state from the other player
+        perspective. Its state log shares the storage of this one but time
+        travels on its own, so it can be read without flipping this game
+        state.
+        """
+        mirrored_view = copy.copy(self)
+        mirrored_view.state_log = self.mirrored_state_log.get_view(
+            not self.is_mirrored
+        )
+        mirrored_view.mirrored_state_log = self.state_log.get_view(
+            self.is_mirrored
+        )
+        mirrored_view.is_mirrored = not self.is_mirrored
+        return mirrored_view
+
     def back_to_the_future(self, frames):
-        if self.futurestate_log is not None:
+        if self.state_log.frames_ago:
             raise AssertionError(
                 'Already called BackToTheFuture, '
                 'need to return to the present first, Marty'
             )
-        self.futurestate_log = self.state_log[0 - frames:]
-        self.state_log = self.state_log[:0 - frames]
+        self.state_log.travel(frames)
 
     def return_to_present(self):
-        if self.futurestate_log is None:
+        if not self.state_log.frames_ago:
             raise AssertionError(
                 "We're already in the present, Marty, what are you doing?")
-        self.state_log += self.futurestate_log
-        self.futurestate_log = None
+        self.state_log.travel(0)
 
     def is_game_happening(self):
         return (
@@ -234,17 +261,30 @@ class TekkenGameState:
         return False
 
     def get_recovery_of_move_id(self, move_id):
-        largest_time = -1
-        for state in reversed(self.state_log):
-            if state.bot.move_id == move_id:
-                largest_time = max(largest_time, state.bot.move_timer)
-        return largest_time
+        return max(
+            itertools.compress(
+                self.state_log.iterate_column('bot', 'move_timer'),
+                map(
+                    operator.eq,
+                    self.state_log.iterate_column('bot', 'move_id'),
+                    itertools.repeat(move_id)
+                )
+            ),
+            default=-1
+        )
 
     def get_last_move_id(self):
-        for state in reversed(self.state_log):
-            if state.bot.startup > 0:
-                return state.bot.move_id
-        return -1
+        return next(
+            itertools.compress(
+                self.state_log.iterate_column('bot', 'move_id', True),
+                map(
+                    operator.gt,
+                    self.state_log.iterate_column('bot', 'startup', True),
+                    itertools.repeat(0)
+                )
+            ),
+            -1
+        )
 
     def get_bot_just_move_id(self):
         return self.state_log[-2].bot.move_id
@@ -308,14 +348,16 @@ class TekkenGameState:
         return (recovery) - block_frames
 
     def get_frame_progress_of_opp_attack(self):
+        # short scans that stop within a move, walking the snapshots is
+        # cheaper than setting up the column iterators
         most_recent_state_with_attack = None
         frames_since_last_attack = 0
         for state in reversed(self.state_log):
             if most_recent_state_with_attack is None:
-                if state['p2_attack_startup'] > 0:
+                if state.opp.startup > 0:
                     most_recent_state_with_attack = state
             elif(
-                    state['p2_move_id']
+                    state.opp.move_id
                     == most_recent_state_with_attack.opp.move_id
                     and state.opp.move_timer
                     < most_recent_state_with_attack.opp.move_timer
@@ -644,7 +686,7 @@ class TekkenGameState:
 
             input_array = []
 
-            i = len(self.state_log)
+            move_spans = self.state_log.iterate_moves('opp')
 
             while True:
                 next_move, last_move_was_empty_cancel = (
@@ -665,15 +707,12 @@ class TekkenGameState:
                 ):
                     break
 
-                while True:
-                    i -= 1
-                    if i < 0:
-                        break
-                    if self.state_log[i].opp.move_id != move_id:
+                for move_span in move_spans:
+                    if move_span.move_id != move_id:
                         previous_move_id = move_id
-                        move_id = self.state_log[i].opp.move_id
+                        move_id = move_span.move_id
                         break
-                if i < 0:
+                else:
                     break
 
             clean_input_array = reversed(
@@ -688,15 +727,23 @@ class TekkenGameState:
         )
 
     def has_opp_returned_to_neutral_from_move_id(self, move_id):
-        for state in reversed(self.state_log):
-            if state.opp.move_id == move_id:
+        for move_span in self.state_log.iterate_moves('opp'):
+            if move_span.move_id == move_id:
                 return False
-            if state.opp.movelist_parser.can_be_done_from_neutral(
-                    state.opp.move_id
-            ):
+            opp = self.state_log[move_span.last].opp
+            if opp.movelist_parser.can_be_done_from_neutral(opp.move_id):
                 return True
         return True
 
+    def get_last_moves(self, player, count):
+        """
+        Return the MoveSpan of the last count moves of player 'bot' or 'opp',
+        from the newest to the oldest one.
+        """
+        return list(
+            itertools.islice(self.state_log.iterate_moves(player), count)
+        )
+
     def get_frame_data_of_current_opp_move(self):
         if self.state_log[-1].opp.startup > 0:
             opp = self.state_log[-1].opp
@@ -781,50 +828,76 @@ class TekkenGameState:
     def get_opp_technical_states(self, startup):
 
         #opp_id = self.state_log[-1].opp.move_id
-        tc_frames = []
-        tj_frames = []
-        cancel_frames = []
-        buffer_frames = []
-        pc_frames = []
-        homing_frames1 = []
-        homing_frames2 = []
-        parryable_frames1 = []
-        parryable_frames2 = []
-        startup_frames = []
-        frozen_frames = []
-
-        previous_state = None
-        skipped_frames_counter = 0
-        frozen_frames_counter = 0
-        for i, state in enumerate(reversed(self.state_log[-startup:])):
-            if previous_state != None:
-                is_skipped = (
-                    state.opp.move_timer != previous_state.opp.move_timer - 1
-                )
-                if is_skipped:
-                    skipped_frames_counter += 1
-                is_frozen = (
-                    state.bot.move_timer == previous_state.bot.move_timer
+        # same frames as self.state_log[-startup:]
+        length = len(range(len(self.state_log))[-startup:])
+
+        def get_column(player, field):
+            return list(
+                itertools.islice(
+                    self.state_log.iterate_column(player, field, True), length
                 )
-                if is_frozen:
-                    frozen_frames_counter += 1
-            else:
-                is_skipped = False
-                is_frozen = False
-            if skipped_frames_counter + i <= startup:
-                tc_frames.append(state.opp.is_technical_crouch())
-                tj_frames.append(state.opp.is_technical_jump())
-                cancel_frames.append(state.opp.is_cancelable)
-                buffer_frames.append(state.opp.is_bufferable)
-                pc_frames.append(state.opp.is_power_crush)
-                homing_frames1.append(state.opp.is_homing1())
-                homing_frames2.append(state.opp.is_homing2())
-                parryable_frames1.append(state.opp.is_parry1)
-                parryable_frames2.append(state.opp.is_parry2)
-                startup_frames.append(is_skipped)
-                frozen_frames.append(is_frozen)
-
-            previous_state = state
+            )
+
+        opp_move_timers = get_column('opp', 'move_timer')
+        bot_move_timers = get_column('bot', 'move_timer')
+        # skipped and frozen compare each frame with the next one
+        startup_frames = [False] + list(
+            map(
+                operator.ne, opp_move_timers[1:],
+                map(operator.sub, opp_move_timers, itertools.repeat(1))
+            )
+        )
+        frozen_frames = [False] + list(
+            map(operator.eq, bot_move_timers[1:], bot_move_timers)
+        )
+        # only the frames within the startup, skipped ones included, count
+        length = TekkenGameState.__count_leading(
+            map(
+                operator.le,
+                map(
+                    operator.add,
+                    itertools.accumulate(startup_frames),
+                    itertools.count()
+                ),
+                itertools.repeat(startup)
+            )
+        )
+        del startup_frames[length:]
+        del frozen_frames[length:]
+
+        def get_flags(field):
+            return list(map(bool, get_column('opp', field)[:length]))
+
+        opp_simple_states = get_column('opp', 'simple_state')[:length]
+        opp_complex_states = get_column('opp', 'complex_state')[:length]
+        tc_frames = list(
+            map(
+                {
+                    SimpleMoveStates.CROUCH.value,
+                    SimpleMoveStates.CROUCH_BACK.value,
+                    SimpleMoveStates.CROUCH_FORWARD.value
+                }.__contains__,
+                opp_simple_states
+            )
+        )
+        tj_frames = get_flags('is_jump')
+        cancel_frames = get_flags('is_cancelable')
+        buffer_frames = get_flags('is_bufferable')
+        pc_frames = get_flags('is_power_crush')
+        homing_frames1 = list(
+            map(
+                operator.eq, opp_complex_states,
+                itertools.repeat(ComplexMoveStates.S_PLUS.value)
+            )
+        )
+        homing_frames2 = list(
+            map(
+                operator.eq, opp_complex_states,
+                itertools.repeat(ComplexMoveStates.S.value)
+            )
+        )
+        parryable_frames1 = get_flags('is_parry1')
+        parryable_frames2 = get_flags('is_parry2')
 
         parryable1 = MoveDataReport('PY1', parryable_frames1)
         parryable2 = MoveDataReport('PY2', parryable_frames2)
@@ -901,31 +974,26 @@ class TekkenGameState:
             move_timer = state.opp.move_timer
         ending_skeleton = self.state_log[-1].opp.skeleton
 
-        avg_ss_x = sum(starting_skeleton[0]) / len(starting_skeleton[0])
-        avg_ss_z = sum(starting_skeleton[2]) / len(starting_skeleton[2])
-        avg_bs_x = sum(bot_skeleton[0]) / len(bot_skeleton[0])
-        avg_bs_z = sum(bot_skeleton[2]) / len(bot_skeleton[2])
-
-        vector_towards_bot = (avg_bs_x - avg_ss_x, avg_bs_z - avg_ss_z)
+        # the skeleton axes are float views over the snapshot raw data, fsum
+        # reduces them without building intermediate lists
+        avg_ss_x = math.fsum(starting_skeleton[0]) / len(starting_skeleton[0])
+        avg_ss_z = math.fsum(starting_skeleton[2]) / len(starting_skeleton[2])
+        avg_bs_x = math.fsum(bot_skeleton[0]) / len(bot_skeleton[0])
+        avg_bs_z = math.fsum(bot_skeleton[2]) / len(bot_skeleton[2])
 
-        toward_bot_magnitude = math.sqrt(
-            pow(vector_towards_bot[0], 2) + pow(vector_towards_bot[1], 2))
-        unit_vector_towards_bot = (
-            vector_towards_bot[0] / toward_bot_magnitude,
-            vector_towards_bot[1] / toward_bot_magnitude
+        toward_bot_magnitude = math.hypot(
+            avg_bs_x - avg_ss_x, avg_bs_z - avg_ss_z
         )
+        unit_x = (avg_bs_x - avg_ss_x) / toward_bot_magnitude
+        unit_z = (avg_bs_z - avg_ss_z) / toward_bot_magnitude
 
-        movements = [
-            (ai_x - bi_x, ai_z - bi_z) for ai_x, bi_x, ai_z, bi_z in zip(
+        dotproducts = [
+            (end_x - start_x) * unit_x + (end_z - start_z) * unit_z
+            for end_x, start_x, end_z, start_z in zip(
                 ending_skeleton[0], starting_skeleton[0],
-                ending_skeleton[2], starting_skeleton[2])
-        ]
-        dotproducts = []
-        for movement in movements:
-            dotproducts.append(
-                movement[0] * unit_vector_towards_bot[0]
-                + movement[1] * unit_vector_towards_bot[1]
+                ending_skeleton[2], starting_skeleton[2]
             )
+        ]
 
         max_product = max(dotproducts)
         max_index = dotproducts.index(max_product)
@@ -987,17 +1055,16 @@ class TekkenGameState:
     def is_in_battle(self):
         return self.game_io_manager.process_reader.is_in_battle
 
-    def __append_game_data(self, game_data: GameSnapshot):
-        if not self.is_mirrored:
-            self.state_log.append(game_data)
-            self.mirrored_state_log.append(game_data.from_mirrored())
-        else:
-            self.state_log.append(game_data.from_mirrored())
-            self.mirrored_state_log.append(game_data)
+    @staticmethod
+    def __count_leading(conditions):
+        return len(list(itertools.takewhile(bool, conditions)))
 
-        if len(self.state_log) > 300:
-            self.state_log.pop(0)
-            self.mirrored_state_log.pop(0)
+    def __append_game_data(self, game_data: GameSnapshot):
+        # both logs share the same storage, the mirrored snapshot is only
+        # built if the other perspective reads it
+        self.state_log.append(game_data)
+        # the whole match, after the frames leave the state log ring
+        self.match_history.append(game_data)
 
     def __compare_controllers(self, controllers):
         if(
@@ -1053,7 +1120,7 @@ class TekkenGameState:
         if graphic_settings_changed:
             self.graphic_settings = graphic_settings
 
-    def __update_game_state(self, game_state, buffer=0, frame_lost_check=True):
+    def __update_game_state(self, game_state):
         if game_state['controllers']:
             self.__compare_controllers(game_state['controllers'])
 
@@ -1070,22 +1137,10 @@ class TekkenGameState:
             ):
                 self.duplicate_frame_obtained = 0
 
-                if frame_lost_check:
-                    frames_lost = 0
-                    if self.state_log:
-                        frames_lost = (
-                            game_state['battle'].frame_count
-                            - self.state_log[-1].frame_count - 1
-                        )
-
-                    for index in range(min(7 - buffer, frames_lost)):
-                        dropped_game_state = self.game_io_manager.read_update(
-                            min(7, frames_lost + buffer) - index
-                        )
-
-                        self.__update_game_state(
-                            dropped_game_state, frame_lost_check=False
-                        )
+                # frames lost since the last update, recovered from the
+                # rollback copies read along with the current frame
+                for dropped_game_data in game_state['dropped_battles']:
+                    self.__append_game_data(dropped_game_data)
 
                 self.__append_game_data(game_state['battle'])
 
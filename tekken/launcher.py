@@ -34,6 +34,7 @@ import logging
 import traceback
 import sys
 
+from constants.event import EncyclopediaEvent
 from log import Formatter
 from patterns.observer import Publisher
 from win32.utils import os_time
@@ -52,9 +53,14 @@ class Launcher:
     INITIAL_SHORT_DELAY = 2
     INITIAL_LONG_DELAY = 8
 
-    def __init__(self, view, extended_print=False):
+    def __init__(
+            self, view, extended_print=False, game_io_manager=None,
+            frame_data_cache=None, match_stat_store=None
+    ):
         self.view = view
         self.extended_print = extended_print
+        self.frame_data_cache = frame_data_cache
+        self.match_stat_store = match_stat_store
 
         stdout_handler = logging.StreamHandler(sys.stdout)
         stdout_handler.setFormatter(Formatter())
@@ -63,19 +69,42 @@ class Launcher:
 
         self.initialized = False
         self.publisher = Publisher(Launcher.Event)
-        self.game_state = TekkenGameState()
+        self.game_state = TekkenGameState(game_io_manager)
+        self.encyclopedia_publisher = Publisher(EncyclopediaEvent)
         self.cyclopedia_p1 = TekkenEncyclopedia(
-            True, print_extended_frame_data=self.extended_print
+            True, print_extended_frame_data=self.extended_print,
+            frame_data_cache=self.frame_data_cache,
+            match_stat_store=self.match_stat_store,
+            publisher=self.encyclopedia_publisher
         )
         self.cyclopedia_p2 = TekkenEncyclopedia(
-            False, print_extended_frame_data=self.extended_print
+            False, print_extended_frame_data=self.extended_print,
+            frame_data_cache=self.frame_data_cache,
+            publisher=self.encyclopedia_publisher
         )
 
     def start(self):
         self.__update_launcher()
 
-    def __update_launcher(self):
-        start = os_time.now(resolution=os_time.Resolution.MILLI)
+    def run_headless(self):
+        """
+        Update the game state and dispatch the events as fast as possible,
+        without a view nor waiting for the game window, until the game IO
+        manager stops being valid, like a ReplayIOManager at the end of its
+        recording.
+        """
+        while self.game_state.is_pid_valid():
+            sucessful = self.__update_game_state()
+            if not self.initialized:
+                self.initialized = True
+                self.publisher.dispatch(Launcher.Event.INITIALIZED)
+            else:
+                self.publisher.dispatch(Launcher.Event.UPDATED, sucessful)
+        if self.initialized:
+            self.initialized = False
+            self.publisher.dispatch(Launcher.Event.CLOSED)
+
+    def __update_game_state(self):
         sucessful = self.game_state.update()
         if sucessful:
             try:
@@ -83,6 +112,11 @@ class Launcher:
                 self.cyclopedia_p2.update(self.game_state)
             except:
                 traceback.print_exc()
+        return sucessful
+
+    def __update_launcher(self):
+        start = os_time.now(resolution=os_time.Resolution.MILLI)
+        sucessful = self.__update_game_state()
         end = os_time.now(resolution=os_time.Resolution.MILLI)
         elapsed_time = (end - start)
         if self.game_state.is_pid_valid():
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compressed history of the whole match, behind the state log window.
+"""
+from array import array
+import bisect
+import operator
+
+class HistoryFrame():
+    """
+    Fields of a frame decoded from the match history. bot and opp are dicts
+    of the MatchHistory.PLAYER_FIELDS, from the perspective the snapshots
+    were stored with.
+    """
+    __slots__ = ('frame_count', 'facing_bool', 'timer_frames_remaining',
+                 'bot', 'opp')
+
+    def __init__(
+            self, frame_count, facing_bool, timer_frames_remaining, bot, opp
+    ):
+        self.frame_count = frame_count
+        self.facing_bool = facing_bool
+        self.timer_frames_remaining = timer_frames_remaining
+        self.bot = bot
+        self.opp = opp
+
+    def __repr__(self):
+        return 'HistoryFrame(frame_count={})'.format(self.frame_count)
+
+class _Segment():
+    """
+    A key frame holding every field, followed by the frames encoded as the
+    fields that changed from the previous one.
+    """
+    __slots__ = ('first_frame_count', 'key_frame', 'deltas', 'length')
+
+    OVERHEAD = 256
+
+    def __init__(self, first_frame_count, key_frame):
+        self.first_frame_count = first_frame_count
+        self.key_frame = key_frame
+        self.deltas = bytearray()
+        self.length = 1
+
+    def get_size(self):
+        """
+        """
+        return (
+            len(self.deltas)
+            + self.key_frame.itemsize * len(self.key_frame)
+            + _Segment.OVERHEAD
+        )
+
+class MatchHistory():
+    """
+    Cold tier of the frame history. It keeps the integer fields of every
+    appended GameSnapshot of the match, delta encoded, so it outlives the
+    StateLog ring without keeping the snapshots alive.
+
+    Frames are grouped in segments starting with a key frame, every change
+    of a field is stored as its index and the zigzag varint of the
+    difference. Once the encoded size goes over the memory budget, the
+    oldest segments are dropped.
+    """
+    DEFAULT_MEMORY_BUDGET = 8 * 1024 * 1024
+    SEGMENT_LENGTH = 600
+
+    FRAME_FIELDS = ('frame_count', 'facing_bool', 'timer_frames_remaining')
+    PLAYER_FIELDS = (
+        'move_id', 'move_timer', 'startup', 'startup_end', 'recovery',
+        'attack_damage', 'damage_taken', 'char_id', 'throw_flag', 'rage_flag',
+        'input_counter', 'mystery_state', 'wins', 'combo_counter',
+        'combo_damage', 'juggle_damage', 'use_opponents_movelist',
+        'raw_simple_state', 'raw_attack_type', 'raw_complex_state',
+        'raw_input_direction', 'raw_input_attack', 'raw_stun_state',
+        'raw_power_crush', 'raw_cancel_window', 'raw_throw_tech',
+        'raw_jump_flags', 'raw_hit_outcome', 'raw_current_side'
+    )
+    __FRAME_GETTER = operator.attrgetter(*FRAME_FIELDS)
+    __PLAYER_GETTER = operator.attrgetter(*PLAYER_FIELDS)
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.__segments = []
+        self.__first_frame_counts = []
+        self.__size = 0
+        self.__length = 0
+        self.__last_values = None
+
+    def __len__(self):
+        return self.__length
+
+    def get_size(self):
+        """
+        Return the estimated size in bytes of the stored frames.
+        """
+        return self.__size
+
+    def get_frame_count_range(self):
+        """
+        Return the first and last stored frame counts, or None if the
+        history is empty.
+        """
+        if not self.__segments:
+            return None
+        return self.__first_frame_counts[0], self.__last_values[0]
+
+    def append(self, state):
+        """
+        Encode the given GameSnapshot. A frame count lower than the last one
+        means a new match, which clears the history.
+        """
+        values = (
+            MatchHistory.__FRAME_GETTER(state)
+            + MatchHistory.__PLAYER_GETTER(state.bot)
+            + MatchHistory.__PLAYER_GETTER(state.opp)
+        )
+        last_values = self.__last_values
+        if last_values is not None and values[0] <= last_values[0]:
+            self.clear()
+            last_values = None
+
+        if(
+                last_values is None
+                or self.__segments[-1].length >= MatchHistory.SEGMENT_LENGTH
+        ):
+            segment = _Segment(values[0], array('q', values))
+            self.__segments.append(segment)
+            self.__first_frame_counts.append(values[0])
+            self.__size += segment.get_size()
+        else:
+            segment = self.__segments[-1]
+            deltas = segment.deltas
+            size = len(deltas)
+            changes = [
+                (index, value - last_value)
+                for index, (value, last_value)
+                in enumerate(zip(values, last_values))
+                if value != last_value
+            ]
+            MatchHistory.__write_varint(deltas, len(changes))
+            for index, difference in changes:
+                MatchHistory.__write_varint(deltas, index)
+                MatchHistory.__write_varint(
+                    deltas, (difference << 1) ^ (difference >> 63)
+                )
+            segment.length += 1
+            self.__size += len(deltas) - size
+
+        self.__last_values = values
+        self.__length += 1
+
+        while(
+                self.__size > self.memory_budget
+                and len(self.__segments) > 1
+        ):
+            evicted_segment = self.__segments.pop(0)
+            self.__first_frame_counts.pop(0)
+            self.__size -= evicted_segment.get_size()
+            self.__length -= evicted_segment.length
+
+    def get(self, frame_count):
+        """
+        Return the HistoryFrame of the given frame count, or None if it is
+        not stored.
+        """
+        index = bisect.bisect_right(self.__first_frame_counts, frame_count)
+        if not index:
+            return None
+        for frame in MatchHistory.__decode(self.__segments[index - 1]):
+            if frame.frame_count >= frame_count:
+                return frame if frame.frame_count == frame_count else None
+        return None
+
+    def iterate(self, start=None, end=None):
+        """
+        Return an iterator over the HistoryFrame of the stored frames whose
+        frame count is within [start, end), in chronological order.
+        """
+        index = 0
+        if start is not None:
+            index = max(
+                bisect.bisect_right(self.__first_frame_counts, start) - 1, 0
+            )
+        for segment in self.__segments[index:]:
+            if end is not None and segment.first_frame_count >= end:
+                return
+            for frame in MatchHistory.__decode(segment):
+                if end is not None and frame.frame_count >= end:
+                    return
+                if start is None or frame.frame_count >= start:
+                    yield frame
+
+    def clear(self):
+        """
+        """
+        self.__segments.clear()
+        self.__first_frame_counts.clear()
+        self.__size = 0
+        self.__length = 0
+        self.__last_values = None
+
+    @staticmethod
+    def __write_varint(buffer, value):
+        while value > 0x7F:
+            buffer.append((value & 0x7F) | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+    @staticmethod
+    def __decode(segment):
+        values = segment.key_frame.tolist()
+        yield MatchHistory.__get_frame(values)
+        deltas = segment.deltas
+        position = 0
+        for _ in range(segment.length - 1):
+            changes, position = MatchHistory.__read_varint(deltas, position)
+            for _ in range(changes):
+                index, position = MatchHistory.__read_varint(
+                    deltas, position
+                )
+                difference, position = MatchHistory.__read_varint(
+                    deltas, position
+                )
+                values[index] += (difference >> 1) ^ -(difference & 1)
+            yield MatchHistory.__get_frame(values)
+
+    @staticmethod
+    def __read_varint(buffer, position):
+        value = 0
+        shift = 0
+        while True:
+            byte = buffer[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, position
+            shift += 7
+
+    @staticmethod
+    def __get_frame(values):
+        frame_field_count = len(MatchHistory.FRAME_FIELDS)
+        player_field_count = len(MatchHistory.PLAYER_FIELDS)
+        bot_end = frame_field_count + player_field_count
+        return HistoryFrame(
+            values[0], bool(values[1]), values[2],
+            dict(zip(
+                MatchHistory.PLAYER_FIELDS, values[frame_field_count:bot_end]
+            )),
+            dict(zip(MatchHistory.PLAYER_FIELDS, values[bot_end:]))
+        )
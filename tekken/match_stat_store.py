@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Persistent store of the match results and the records derived from them.
+"""
+import os
+import sqlite3
+import sys
+
+class MatchStatStore():
+    """
+    SQLite store of the match results, with the win, loss and draw counts
+    of every opponent character, opponent name and matchup kept up to date
+    on each added match, so a record is a single indexed lookup no matter
+    how many matches have been played.
+
+    The results of the legacy text file get imported the first time it is
+    found next to the database.
+    """
+    DEFAULT_PATH = 'TekkenData/matches.sqlite'
+    LEGACY_PATH = 'TekkenData/matches.txt'
+
+    CHAR_STATS = 'char_stats'
+    MATCHUP_STATS = 'matchup_stats'
+    OPPONENT_STATS = 'opponent_stats'
+
+    __SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS matches ('
+        'id INTEGER PRIMARY KEY, result TEXT NOT NULL, player_name TEXT, '
+        'player_char TEXT NOT NULL, opponent_name TEXT NOT NULL, '
+        'opponent_char TEXT NOT NULL, player_wins INTEGER, '
+        'opponent_wins INTEGER, played TEXT)',
+        'CREATE INDEX IF NOT EXISTS matches_opponent_name '
+        'ON matches (opponent_name)',
+        'CREATE INDEX IF NOT EXISTS matches_opponent_char '
+        'ON matches (opponent_char)',
+        'CREATE INDEX IF NOT EXISTS matches_matchup '
+        'ON matches (player_char, opponent_char)',
+        'CREATE TABLE IF NOT EXISTS records ('
+        'category TEXT NOT NULL, lookup TEXT NOT NULL, '
+        'wins INTEGER NOT NULL DEFAULT 0, losses INTEGER NOT NULL DEFAULT 0, '
+        'draws INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (category, lookup))',
+        'CREATE TABLE IF NOT EXISTS imported_files (path TEXT PRIMARY KEY)'
+    )
+    __INSERT_MATCH = (
+        'INSERT INTO matches (result, player_name, player_char, '
+        'opponent_name, opponent_char, player_wins, opponent_wins, played) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+    )
+    __UPDATE_RECORD = (
+        'INSERT INTO records (category, lookup, {0}) VALUES (?, ?, 1) '
+        'ON CONFLICT (category, lookup) DO UPDATE SET {0} = {0} + 1'
+    )
+    __SELECT_RECORD = (
+        'SELECT wins, losses, draws FROM records '
+        'WHERE category = ? AND lookup = ?'
+    )
+
+    def __init__(self, path=DEFAULT_PATH, legacy_path=LEGACY_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute('PRAGMA journal_mode = WAL')
+        with self.__connection:
+            for statement in MatchStatStore.__SCHEMA:
+                self.__connection.execute(statement)
+        if legacy_path and os.path.isfile(legacy_path):
+            self.import_matches_file(legacy_path)
+
+    @staticmethod
+    def get_matchup(player_char, opponent_char):
+        """
+        Return the lookup key of the matchup of two characters.
+        """
+        return '{} vs {}'.format(player_char, opponent_char)
+
+    def add_stat(
+            self, result, player_char, opponent_name, opponent_char,
+            player_name=None, player_wins=None, opponent_wins=None,
+            played=None
+    ):
+        """
+        Store the result of a match, WIN, LOSS or DRAW, and update the
+        records of its opponent character, opponent name and matchup.
+        """
+        with self.__connection:
+            self.__add_stat(
+                result, player_char, opponent_name, opponent_char,
+                player_name, player_wins, opponent_wins, played
+            )
+
+    def get_record(self, category, lookup):
+        """
+        Return the wins, losses and draws of a category, CHAR_STATS,
+        OPPONENT_STATS or MATCHUP_STATS, for the given lookup key.
+        """
+        row = self.__connection.execute(
+            MatchStatStore.__SELECT_RECORD, (category, lookup)
+        ).fetchone()
+        if row is None:
+            return 0, 0, 0
+        return row
+
+    def import_matches_file(self, path):
+        """
+        Add the matches of a legacy text file, one per line with its fields
+        separated by '|', unless that file has already been imported.
+        Return the number of imported matches.
+        """
+        key = os.path.abspath(path)
+        if self.__connection.execute(
+                'SELECT 1 FROM imported_files WHERE path = ?', (key,)
+        ).fetchone():
+            return 0
+        count = 0
+        with open(path, 'r', encoding='utf-8', errors='replace') as r_file:
+            with self.__connection:
+                for line in r_file:
+                    if '|' not in line:
+                        continue
+                    args = [arg.strip() for arg in line.split('|')]
+                    if len(args) < 6:
+                        continue
+                    player_wins = opponent_wins = None
+                    if len(args) > 6:
+                        score = args[6].split('-')
+                        if len(score) == 2 and all(
+                                wins.isdigit() for wins in score
+                        ):
+                            player_wins, opponent_wins = map(int, score)
+                    self.__add_stat(
+                        args[0], args[2], args[4], args[5], args[1],
+                        player_wins, opponent_wins,
+                        args[7] if len(args) > 7 else None
+                    )
+                    count += 1
+                self.__connection.execute(
+                    'INSERT INTO imported_files (path) VALUES (?)', (key,)
+                )
+        sys.stdout.write(
+            'Imported {} matches from {}'.format(count, path)
+        )
+        return count
+
+    def close(self):
+        """
+        """
+        self.__connection.close()
+
+    def __add_stat(
+            self, result, player_char, opponent_name, opponent_char,
+            player_name, player_wins, opponent_wins, played
+    ):
+        self.__connection.execute(
+            MatchStatStore.__INSERT_MATCH,
+            (
+                result, player_name, player_char, opponent_name,
+                opponent_char, player_wins, opponent_wins, played
+            )
+        )
+        if 'WIN' in result:
+            column = 'wins'
+        elif 'LOSS' in result:
+            column = 'losses'
+        else:
+            column = 'draws'
+        update_record = MatchStatStore.__UPDATE_RECORD.format(column)
+        for category, lookup in (
+                (MatchStatStore.CHAR_STATS, opponent_char),
+                (MatchStatStore.OPPONENT_STATS, opponent_name),
+                (
+                    MatchStatStore.MATCHUP_STATS,
+                    MatchStatStore.get_matchup(player_char, opponent_char)
+                )
+        ):
+            self.__connection.execute(update_record, (category, lookup))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Index of the moves of both players over the frame history.
+"""
+from collections import deque
+
+from MoveInfoEnums import ComplexMoveStates, StunStates
+
+class MoveSpan():
+    """
+    Consecutive frames of a player doing a single move. A new span starts
+    when the move id changes or its timer goes back, like when a move is
+    repeated. first and last are the indexes of its frames.
+
+    has_hit and was_blocked tell if the other player got hit or blocked
+    during the move.
+    """
+    def __init__(
+            self, move_id, first, last, startup, has_hit, was_blocked,
+            move_timer=0
+    ):
+        self.move_id = move_id
+        self.first = first
+        self.last = last
+        self.startup = startup
+        self.has_hit = has_hit
+        self.was_blocked = was_blocked
+        self.move_timer = move_timer
+
+    def __len__(self):
+        return self.last - self.first + 1
+
+    def __repr__(self):
+        return (
+            'MoveSpan(move_id={}, first={}, last={}, startup={}, '
+            'has_hit={}, was_blocked={})'
+        ).format(
+            self.move_id, self.first, self.last, self.startup, self.has_hit,
+            self.was_blocked
+        )
+
+class MoveIndex():
+    """
+    Move spans of the bot and opp of the stored snapshots, updated on every
+    append, so finding where a move started does not need to scan the
+    snapshots. Span frames are the positions of the StateLog storage the
+    index belongs to.
+    """
+    __HIT_STUN_STATES = frozenset(
+        (StunStates.BEING_PUNISHED.value, StunStates.GETTING_HIT.value)
+    )
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.__players = (deque(), deque())
+
+    def append(self, position, state):
+        """
+        Add the snapshot stored at the given position.
+        """
+        for spans, bot, opp in zip(
+                self.__players, (state.bot, state.opp), (state.opp, state.bot)
+        ):
+            has_hit = opp.raw_stun_state in MoveIndex.__HIT_STUN_STATES
+            was_blocked = (
+                opp.raw_complex_state == ComplexMoveStates.BLOCK.value
+            )
+            span = spans[-1] if spans else None
+            if(
+                    span is not None
+                    and span.last == position - 1
+                    and span.move_id == bot.move_id
+                    and span.move_timer <= bot.move_timer
+            ):
+                span.last = position
+                span.startup = max(span.startup, bot.startup)
+                span.has_hit = span.has_hit or has_hit
+                span.was_blocked = span.was_blocked or was_blocked
+                span.move_timer = bot.move_timer
+            else:
+                spans.append(
+                    MoveSpan(
+                        bot.move_id, position, position, bot.startup,
+                        has_hit, was_blocked, bot.move_timer
+                    )
+                )
+            while spans[0].last <= position - self.capacity:
+                spans.popleft()
+
+    def iterate(self, player, start, end):
+        """
+        Return the spans of the given player, 0 for the stored snapshot bot
+        and 1 for its opp, within the [start, end) positions, from the newest
+        to the oldest one. Their first and last frames are clipped to the
+        range and made relative to end, so they are negative indexes.
+        """
+        for span in reversed(self.__players[player]):
+            if span.first >= end:
+                continue
+            if span.last < start:
+                break
+            yield MoveSpan(
+                span.move_id, max(span.first, start) - end,
+                min(span.last, end - 1) - end, span.startup, span.has_hit,
+                span.was_blocked
+            )
+
+    def clear(self):
+        """
+        """
+        for spans in self.__players:
+            spans.clear()
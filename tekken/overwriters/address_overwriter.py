@@ -31,32 +31,23 @@
 """
 import struct
 from tekken.overwriters import Overwriter
-import win32.kernel32 as kernel32
 import win32.utils.type_limits as type_limits
 
 class AddressOverwriter(Overwriter):
     """
     """
-    def write(self):
-        process_handle = kernel32.open_process(
-            kernel32.PROCESS_ALL_ACCESS, False, self.process_memory.pid
-        )
+    def write(self, memory_source):
         if isinstance(self.process_memory.address, list):
             for address in self.process_memory.address:
-                self.__write_on_address(process_handle, address)
+                self.__write_on_address(memory_source, address)
         else:
-            self.__write_on_address(process_handle, self.process_memory.address)
+            self.__write_on_address(memory_source, self.process_memory.address)
 
-    def __write_on_address(self, process_handle, offset):
-        try:
-            address = self.process_memory.module_address + offset
-
-            if self.value != self._read_address(process_handle, address):
-                kernel32.write_process_memory(
-                    process_handle, address, struct.pack(
-                        type_limits.get_struct_format(self.value), self.value
-                    )
+    def __write_on_address(self, memory_source, offset):
+        address = self.process_memory.module_address + offset
+        if self.value != self._read_address(memory_source, address):
+            memory_source.write(
+                self.process_memory.pid, address, struct.pack(
+                    type_limits.get_struct_format(self.value), self.value
                 )
-        except (OSError, TypeError):
-            kernel32.close_handle(process_handle)
-            raise
+            )
@@ -32,46 +32,42 @@
 import struct
 from tekken.overwriters import Overwriter
 from win32.defines import SIZE_OF, ULONGLONG
-import win32.kernel32 as kernel32
 import win32.utils.type_limits as type_limits
 
 class MultilevelPointerOverwriter(Overwriter):
     """
     """
-    def write(self):
-        process_handle = kernel32.open_process(
-            kernel32.PROCESS_ALL_ACCESS, False, self.process_memory.pid
-        )
+    def write(self, memory_source):
         if isinstance(self.process_memory.address[0], list):
             for offsets in self.process_memory.address:
-                self.__write_on_multilevel_pointer(process_handle, offsets)
+                self.__write_on_multilevel_pointer(memory_source, offsets)
         else:
             self.__write_on_multilevel_pointer(
-                process_handle, self.process_memory.address
+                memory_source, self.process_memory.address
             )
 
-    def __write_on_multilevel_pointer(self, process_handle, offsets):
+    def __write_on_multilevel_pointer(self, memory_source, offsets):
         address = self.__get_address_of_multilevel_pointer(
-            process_handle, offsets
+            memory_source, offsets
         )
         if address:
             try:
-                if self.value != self._read_address(process_handle, address):
-                    kernel32.write_process_memory(
-                        process_handle, address, struct.pack(
+                if self.value != self._read_address(memory_source, address):
+                    memory_source.write(
+                        self.process_memory.pid, address, struct.pack(
                             type_limits.get_struct_format(self.value),
                             self.value
                         )
                     )
             except OSError:
-                kernel32.close_handle(process_handle)
+                pass
 
-    def __get_address_of_multilevel_pointer(self, process_handle, addresses):
+    def __get_address_of_multilevel_pointer(self, memory_source, addresses):
         address = self.process_memory.module_address
         for i, offset in enumerate(addresses):
             if i + 1 < len(addresses):
                 address = self.__get_pointer_value(
-                    process_handle, address + offset
+                    memory_source, self.process_memory.pid, address + offset
                 )
                 if not address:
                     address = None
@@ -81,11 +77,9 @@ class MultilevelPointerOverwriter(Overwriter):
         return address
 
     @staticmethod
-    def __get_pointer_value(process_handle, address):
+    def __get_pointer_value(memory_source, pid, address):
         try:
-            address = kernel32.read_process_memory(
-                process_handle, address, SIZE_OF(ULONGLONG)
-            )
+            address = memory_source.read(pid, address, SIZE_OF(ULONGLONG))
             return struct.unpack('<Q', address)[0]
         except (OSError, struct.error):
             return None
@@ -32,7 +32,6 @@
 
 from abc import ABC, abstractmethod
 import struct
-import win32.kernel32 as kernel32
 import win32.utils.type_limits as type_limits
 
 class Overwriter(ABC):
@@ -42,24 +41,20 @@ class Overwriter(ABC):
         self.value = value
 
     @abstractmethod
-    def write(self):
+    def write(self, memory_source):
         pass
 
-    def update(self):
+    def update(self, memory_source):
         if self.enable:
-            self.write()
+            self.write(memory_source)
 
-    def _read_address(self, process_handle, address):
-        try:
-            memory_value = kernel32.read_process_memory(
-                process_handle, address, type_limits.get_size(self.value)
-            )
-            return struct.unpack(
-                type_limits.get_struct_format(self.value), memory_value
-            )[0]
-        except (OSError, struct.error):
-            kernel32.close_handle(process_handle)
-            raise
+    def _read_address(self, memory_source, address):
+        memory_value = memory_source.read(
+            self.process_memory.pid, address, type_limits.get_size(self.value)
+        )
+        return struct.unpack(
+            type_limits.get_struct_format(self.value), memory_value
+        )[0]
 
     def __repr__(self):
         return 'enable: {}, process_memory: [{}], value: {}'.format(
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Decoder of the fields the bot reads from the player data block.
+"""
+import struct
+
+from .read_plan import ReadPlan
+
+class PlayerDataDecoder():
+    """
+    Single struct compiled from the memory address config, with pad bytes
+    between the fields, that decodes the game data and both players data out
+    of a read plan compact buffer in one unpack_from call. Skeleton axes are
+    not copied but exposed as strided float views over the same buffer.
+    """
+    FLOAT_DATA_TYPES = (
+        'x', 'y', 'z',
+        'activebox_x', 'activebox_y', 'activebox_z',
+        'distance'
+    )
+    GAME_DATA_TYPES = ('facing', 'timer_in_frames')
+    SKELETON_DATA_TYPES = ('x', 'y', 'z')
+    SKELETON_JOINT_STRIDE = (
+        ReadPlan.SKELETON_JOINT_SIZE // ReadPlan.FIELD_SIZE
+    )
+
+    def __init__(self, config, read_plan):
+        offsets = config['MemoryAddressOffsets']
+        # compact offset -> struct format character
+        self.__fields = dict()
+
+        self.__game_data = [
+            (
+                data_type,
+                self.__add_field(
+                    read_plan, config['GameDataAddress'][data_type], 'I'
+                )
+            )
+            for data_type in PlayerDataDecoder.GAME_DATA_TYPES
+        ]
+
+        # per player, (key, offset) scalar fields and (key, offset) skeleton
+        # axes
+        self.__players_data = list()
+        for player_data_offset, end_block_offset in (
+                (0x0, 0x0),
+                (offsets['p2_data_offset'], offsets['p2_end_block_offset'])
+        ):
+            scalars = list()
+            skeleton = list()
+            for data_type, offset in config['PlayerDataAddress'].items():
+                key = 'PlayerDataAddress.' + data_type
+                fmt = 'f' if self.is_data_a_float(data_type) else 'I'
+                if data_type in PlayerDataDecoder.SKELETON_DATA_TYPES:
+                    skeleton.append((
+                        key,
+                        read_plan.translate(
+                            offset + player_data_offset,
+                            ReadPlan.SKELETON_AXIS_SIZE
+                        )
+                    ))
+                else:
+                    scalars.append((
+                        key,
+                        self.__add_field(
+                            read_plan, offset + player_data_offset, fmt
+                        )
+                    ))
+            for data_type, offset in (
+                    config['EndBlockPlayerDataAddress'].items()
+            ):
+                scalars.append((
+                    'EndBlockPlayerDataAddress.' + data_type,
+                    self.__add_field(
+                        read_plan, offset + end_block_offset, 'I'
+                    )
+                ))
+            self.__players_data.append((scalars, skeleton))
+
+        # the struct fields follow the compact buffer order, the offsets are
+        # then replaced by the index of their value in the unpacked tuple.
+        fmt = ['<']
+        position = 0
+        indexes = dict()
+        for index, (compact_offset, field_format) in enumerate(
+                sorted(self.__fields.items())
+        ):
+            if compact_offset < position:
+                raise ValueError(
+                    'overlapping fields at compact offset {}'.format(
+                        compact_offset
+                    )
+                )
+            if compact_offset > position:
+                fmt.append('{}x'.format(compact_offset - position))
+            fmt.append(field_format)
+            position = compact_offset + ReadPlan.FIELD_SIZE
+            indexes[compact_offset] = index
+        self.__struct = struct.Struct(''.join(fmt))
+        del self.__fields
+
+        self.__game_data = [
+            (key, indexes[compact_offset])
+            for key, compact_offset in self.__game_data
+        ]
+        self.__players_data = [
+            (
+                [
+                    (key, indexes[compact_offset])
+                    for key, compact_offset in scalars
+                ],
+                skeleton
+            )
+            for scalars, skeleton in self.__players_data
+        ]
+
+    @staticmethod
+    def is_data_a_float(data_type):
+        """
+        """
+        return data_type in PlayerDataDecoder.FLOAT_DATA_TYPES
+
+    def decode(self, block):
+        """
+        Return the game data dictionary and the dictionaries of both players
+        decoded from the given SparseBlock. Each skeleton axis is a zero-copy
+        float view, with one item per joint, that keeps the block data alive.
+        """
+        data = memoryview(block.data)
+        values = self.__struct.unpack_from(data)
+        game_data = {
+            key: values[index] for key, index in self.__game_data
+        }
+        players_data = list()
+        for scalars, skeleton in self.__players_data:
+            player_data = {key: values[index] for key, index in scalars}
+            for key, compact_offset in skeleton:
+                player_data[key] = data[
+                    compact_offset:
+                    compact_offset + ReadPlan.SKELETON_AXIS_SIZE
+                ].cast('f')[::PlayerDataDecoder.SKELETON_JOINT_STRIDE]
+            players_data.append(player_data)
+        return (game_data, *players_data)
+
+    def __add_field(self, read_plan, offset, fmt):
+        compact_offset = read_plan.translate(offset)
+        previous_fmt = self.__fields.setdefault(compact_offset, fmt)
+        if previous_fmt != fmt:
+            raise ValueError(
+                'field at {} decoded both as {} and {}'.format(
+                    hex(offset), previous_fmt, fmt
+                )
+            )
+        return compact_offset
@@ -27,17 +27,20 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+from memory.source import MemorySource
 from win32.defines import SIZE_OF, ULONGLONG
-import win32.kernel32 as kernel32
 
 class ProcessIO():
     """
     """
-    def __init__(self, config, pid, module_address):
+    def __init__(self, config, pid, module_address, memory_source=None):
         self.pid = pid
         self.module_address = module_address
         self.config = config
         self.reacquire_module_address = True
+        if memory_source is None:
+            memory_source = MemorySource.for_platform()
+        self.memory_source = memory_source
 
     def set_process_info(self, pid, module_address):
         """
@@ -55,12 +58,12 @@ class ProcessIO():
             # )
         )
 
-    def get_pointer_value(self, process_handle, address):
+    def get_pointer_value(self, address):
         """
         """
         try:
-            address = kernel32.read_process_memory(
-                process_handle, address, SIZE_OF(ULONGLONG)
+            address = self.memory_source.read(
+                self.pid, address, SIZE_OF(ULONGLONG)
             )
             return int.from_bytes(address, byteorder='little')
         except OSError:
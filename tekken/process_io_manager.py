@@ -30,10 +30,8 @@
 from collections import defaultdict
 import sys
 
-import module_enumerator
-import pid_searcher
 from config.reloadable_config_manager import ReloadableConfigManager
-import win32.kernel32 as kernel32
+from memory.source import MemorySource
 
 from .game_reader import TekkenGameReader
 from .process_writer import TekkenGameWritter
@@ -43,7 +41,7 @@ class ProcessIOManager():
     """
     PROCESS_NAME = 'TekkenGame-Win64-Shipping.exe'
 
-    def __init__(self):
+    def __init__(self, memory_source=None):
         self.__config_manager = ReloadableConfigManager()
         self.memory_config = self.__config_manager.add_config(
             'memory_address.ini', parse=True
@@ -52,27 +50,29 @@ class ProcessIOManager():
             'overwrite_default.ini', parse=True
         )
 
-        self.__callback = kernel32.wait_or_timer_callback(
-            self.__tekken_process_terminated
-        )
         self.__process_info_update_required = False
         self.__print_pid_message = True
-        self.__wait_handle = None
+        if memory_source is None:
+            memory_source = MemorySource.for_platform()
+        self.__memory_source = memory_source
 
-        pid = ProcessIOManager.__get_process_pid()
+        pid = self.__get_process_pid()
 
-        self.process_reader = TekkenGameReader(self.memory_config, pid)
+        self.process_reader = TekkenGameReader(
+            self.memory_config, pid, memory_source=self.__memory_source
+        )
         self.process_writer = TekkenGameWritter(
             {
                 'overwrite': self.memory_config['overwrite'],
                 'default': default_overwrite_config['overwrite_default']
             },
-            pid
+            pid,
+            memory_source=self.__memory_source
         )
         if self.is_pid_valid():
             sys.stdout.write('Tekken PID acquired: {}'.format(pid))
             self.__register_for_tekken_terminated_state(pid)
-            module_address = ProcessIOManager.__get_process_module_address(pid)
+            module_address = self.__get_process_module_address(pid)
             self.process_reader.module_address = module_address
             self.process_writer.module_address = module_address
             self.process_writer.update_overwriters()
@@ -83,47 +83,42 @@ class ProcessIOManager():
             and self.process_writer.is_pid_valid()
         )
 
-    def update(self, rollback_frame=0):
+    def update(self, rollback_frame=0, last_frame_count=None):
         if self.__process_info_update_required:
             self.__update_process_info()
 
         try:
             self.process_writer.update()
             return self.process_reader.get_updated_state(
-                rollback_frame=rollback_frame
+                rollback_frame=rollback_frame,
+                last_frame_count=last_frame_count
             )
         except OSError:
+            self.__memory_source.invalidate()
             self.__process_info_update_required = True
             return defaultdict(lambda: None)
 
-    def read_update(self, rollback_frame=0):
-        try:
-            return self.process_reader.get_updated_state(
-                rollback_frame=rollback_frame
-            )
-        except OSError:
-            self.__process_info_update_required = True
-            return None
+    def close(self):
+        """
+        Release the resources of the memory source, like the process handles.
+        """
+        self.__memory_source.close()
 
-    @staticmethod
-    def __get_process_pid():
-        return pid_searcher.get_pid_by_unique_process_name(
-            ProcessIOManager.PROCESS_NAME
-        )
+    def __get_process_pid(self):
+        return self.__memory_source.get_pid(ProcessIOManager.PROCESS_NAME)
 
-    @staticmethod
-    def __get_process_module_address(pid):
+    def __get_process_module_address(self, pid):
         sys.stdout.write(
             'Trying to acquire Tekken library in PID: {}'.format(pid)
         )
-        return module_enumerator.get_module_base_address(
+        return self.__memory_source.get_module_base_address(
             pid, ProcessIOManager.PROCESS_NAME
         )
 
     def __update_process_info(self):
         self.__process_info_update_required = False
 
-        pid = ProcessIOManager.__get_process_pid()
+        pid = self.__get_process_pid()
         self.process_reader.pid = pid
         self.process_writer.pid = pid
 
@@ -131,7 +126,7 @@ class ProcessIOManager():
             self.__print_pid_message = True
             sys.stdout.write('Tekken PID acquired: {}'.format(pid))
 
-            module_address = ProcessIOManager.__get_process_module_address(pid)
+            module_address = self.__get_process_module_address(pid)
             self.process_reader.module_address = module_address
             self.process_writer.module_address = module_address
 
@@ -167,21 +162,14 @@ class ProcessIOManager():
                 self.__print_pid_message = False
 
     def __register_for_tekken_terminated_state(self, pid):
-        handle = kernel32.open_process(kernel32.SYNCHRONIZE, False, pid)
-        self.__wait_handle = kernel32.register_wait_for_single_object(
-            handle,
-            self.__callback,
-            None,
-            dw_flags=kernel32.WT_EXECUTEONLYONCE
+        self.__memory_source.register_termination_callback(
+            pid, self.__tekken_process_terminated
         )
 
-    def __tekken_process_terminated(self, _lp_paramenter, _time_or_wait_fired):
+    def __tekken_process_terminated(self):
+        self.__memory_source.invalidate()
         self.process_writer.reacquire_everything()
         self.process_reader.reacquire_everything()
         sys.stdout.write(
             '{} process terminated'.format(ProcessIOManager.PROCESS_NAME)
         )
-        try:
-            kernel32.unregister_wait(self.__wait_handle)
-        except OSError:
-            pass
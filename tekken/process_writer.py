@@ -36,8 +36,10 @@ from .overwriters import AddressOverwriter, MultilevelPointerOverwriter
 class TekkenGameWritter(ProcessIO):
     """
     """
-    def __init__(self, config, pid, module_address=None):
-        super().__init__(config['overwrite'], pid, module_address)
+    def __init__(self, config, pid, module_address=None, memory_source=None):
+        super().__init__(
+            config['overwrite'], pid, module_address, memory_source
+        )
         self.overwriters = list()
 
         for key, address in self.config.items():
@@ -88,7 +90,7 @@ class TekkenGameWritter(ProcessIO):
             self.reacquire_module_address = False
             for overwriter in self.overwriters:
                 try:
-                    overwriter.update()
+                    overwriter.update(self.memory_source)
                 except OSError:
                     self.reacquire_everything()
                     raise
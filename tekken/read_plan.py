@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Sparse read plans over the rollback copies of the player data block.
+"""
+import bisect
+
+class ReadPlan():
+    """
+    Minimal set of coalesced byte ranges of a memory block covering a given
+    list of (offset, size) fields. Ranges closer than gap_threshold bytes are
+    merged into one, trading a few unused bytes for less ranges to read.
+    The ranges are packed back to back into a compact buffer, translate maps
+    block offsets to offsets inside that buffer.
+    """
+    DEFAULT_GAP_THRESHOLD = 0x400
+    FIELD_SIZE = 4
+    SKELETON_JOINTS = 23
+    # Our xyz coordinate is 32 bytes, a 4 byte x, y, and z value followed by
+    # five 4 byte values that don't change
+    SKELETON_JOINT_SIZE = 32
+    SKELETON_AXIS_SIZE = (
+        (SKELETON_JOINTS - 1) * SKELETON_JOINT_SIZE + FIELD_SIZE
+    )
+
+    def __init__(self, fields, gap_threshold=DEFAULT_GAP_THRESHOLD):
+        self.gap_threshold = gap_threshold
+        self.ranges = list()
+        for offset, size in sorted(fields):
+            if(
+                    self.ranges
+                    and offset - sum(self.ranges[-1]) <= gap_threshold
+            ):
+                start, previous_size = self.ranges[-1]
+                self.ranges[-1] = (
+                    start, max(previous_size, offset + size - start)
+                )
+            else:
+                self.ranges.append((offset, size))
+
+        self.__starts = list()
+        self.__compact_starts = list()
+        self.size = 0
+        for start, size in self.ranges:
+            self.__starts.append(start)
+            self.__compact_starts.append(self.size)
+            self.size += size
+
+    @staticmethod
+    def from_config(config, gap_threshold=None):
+        """
+        Compile the plan of every field the reader decodes from the player
+        data block given the parsed memory_address.ini.
+        """
+        offsets = config['MemoryAddressOffsets']
+        if gap_threshold is None:
+            gap_threshold = offsets.get(
+                'read_plan_gap_threshold', ReadPlan.DEFAULT_GAP_THRESHOLD
+            )
+        fields = list()
+        for player_offset in (0x0, offsets['p2_data_offset']):
+            for data_type, offset in config['PlayerDataAddress'].items():
+                size = ReadPlan.FIELD_SIZE
+                if data_type in ('x', 'y', 'z'):
+                    size = ReadPlan.SKELETON_AXIS_SIZE
+                fields.append((offset + player_offset, size))
+        for player_offset in (0x0, offsets['p2_end_block_offset']):
+            for offset in config['EndBlockPlayerDataAddress'].values():
+                fields.append((offset + player_offset, ReadPlan.FIELD_SIZE))
+        for offset in config['GameDataAddress'].values():
+            fields.append((offset, ReadPlan.FIELD_SIZE))
+        return ReadPlan(fields, gap_threshold)
+
+    def translate(self, offset, size=FIELD_SIZE):
+        """
+        Return the offset inside the compact buffer of the size bytes at the
+        given block offset.
+        """
+        index = bisect.bisect_right(self.__starts, offset) - 1
+        if index < 0:
+            raise ValueError(
+                'offset {} is not in the read plan'.format(hex(offset))
+            )
+        start, range_size = self.ranges[index]
+        if offset + size > start + range_size:
+            raise ValueError(
+                'offset {} is not in the read plan'.format(hex(offset))
+            )
+        return self.__compact_starts[index] + offset - start
+
+    def get_requests(self, address):
+        """
+        Return the (address, size) ranges to read for the block at address.
+        """
+        return [(address + start, size) for start, size in self.ranges]
+
+    def __repr__(self):
+        return 'ranges: {}, size: {}, gap_threshold: {}'.format(
+            [(hex(start), size) for start, size in self.ranges],
+            self.size,
+            self.gap_threshold
+        )
+
+class SparseBlock():
+    """
+    Compact copy of the read plan ranges of a block that can still be sliced
+    with block offsets.
+    """
+    def __init__(self, read_plan, data):
+        self.read_plan = read_plan
+        self.data = data
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            offset = self.read_plan.translate(key.start, key.stop - key.start)
+            return self.data[offset:offset + key.stop - key.start]
+        offset = self.read_plan.translate(key, 1)
+        return self.data[offset]
+
+    def __len__(self):
+        return len(self.data)
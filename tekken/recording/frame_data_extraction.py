@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Frame data extraction out of the match recordings.
+"""
+from collections import Counter, defaultdict
+import concurrent.futures
+import logging
+import sys
+
+from constants.event import EncyclopediaEvent
+from patterns.observer import Subscriber
+
+from ..encyclopedia import FrameDataEntry
+from ..launcher import Launcher
+from .replay_io_manager import ReplayIOManager
+
+class FrameDataTable():
+    """
+    Values of the FrameDataEntry observations merged per character and move
+    id, as the count of every observed value of each field. The frame
+    advantage fields only count the one set by each observation.
+    """
+    FIELDS = (
+        'input', 'move_str', 'hitType', 'startup', 'activeFrames', 'recovery',
+        'damage', 'onBlock', 'onNormalHit', 'onCounterHit'
+    )
+    FRAME_ADVANTAGE_FIELDS = ('onBlock', 'onNormalHit', 'onCounterHit')
+
+    def __init__(self):
+        self.frames = 0
+        self.moves = defaultdict(lambda: defaultdict(Counter))
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __getstate__(self):
+        return {
+            'frames': self.frames,
+            'moves': {
+                key: dict(fields) for key, fields in self.moves.items()
+            }
+        }
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.frames = state['frames']
+        for key, fields in state['moves'].items():
+            self.moves[key].update(fields)
+
+    def add(self, char_id, frame_data_entry: FrameDataEntry):
+        """
+        Count the values of a FrameDataEntry just observed.
+        """
+        fields = self.moves[(char_id, frame_data_entry.move_id)]
+        fields['observations'][None] += 1
+        for field in FrameDataTable.FIELDS:
+            if(
+                    field in FrameDataTable.FRAME_ADVANTAGE_FIELDS
+                    and field != frame_data_entry.lastObserved
+            ):
+                continue
+            fields[field][getattr(frame_data_entry, field)] += 1
+
+    def merge(self, other):
+        """
+        Add the counts of another table to this one.
+        """
+        self.frames += other.frames
+        for key, other_fields in other.moves.items():
+            fields = self.moves[key]
+            for field, values in other_fields.items():
+                fields[field].update(values)
+
+    def to_dict(self):
+        """
+        Return the table as a JSON serializable dict of characters and move
+        ids, each field holding its most observed value, the number of
+        observations conflicting with it, and the distribution of the
+        observed values.
+        """
+        characters = defaultdict(dict)
+        for (char_id, move_id), fields in sorted(self.moves.items()):
+            move = {'observations': fields['observations'][None]}
+            for field in FrameDataTable.FIELDS:
+                values = fields.get(field)
+                if not values:
+                    continue
+                value, count = values.most_common(1)[0]
+                move[field] = {
+                    'value': value,
+                    'conflicts': sum(values.values()) - count,
+                    'distribution': {
+                        str(observed_value): observed_count
+                        for observed_value, observed_count
+                        in values.most_common()
+                    }
+                }
+            characters[str(char_id)][str(move_id)] = move
+        return characters
+
+class _NullStream():
+    """
+    Standard output replacement dropping the console messages of the
+    encyclopedias.
+    """
+    def write(self, data):
+        """
+        """
+
+    def flush(self):
+        """
+        """
+
+def extract_frame_data(path):
+    """
+    Replay a RAW recording through headless encyclopedias and return the
+    FrameDataTable of the moves of both players.
+    """
+    game_io_manager = ReplayIOManager(path)
+    table = FrameDataTable()
+    char_ids = game_io_manager.process_reader.recording_reader.header[
+        'char_ids'
+    ]
+    launcher = Launcher(None, game_io_manager=game_io_manager)
+    # the encyclopedia of player one reports the moves of player one
+    launcher.encyclopedia_publisher.register(
+        EncyclopediaEvent.FRAME_DATA, Subscriber(),
+        lambda frame_data_entry, is_player_one: table.add(
+            char_ids[0 if is_player_one else 1], frame_data_entry
+        )
+    )
+
+    stdout = sys.stdout
+    sys.stdout = _NullStream()
+    try:
+        launcher.run_headless()
+    finally:
+        sys.stdout = stdout
+    game_io_manager.process_reader.recording_reader.close()
+    table.frames = game_io_manager.process_reader.replayed_frame_count
+    return table
+
+def _initialize_worker():
+    # the encyclopedias log every frame
+    logging.disable(logging.DEBUG)
+
+def extract_frame_data_batch(paths, max_workers=None):
+    """
+    Extract the frame data of the recordings in a pool of processes. Return
+    an iterator over the (path, FrameDataTable or exception) of every
+    recording, as they get done.
+    """
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers, initializer=_initialize_worker
+    ) as executor:
+        futures = {
+            executor.submit(extract_frame_data, path): path for path in paths
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as exception:  # pylint: disable=broad-except
+                yield futures[future], exception
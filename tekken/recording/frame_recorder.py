@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Binary match recorder.
+"""
+from array import array
+import json
+import operator
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+
+from patterns.observer import Subscriber
+
+from ..launcher import Launcher
+from ..match_history import MatchHistory
+from . import recording_format
+from .recording_format import Compression, Encoding, EventKind, RecordKind
+
+class FrameRecorder():
+    """
+    Record the frames of a launcher into chunked binary files, one for each
+    pair of characters and movelists.
+
+    On every successful update, the poll loop only puts the new frames in a
+    queue: the read plan bytes of their player data blocks for the RAW
+    encoding, or their GameSnapshot for the SNAPSHOT one, along with the
+    round, punish and combo events they start. A background thread encodes,
+    compresses and writes them, and the index of the chunks and events once
+    the recording gets closed.
+    """
+    DEFAULT_DIRECTORY = 'recordings'
+    CHUNK_RECORDS = 600
+
+    __FRAME_GETTER = operator.attrgetter(*MatchHistory.FRAME_FIELDS)
+    __PLAYER_GETTER = operator.attrgetter(*MatchHistory.PLAYER_FIELDS)
+    __CLOSE_FILE = object()
+    __STOP = object()
+
+    def __init__(
+            self, launcher: Launcher, directory=DEFAULT_DIRECTORY,
+            encoding=Encoding.RAW, compression=None
+    ):
+        self.__launcher = launcher
+        self.directory = directory
+        self.encoding = encoding
+        if compression is None:
+            compression = Compression.get_default()
+        self.compression = compression
+        self.path = None
+
+        self.__queue = queue.Queue()
+        self.__last_frame_count = None
+        self.__session = None
+        self.__last_timer = None
+        self.__combos = [None, None]
+        self.__punish_window_counts = [
+            len(launcher.cyclopedia_p1.punish_windows),
+            len(launcher.cyclopedia_p2.punish_windows)
+        ]
+
+        self.__file = None
+        self.__file_key = None
+        self.__payload = bytearray()
+        self.__record_count = 0
+        self.__first_frame_count = None
+        self.__last_chunk_frame_count = None
+        self.__last_written_frame_count = -1
+        self.__chunk_index = list()
+        self.__events = list()
+        self.__pending_session_events = list()
+
+        self.__subscriber = Subscriber()
+        # the first update of the launcher dispatches INITIALIZED instead
+        self.__launcher.publisher.register(
+            Launcher.Event.INITIALIZED, self.__subscriber,
+            self.__record_initialization
+        )
+        self.__launcher.publisher.register(
+            Launcher.Event.UPDATED, self.__subscriber, self.__record
+        )
+        self.__launcher.publisher.register(
+            Launcher.Event.CLOSED, self.__subscriber, self.close_file
+        )
+        self.__writer_thread = threading.Thread(
+            target=self.__write_records, daemon=True
+        )
+        self.__writer_thread.start()
+
+    def close_file(self):
+        """
+        Write the pending frames and close the current recording, the next
+        frame starts a new one.
+        """
+        self.__session = None
+        self.__last_frame_count = None
+        self.__last_timer = None
+        self.__combos = [None, None]
+        self.__queue.put(FrameRecorder.__CLOSE_FILE)
+
+    def stop(self):
+        """
+        Stop recording, and wait for the pending frames to be written.
+        """
+        for event in (
+                Launcher.Event.INITIALIZED, Launcher.Event.UPDATED,
+                Launcher.Event.CLOSED
+        ):
+            self.__launcher.publisher.unregister(event, self.__subscriber)
+        self.__queue.put(FrameRecorder.__STOP)
+        self.__writer_thread.join()
+
+    def __record_initialization(self):
+        self.__record(bool(self.__launcher.game_state.state_log))
+
+    def __record(self, success):
+        if not success:
+            return
+        game_state = self.__launcher.game_state
+        reader = game_state.get_reader()
+        # the snapshots as read, regardless of the flipped perspective
+        state_log = game_state.state_log
+        if game_state.is_mirrored:
+            state_log = game_state.mirrored_state_log
+
+        if(
+                self.__last_frame_count is not None
+                and state_log[-1].frame_count < self.__last_frame_count
+        ):
+            # the frame count starts over on a new match, even a rematch
+            # between the same characters gets its own recording
+            self.close_file()
+
+        session = (
+            reader.p1_movelist_parser, reader.p2_movelist_parser,
+            reader.p1_movelist_to_use, reader.p2_movelist_to_use,
+            reader.opponent_name, reader.is_player_player_one
+        )
+        if(
+                self.__session is None
+                or any(map(operator.is_not, session, self.__session))
+        ):
+            self.__session = session
+            last_state = state_log[-1]
+            self.__queue.put((
+                RecordKind.SESSION, session,
+                (last_state.bot.char_id, last_state.opp.char_id),
+                reader.config, reader.get_read_plan()
+            ))
+
+        states = list()
+        for state in reversed(state_log):
+            if(
+                    self.__last_frame_count is not None
+                    and state.frame_count <= self.__last_frame_count
+            ) or (states and state.frame_count >= states[-1].frame_count):
+                break
+            states.append(state)
+        states.reverse()
+
+        if self.encoding == Encoding.RAW:
+            frames = [
+                (frame_count, data_frame.data)
+                for frame_count, data_frame in reader.last_player_data_frames
+            ]
+        else:
+            frames = [(state.frame_count, state) for state in states]
+
+        for index, (frame_count, frame) in enumerate(frames):
+            if(
+                    self.__last_frame_count is None
+                    or frame_count > self.__last_frame_count
+            ):
+                self.__queue.put((
+                    RecordKind.FRAME, frame_count, index < len(frames) - 1,
+                    frame
+                ))
+        if frames:
+            self.__last_frame_count = frames[-1][0]
+        self.__record_events(states)
+
+    def __record_events(self, states):
+        for state in states:
+            if(
+                    self.__last_timer is None
+                    or state.timer_frames_remaining > self.__last_timer
+            ):
+                self.__queue.put(
+                    (EventKind.ROUND, state.frame_count, 0, 0)
+                )
+            self.__last_timer = state.timer_frames_remaining
+
+            for player, bot in enumerate((state.bot, state.opp)):
+                combo = self.__combos[player]
+                if bot.combo_counter:
+                    if combo is None:
+                        self.__combos[player] = [
+                            state.frame_count, bot.combo_damage
+                        ]
+                    else:
+                        combo[1] = max(combo[1], bot.combo_damage)
+                elif combo is not None:
+                    self.__queue.put(
+                        (EventKind.COMBO, combo[0], player, combo[1])
+                    )
+                    self.__combos[player] = None
+
+        if not states:
+            return
+        for player, cyclopedia in enumerate(
+                (self.__launcher.cyclopedia_p1, self.__launcher.cyclopedia_p2)
+        ):
+            punish_windows = cyclopedia.punish_windows
+            for punish_window in punish_windows[
+                    self.__punish_window_counts[player]:
+            ]:
+                self.__queue.put((
+                    EventKind.PUNISH, states[-1].frame_count, player,
+                    int(punish_window.move_id)
+                ))
+            self.__punish_window_counts[player] = len(punish_windows)
+
+    def __write_records(self):
+        while True:
+            item = self.__queue.get()
+            try:
+                if(
+                        item is FrameRecorder.__STOP
+                        or item is FrameRecorder.__CLOSE_FILE
+                ):
+                    self.__close_file()
+                elif item[0] is RecordKind.SESSION:
+                    self.__write_session(*item[1:])
+                elif self.__file is None:
+                    continue
+                elif item[0] is RecordKind.FRAME:
+                    self.__write_frame(*item[1:])
+                else:
+                    self.__events.append(item)
+            except OSError as exception:
+                sys.stdout.write(
+                    'Match recording error: {}'.format(exception)
+                )
+                self.__discard_file()
+            except Exception:  # pylint: disable=broad-except
+                # the thread keeps draining the queue whatever happens
+                traceback.print_exc()
+                self.__discard_file()
+            if item is FrameRecorder.__STOP:
+                return
+
+    def __write_session(self, session, char_ids, config, read_plan):
+        (
+            p1_movelist_parser, p2_movelist_parser, p1_movelist_to_use,
+            p2_movelist_to_use, opponent_name, is_player_player_one
+        ) = session
+        movelist_digests = [
+            recording_format.get_movelist_digest(p1_movelist_parser),
+            recording_format.get_movelist_digest(p2_movelist_parser)
+        ]
+        file_key = (char_ids, tuple(movelist_digests))
+        if file_key != self.__file_key:
+            self.__close_file()
+            self.__open_file(
+                {
+                    'encoding': self.encoding.value,
+                    'compression': self.compression.value,
+                    'config_hash': recording_format.get_config_hash(config),
+                    'read_plan': read_plan.ranges,
+                    'read_plan_size': read_plan.size,
+                    'char_ids': list(char_ids),
+                    'movelist_digests': movelist_digests,
+                    'created': time.time()
+                }
+            )
+            self.__file_key = file_key
+
+        # its chunk offset is only known once the chunk gets written
+        session_event = [
+            EventKind.SESSION, self.__last_written_frame_count, 0, None
+        ]
+        self.__events.append(session_event)
+        self.__pending_session_events.append(session_event)
+        self.__add_record(
+            RecordKind.SESSION,
+            json.dumps({
+                'p1_movelist_to_use': p1_movelist_to_use,
+                'p2_movelist_to_use': p2_movelist_to_use,
+                'opponent_name': opponent_name,
+                'is_player_player_one': is_player_player_one
+            }).encode()
+        )
+        for player, movelist_parser in enumerate(
+                (p1_movelist_parser, p2_movelist_parser)
+        ):
+            if movelist_parser is not None:
+                self.__add_record(
+                    RecordKind.MOVELIST,
+                    recording_format.MOVELIST_HEADER.pack(
+                        player, movelist_parser.pointer
+                    ),
+                    movelist_parser.bytes
+                )
+
+    def __write_frame(self, frame_count, is_dropped, frame):
+        if self.encoding == Encoding.RAW:
+            kind = RecordKind.FRAME
+        else:
+            kind = RecordKind.SNAPSHOT
+            frame = FrameRecorder.__pack_snapshot(frame)
+        self.__add_record(
+            kind,
+            recording_format.FRAME_HEADER.pack(frame_count, is_dropped),
+            frame
+        )
+        if self.__first_frame_count is None:
+            self.__first_frame_count = frame_count
+        self.__last_chunk_frame_count = frame_count
+        self.__last_written_frame_count = frame_count
+        if self.__record_count >= FrameRecorder.CHUNK_RECORDS:
+            self.__write_chunk()
+
+    def __add_record(self, kind, *body):
+        self.__payload += recording_format.RECORD_HEADER.pack(
+            kind, sum(len(part) for part in body)
+        )
+        for part in body:
+            self.__payload += part
+        self.__record_count += 1
+
+    def __write_chunk(self):
+        if not self.__record_count:
+            return
+        compressed_payload = self.compression.get_compressor()(
+            bytes(self.__payload)
+        )
+        first_frame_count = self.__first_frame_count
+        last_frame_count = self.__last_chunk_frame_count
+        if first_frame_count is None:
+            first_frame_count = last_frame_count = -1
+        else:
+            self.__chunk_index.extend(
+                (first_frame_count, last_frame_count, self.__file.tell())
+            )
+        for session_event in self.__pending_session_events:
+            session_event[3] = self.__file.tell()
+        self.__pending_session_events.clear()
+        self.__file.write(
+            recording_format.CHUNK_HEADER.pack(
+                recording_format.CHUNK_TAG, len(compressed_payload),
+                len(self.__payload), self.__record_count, first_frame_count,
+                last_frame_count
+            )
+        )
+        self.__file.write(compressed_payload)
+        self.__file.flush()
+        self.__payload.clear()
+        self.__record_count = 0
+        self.__first_frame_count = None
+        self.__last_chunk_frame_count = None
+
+    def __open_file(self, header):
+        os.makedirs(self.directory, exist_ok=True)
+        name = os.path.join(
+            self.directory,
+            '{}_{}v{}'.format(
+                time.strftime('%Y_%m_%d_%H.%M.%S'), *header['char_ids']
+            )
+        )
+        self.path = name + recording_format.FILE_EXTENSION
+        # a rematch can start within the same second
+        suffix = 1
+        while os.path.exists(self.path):
+            suffix += 1
+            self.path = '{}_{}{}'.format(
+                name, suffix, recording_format.FILE_EXTENSION
+            )
+        self.__file = open(self.path, 'wb')
+        self.__file.write(recording_format.pack_file_header(header))
+
+    def __close_file(self):
+        if self.__file is not None:
+            self.__write_chunk()
+            self.__write_index()
+            self.__file.close()
+            self.__file = None
+        self.__file_key = None
+        self.__last_written_frame_count = -1
+        self.__chunk_index.clear()
+        self.__events.clear()
+        self.__pending_session_events.clear()
+        self.__payload.clear()
+        self.__record_count = 0
+        self.__first_frame_count = None
+        self.__last_chunk_frame_count = None
+
+    def __discard_file(self):
+        file = self.__file
+        self.__file = None
+        self.__close_file()
+        if file is not None:
+            try:
+                file.close()
+            except OSError:
+                pass
+
+    def __write_index(self):
+        index_offset = self.__file.tell()
+        self.__file.write(
+            recording_format.INDEX_HEADER.pack(
+                recording_format.INDEX_TAG,
+                len(self.__chunk_index) // recording_format.INDEX_CHUNK_FIELDS,
+                len(self.__events)
+            )
+        )
+        self.__file.write(array('q', self.__chunk_index).tobytes())
+        self.__file.write(
+            array(
+                'q', (value for event in self.__events for value in event)
+            ).tobytes()
+        )
+        self.__file.write(
+            recording_format.TRAILER.pack(
+                index_offset, recording_format.INDEX_MAGIC
+            )
+        )
+
+    @staticmethod
+    def __pack_snapshot(state):
+        return recording_format.SNAPSHOT.pack(
+            *FrameRecorder.__FRAME_GETTER(state),
+            *FrameRecorder.__PLAYER_GETTER(state.bot),
+            *FrameRecorder.__PLAYER_GETTER(state.opp),
+            *(
+                value
+                for bot in (state.bot, state.opp)
+                for axis in bot.skeleton
+                for value in axis
+            )
+        )
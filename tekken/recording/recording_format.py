@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Layout of the binary match recordings.
+
+A recording starts with the file header, the magic, the format version and
+the size of the JSON header that follows. Then come the chunks, each one a
+chunk header followed by its compressed payload, a sequence of records made
+of a record header and its body.
+
+A recording closed properly ends with an index and a trailer pointing to
+it. The index header is followed by the first and last frame counts and
+file offset of every chunk with frames, then by the kind, frame count,
+player and value of every event, all of them 8 byte integers, so they can
+be read in place as memoryview casts.
+"""
+import enum
+import hashlib
+import json
+import struct
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from ..match_history import MatchHistory
+from ..read_plan import ReadPlan
+
+MAGIC = b'TKBOTREC'
+VERSION = 1
+FILE_EXTENSION = '.tkrec'
+
+# magic, version, JSON header size
+FILE_HEADER = struct.Struct('<8sHI')
+# tag, compressed size, payload size, record count, first and last frame
+# counts
+CHUNK_HEADER = struct.Struct('<4sIIIqq')
+CHUNK_TAG = b'CHNK'
+# record kind, body size
+RECORD_HEADER = struct.Struct('<BI')
+# frame count, is dropped, followed by the frame data
+FRAME_HEADER = struct.Struct('<qB')
+# player, movelist address, followed by the movelist block
+MOVELIST_HEADER = struct.Struct('<BQ')
+# tag, chunk count, event count
+INDEX_HEADER = struct.Struct('<4sII')
+INDEX_TAG = b'INDX'
+INDEX_CHUNK_FIELDS = 3
+INDEX_EVENT_FIELDS = 4
+# index offset, index magic
+TRAILER = struct.Struct('<Q8s')
+INDEX_MAGIC = b'TKBOTIDX'
+# MatchHistory fields of the frame, bot and opp, followed by the x, y and z
+# skeleton axes of bot and opp
+SNAPSHOT = struct.Struct(
+    '<{}q{}f'.format(
+        len(MatchHistory.FRAME_FIELDS) + 2 * len(MatchHistory.PLAYER_FIELDS),
+        2 * 3 * ReadPlan.SKELETON_JOINTS
+    )
+)
+
+class RecordKind(enum.IntEnum):
+    """
+    FRAME holds the read plan bytes of a player data block, SNAPSHOT the
+    integer fields and skeletons of a decoded GameSnapshot, SESSION the JSON
+    of the reader values needed to build the snapshots, and MOVELIST the
+    movelist block of a player.
+    """
+    FRAME = 1
+    SNAPSHOT = 2
+    SESSION = 3
+    MOVELIST = 4
+
+class EventKind(enum.IntEnum):
+    """
+    ROUND is the first frame of a round. PUNISH is a punish window opened by
+    the encyclopedia of the player, with the move id as value. COMBO is the
+    first frame of a combo done by the player, with its damage as value.
+    SESSION is a session record, with the offset of its chunk as value.
+    """
+    ROUND = 1
+    PUNISH = 2
+    COMBO = 3
+    SESSION = 4
+
+class Encoding(enum.Enum):
+    """
+    """
+    RAW = 'raw'
+    SNAPSHOT = 'snapshot'
+
+class Compression(enum.Enum):
+    """
+    """
+    ZLIB = 'zlib'
+    ZSTD = 'zstd'
+
+    @staticmethod
+    def get_default():
+        """
+        Return ZSTD if the zstandard package is installed, ZLIB otherwise.
+        """
+        if zstandard is None:
+            return Compression.ZLIB
+        return Compression.ZSTD
+
+    def get_compressor(self):
+        """
+        Return a function compressing bytes with this compression.
+        """
+        if self == Compression.ZSTD:
+            return Compression.__get_zstandard().ZstdCompressor().compress
+        return zlib.compress
+
+    def get_decompressor(self):
+        """
+        Return a function decompressing bytes compressed with this
+        compression.
+        """
+        if self == Compression.ZSTD:
+            return Compression.__get_zstandard().ZstdDecompressor().decompress
+        return zlib.decompress
+
+    @staticmethod
+    def __get_zstandard():
+        if zstandard is None:
+            raise ValueError('zstd compression requires zstandard')
+        return zstandard
+
+def get_config_hash(config):
+    """
+    Return the SHA-256 hex digest of a parsed memory_address.ini, so a
+    recording can tell which addresses its data was read with.
+    """
+    return hashlib.sha256(
+        json.dumps(config.config, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+def get_movelist_digest(movelist_parser):
+    """
+    Return the SHA-256 hex digest of the movelist block of a MovelistParser,
+    or None if there is no parser.
+    """
+    if movelist_parser is None:
+        return None
+    return hashlib.sha256(movelist_parser.bytes).hexdigest()
+
+def pack_file_header(header):
+    """
+    Return the file header bytes of the given JSON header dict.
+    """
+    header_bytes = json.dumps(header, sort_keys=True).encode()
+    return FILE_HEADER.pack(MAGIC, VERSION, len(header_bytes)) + header_bytes
+
+def unpack_file_header(data):
+    """
+    Return the JSON header dict of a recording and the offset of its first
+    chunk, given its first bytes.
+    """
+    magic, version, header_size = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('not a match recording')
+    if version != VERSION:
+        raise ValueError('unsupported recording version: {}'.format(version))
+    end = FILE_HEADER.size + header_size
+    header = json.loads(bytes(data[FILE_HEADER.size:end]))
+    return header, end
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Reader of the binary match recordings.
+"""
+from array import array
+import bisect
+import mmap
+
+from . import recording_format
+from .recording_format import Compression, Encoding, EventKind, RecordKind
+
+class RecordingReader():
+    """
+    Read a recording written by the FrameRecorder through a read only
+    memory map. Its index is used in place as memoryview casts, so finding
+    the chunk of a frame is a binary search, and the chunks are decompressed
+    straight from the map. Recordings without index, like the ones of a
+    recorder that did not close, get their chunk index built by walking the
+    chunk headers.
+
+    The binary search needs frame counts that only go up, so in a recording
+    holding several matches, whose frame counts start over, only the chunks
+    of the first one are searched.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__data = memoryview(self.__map)
+        self.header, self.first_chunk_offset = (
+            recording_format.unpack_file_header(self.__data)
+        )
+        self.encoding = Encoding(self.header['encoding'])
+        self.compression = Compression(self.header['compression'])
+        self.__decompress = self.compression.get_decompressor()
+
+        self.chunks_end = len(self.__data)
+        self.__chunks = None
+        self.__events = None
+        trailer_offset = len(self.__data) - recording_format.TRAILER.size
+        if trailer_offset >= self.first_chunk_offset:
+            index_offset, index_magic = recording_format.TRAILER.unpack_from(
+                self.__data, trailer_offset
+            )
+            if index_magic == recording_format.INDEX_MAGIC:
+                self.__read_index(index_offset)
+        if self.__chunks is None:
+            self.__build_index()
+        # first and last frame counts and offsets of the chunks
+        end = 3 * self.__get_increasing_chunk_count()
+        self.__first_frame_counts = self.__chunks[0:end:3]
+        self.__last_frame_counts = self.__chunks[1:end:3]
+        self.__chunk_offsets = self.__chunks[2:end:3]
+
+    def close(self):
+        """
+        Release the memory map, the memoryviews returned by the reader must
+        not be in use anymore.
+        """
+        for view in (
+                self.__first_frame_counts, self.__last_frame_counts,
+                self.__chunk_offsets, self.__chunks, self.__events, self.__data
+        ):
+            if isinstance(view, memoryview):
+                view.release()
+        self.__map.close()
+
+    def get_chunk_count(self):
+        """
+        """
+        return len(self.__chunk_offsets)
+
+    def get_frame_count_range(self):
+        """
+        Return the first and last recorded frame counts, or None if there
+        are none.
+        """
+        if not self.get_chunk_count():
+            return None
+        return self.__first_frame_counts[0], self.__last_frame_counts[-1]
+
+    def find_chunk(self, frame_count):
+        """
+        Return the index of the chunk holding the given frame count, or the
+        first one after it. Raise ValueError if it is after the last one.
+        """
+        index = bisect.bisect_left(self.__last_frame_counts, frame_count)
+        if index == self.get_chunk_count():
+            raise ValueError(
+                'frame {} is not in the recording'.format(frame_count)
+            )
+        return index
+
+    def get_chunk_offset(self, chunk):
+        """
+        """
+        return self.__chunk_offsets[chunk]
+
+    def find_chunk_at_offset(self, offset):
+        """
+        Return the index of the last chunk starting at or before the given
+        file offset.
+        """
+        return max(bisect.bisect_right(self.__chunk_offsets, offset) - 1, 0)
+
+    def iterate_events(self, kind: EventKind = None):
+        """
+        Return an iterator over the (kind, frame_count, player, value) of the
+        indexed events, only the ones of the given kind if any.
+        """
+        events = self.__events
+        event_fields = recording_format.INDEX_EVENT_FIELDS
+        for index in range(0, len(events), event_fields):
+            event_kind = EventKind(events[index])
+            if kind is None or event_kind == kind:
+                yield (
+                    event_kind, events[index + 1], events[index + 2],
+                    events[index + 3]
+                )
+
+    def get_round_frame_counts(self):
+        """
+        """
+        return [
+            frame_count
+            for _, frame_count, _, _ in self.iterate_events(EventKind.ROUND)
+        ]
+
+    def iterate_records(self, chunk=0):
+        """
+        Return an iterator over the (RecordKind, body) of every record from
+        the given chunk index onwards, body being a memoryview of the
+        decompressed chunk payload.
+        """
+        if chunk < self.get_chunk_count():
+            offset = self.__chunk_offsets[chunk]
+        elif not chunk:
+            offset = self.first_chunk_offset
+        else:
+            return
+        while offset < self.chunks_end:
+            payload, record_count, offset = self.__read_chunk(offset)
+            yield from RecordingReader.iterate_payload_records(
+                payload, record_count
+            )
+
+    def iterate_chunk_records(self, chunk):
+        """
+        Return an iterator over the (RecordKind, body) of the records of the
+        given chunk index.
+        """
+        payload, record_count, _ = self.__read_chunk(
+            self.__chunk_offsets[chunk]
+        )
+        return RecordingReader.iterate_payload_records(payload, record_count)
+
+    @staticmethod
+    def iterate_payload_records(payload, record_count):
+        """
+        Return an iterator over the (RecordKind, body) of the records of a
+        decompressed chunk payload.
+        """
+        offset = 0
+        for _ in range(record_count):
+            kind, size = recording_format.RECORD_HEADER.unpack_from(
+                payload, offset
+            )
+            offset += recording_format.RECORD_HEADER.size
+            yield RecordKind(kind), payload[offset:offset + size]
+            offset += size
+
+    def __read_chunk(self, offset):
+        (
+            tag, compressed_size, payload_size, record_count, _, _
+        ) = self.__read_chunk_header(offset)
+        offset += recording_format.CHUNK_HEADER.size
+        payload = memoryview(
+            self.__decompress(self.__data[offset:offset + compressed_size])
+        )
+        if len(payload) != payload_size:
+            raise ValueError('corrupted recording chunk')
+        return payload, record_count, offset + compressed_size
+
+    def __read_chunk_header(self, offset):
+        if offset + recording_format.CHUNK_HEADER.size > self.chunks_end:
+            raise ValueError('truncated recording chunk')
+        chunk_header = recording_format.CHUNK_HEADER.unpack_from(
+            self.__data, offset
+        )
+        if chunk_header[0] != recording_format.CHUNK_TAG:
+            raise ValueError('invalid recording chunk')
+        return chunk_header
+
+    def __read_index(self, index_offset):
+        tag, chunk_count, event_count = (
+            recording_format.INDEX_HEADER.unpack_from(
+                self.__data, index_offset
+            )
+        )
+        if tag != recording_format.INDEX_TAG:
+            raise ValueError('invalid recording index')
+        start = index_offset + recording_format.INDEX_HEADER.size
+        end = start + 8 * recording_format.INDEX_CHUNK_FIELDS * chunk_count
+        self.__chunks = self.__data[start:end].cast('q')
+        start = end
+        end = start + 8 * recording_format.INDEX_EVENT_FIELDS * event_count
+        self.__events = self.__data[start:end].cast('q')
+        self.chunks_end = index_offset
+
+    def __get_increasing_chunk_count(self):
+        chunks = self.__chunks
+        last_frame_count = None
+        for chunk in range(len(chunks) // 3):
+            first_frame_count = chunks[3 * chunk]
+            if(
+                    last_frame_count is not None
+                    and first_frame_count <= last_frame_count
+            ) or chunks[3 * chunk + 1] < first_frame_count:
+                return chunk
+            last_frame_count = chunks[3 * chunk + 1]
+        return len(chunks) // 3
+
+    def __build_index(self):
+        self.__chunks = array('q')
+        self.__events = array('q')
+        offset = self.first_chunk_offset
+        while offset + recording_format.CHUNK_HEADER.size <= self.chunks_end:
+            _, compressed_size, _, _, first_frame_count, last_frame_count = (
+                self.__read_chunk_header(offset)
+            )
+            next_offset = (
+                offset + recording_format.CHUNK_HEADER.size + compressed_size
+            )
+            if next_offset > self.chunks_end:
+                break
+            if first_frame_count >= 0:
+                self.__chunks.extend(
+                    (first_frame_count, last_frame_count, offset)
+                )
+            offset = next_offset
+        # an unfinished chunk at the end is left out
+        self.chunks_end = offset
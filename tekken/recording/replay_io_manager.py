@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Replay of the binary match recordings.
+"""
+from collections import defaultdict
+import json
+
+from config.reloadable_config_manager import ReloadableConfigManager
+from memory.source import NullMemorySource
+
+from ..game_reader import TekkenGameReader
+from ..parsers import MovelistParser
+from ..read_plan import SparseBlock
+from . import recording_format
+from .recording_format import Encoding, EventKind, RecordKind
+from .recording_reader import RecordingReader
+
+class ReplayGameReader(TekkenGameReader):
+    """
+    Game reader whose updates come from a RAW recording instead of the
+    memory of the game process. Every update returns the next recorded
+    frame, along with the frames dropped before it.
+    """
+    def __init__(self, config, recording_reader: RecordingReader):
+        super().__init__(
+            config, 0, module_address=0, memory_source=NullMemorySource()
+        )
+        if recording_reader.encoding != Encoding.RAW:
+            raise ValueError(
+                'only {} recordings can be replayed'.format(
+                    Encoding.RAW.value
+                )
+            )
+        # the offsets inside the read ranges can differ as well
+        if(
+                list(map(list, self.get_read_plan().ranges))
+                != recording_reader.header['read_plan']
+                or recording_format.get_config_hash(config)
+                != recording_reader.header['config_hash']
+        ):
+            raise ValueError(
+                'the recording was read with another memory address config'
+            )
+        self.recording_reader = recording_reader
+        # frames returned by the updates, dropped ones included
+        self.replayed_frame_count = 0
+        self.__records = recording_reader.iterate_records()
+        self.__seek_frame_count = None
+        self.__last_recorded_frame_count = None
+
+    def reacquire_everything(self):
+        """
+        """
+        TekkenGameReader.reacquire_everything(self)
+        self.__records = iter(())
+        self.__last_recorded_frame_count = None
+
+    def seek(self, frame_count):
+        """
+        Make the next update return the given frame, or the first recorded
+        one after it, regardless of the last frame count of the game state.
+        Only the chunk of the frame and the one of its session get
+        decompressed. Raise ValueError if the frame is after the end of the
+        recording.
+        """
+        recording_reader = self.recording_reader
+        chunk = recording_reader.find_chunk(frame_count)
+        chunk_offset = recording_reader.get_chunk_offset(chunk)
+        session_offsets = [
+            offset for _, _, _, offset in recording_reader.iterate_events(
+                EventKind.SESSION
+            )
+            if offset <= chunk_offset
+        ]
+        if session_offsets:
+            session_chunk = recording_reader.find_chunk_at_offset(
+                session_offsets[-1]
+            )
+        else:
+            session_chunk = 0
+        for kind, body in recording_reader.iterate_chunk_records(
+                session_chunk
+        ):
+            if kind == RecordKind.SESSION:
+                self.__set_session(json.loads(bytes(body)))
+            elif kind == RecordKind.MOVELIST:
+                self.__set_movelist(body)
+            elif(
+                    session_chunk == chunk
+                    and recording_format.FRAME_HEADER.unpack_from(body)[0]
+                    >= frame_count
+            ):
+                break
+        self.__records = recording_reader.iterate_records(chunk)
+        self.__seek_frame_count = frame_count
+        self.__last_recorded_frame_count = None
+        self.pid = 0
+
+    def get_updated_state(self, rollback_frame=0, last_frame_count=None):
+        """
+        Raise StopIteration at the end of the recording.
+        """
+        if self.__seek_frame_count is not None:
+            last_frame_count = self.__seek_frame_count - 1
+        dropped_battles = list()
+        for kind, body in self.__records:
+            if kind == RecordKind.SESSION:
+                self.__set_session(json.loads(bytes(body)))
+                if self.__seek_frame_count is None:
+                    last_frame_count = None
+            elif kind == RecordKind.MOVELIST:
+                self.__set_movelist(body)
+            elif kind == RecordKind.FRAME:
+                frame_count, is_dropped = (
+                    recording_format.FRAME_HEADER.unpack_from(body)
+                )
+                if(
+                        self.__last_recorded_frame_count is not None
+                        and frame_count < self.__last_recorded_frame_count
+                ):
+                    # the frame count starts over on a new match
+                    last_frame_count = None
+                self.__last_recorded_frame_count = frame_count
+                if last_frame_count is not None:
+                    if frame_count <= last_frame_count:
+                        continue
+                game_snapshot = self.get_game_snapshot(
+                    SparseBlock(
+                        self.get_read_plan(),
+                        body[recording_format.FRAME_HEADER.size:]
+                    ),
+                    frame_count
+                )
+                if is_dropped:
+                    dropped_battles.append(game_snapshot)
+                else:
+                    self.reacquire_game_state = False
+                    self.is_in_battle = True
+                    self.__seek_frame_count = None
+                    self.replayed_frame_count += len(dropped_battles) + 1
+                    return {
+                        'battle': game_snapshot,
+                        'dropped_battles': dropped_battles,
+                        'controllers': None, 'graphics': None
+                    }
+        self.pid = -1
+        raise StopIteration
+
+    def __set_session(self, session):
+        self.p1_movelist_to_use = session['p1_movelist_to_use']
+        self.p2_movelist_to_use = session['p2_movelist_to_use']
+        self.opponent_name = session['opponent_name']
+        self.is_player_player_one = session['is_player_player_one']
+        self.reacquire_names = False
+
+    def __set_movelist(self, body):
+        player, movelist_address = (
+            recording_format.MOVELIST_HEADER.unpack_from(body)
+        )
+        movelist_block = bytes(body[recording_format.MOVELIST_HEADER.size:])
+        movelist_parser = MovelistParser(movelist_block, movelist_address)
+        # TODO: figure out the actual size of the name movelist
+        movelist_names = movelist_block[0x2E8:200000].split(b'\00')
+        if player == 0:
+            self.p1_movelist_parser = movelist_parser
+            self.p1_movelist_names = movelist_names
+        else:
+            self.p2_movelist_parser = movelist_parser
+            self.p2_movelist_names = movelist_names
+
+class ReplayIOManager():
+    """
+    Replacement of the ProcessIOManager, for TekkenGameState to run from a
+    RAW recording, as fast as it is updated, without the game.
+    """
+    def __init__(self, path, memory_config=None):
+        if memory_config is None:
+            config_manager = ReloadableConfigManager()
+            memory_config = (
+                config_manager.get_config('memory_address.ini')
+                or config_manager.add_config(
+                    'memory_address.ini', parse=True
+                )
+            )
+        self.process_reader = ReplayGameReader(
+            memory_config, RecordingReader(path)
+        )
+        self.process_writer = None
+
+    def seek(self, frame_count):
+        """
+        """
+        self.process_reader.seek(frame_count)
+
+    def is_pid_valid(self):
+        return self.process_reader.is_pid_valid()
+
+    def update(self, rollback_frame=0, last_frame_count=None):
+        try:
+            return self.process_reader.get_updated_state(
+                rollback_frame=rollback_frame,
+                last_frame_count=last_frame_count
+            )
+        except StopIteration:
+            return defaultdict(lambda: None)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Columnar copy of the fields the game state queries scan.
+"""
+from array import array
+import itertools
+import operator
+
+class StateColumns():
+    """
+    Struct of arrays ring buffer holding, for each player of the stored
+    snapshots, one preallocated integer array per field. Scanning a column
+    avoids going through every GameSnapshot and BotSnapshot attribute, and
+    lets the queries reduce whole windows with C level iterators.
+
+    Positions are the ones of the StateLog storage the columns belong to.
+    """
+    FIELDS = (
+        'move_id', 'move_timer', 'startup', 'recovery', 'complex_state',
+        'simple_state', 'stun_state', 'is_cancelable', 'is_bufferable',
+        'is_power_crush', 'is_parry1', 'is_parry2', 'is_jump'
+    )
+    __GETTER = operator.attrgetter(
+        'move_id', 'move_timer', 'startup', 'recovery', 'raw_complex_state',
+        'raw_simple_state', 'raw_stun_state', 'is_cancelable',
+        'is_bufferable', 'is_power_crush', 'is_parry1', 'is_parry2', 'is_jump'
+    )
+    __FIELD_INDEXES = {field: index for index, field in enumerate(FIELDS)}
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # bot and opp of the snapshots as stored
+        self.__players = tuple(
+            [array('q', [0]) * capacity for _ in StateColumns.FIELDS]
+            for _ in range(2)
+        )
+        self.__views = tuple(
+            [memoryview(column) for column in columns]
+            for columns in self.__players
+        )
+
+    def set(self, position, state):
+        """
+        Copy the fields of the given snapshot at the ring position.
+        """
+        position %= self.capacity
+        for columns, bot in zip(self.__players, (state.bot, state.opp)):
+            for column, value in zip(columns, StateColumns.__GETTER(bot)):
+                column[position] = value
+
+    def iterate(self, player, field, start, length, reverse=False):
+        """
+        Return a zero-copy iterator over the values of a field of the given
+        player, 0 for the stored snapshot bot and 1 for its opp, from the
+        start position onwards, in chronological order unless reversed.
+        """
+        view = self.__views[player][StateColumns.__FIELD_INDEXES[field]]
+        start %= self.capacity
+        end = start + length
+        if end <= self.capacity:
+            if reverse:
+                return iter(view[start:end][::-1])
+            return iter(view[start:end])
+        if reverse:
+            return itertools.chain(
+                view[:end - self.capacity][::-1], view[start:][::-1]
+            )
+        return itertools.chain(view[start:], view[:end - self.capacity])
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Fixed capacity history of game snapshots.
+"""
+from .move_index import MoveIndex
+from .state_columns import StateColumns
+
+class _Storage():
+    """
+    """
+    def __init__(self, capacity, columnar, indexed):
+        self.capacity = capacity
+        self.buffer = [None] * capacity
+        self.columns = StateColumns(capacity) if columnar else None
+        self.move_index = MoveIndex(capacity) if indexed else None
+        # number of snapshots ever appended
+        self.end = 0
+        self.size = 0
+
+class StateLog():
+    """
+    Ring buffer of the last capacity game snapshots. Appending is O(1) and,
+    like a list, it supports len, iteration, reversed, slicing and negative
+    indexing, which always refer to the frames visible from the current
+    frames_ago cursor. Moving the cursor travels back in time without copying
+    the log.
+
+    The snapshots are stored as read from the game. Views from the other
+    player perspective share the same storage but have their own cursor, and
+    swap bot and opp when a snapshot is accessed.
+
+    A columnar log also keeps the StateColumns fields of every snapshot,
+    available through iterate_column, and an indexed one the MoveIndex
+    spans of both players, available through iterate_moves.
+    """
+    DEFAULT_CAPACITY = 300
+
+    def __init__(
+            self, capacity=DEFAULT_CAPACITY, is_mirrored=False,
+            columnar=False, indexed=False, storage=None
+    ):
+        self.is_mirrored = is_mirrored
+        self.frames_ago = 0
+        if storage is None:
+            storage = _Storage(capacity, columnar, indexed)
+        self.__storage = storage
+
+    @property
+    def capacity(self):
+        """
+        """
+        return self.__storage.capacity
+
+    def get_view(self, is_mirrored):
+        """
+        Return a log sharing this log storage from the given perspective,
+        with its cursor in the present.
+        """
+        return StateLog(is_mirrored=is_mirrored, storage=self.__storage)
+
+    def append(self, state):
+        """
+        Add a snapshot, as read from the game, after the newest one, dropping
+        the oldest one if the log is full.
+        """
+        storage = self.__storage
+        storage.buffer[storage.end % storage.capacity] = state
+        if storage.columns is not None:
+            storage.columns.set(storage.end, state)
+        if storage.move_index is not None:
+            storage.move_index.append(storage.end, state)
+        storage.end += 1
+        if storage.size < storage.capacity:
+            storage.size += 1
+
+    def is_columnar(self):
+        """
+        """
+        return self.__storage.columns is not None
+
+    def iterate_column(self, player, field, reverse=False):
+        """
+        Return an iterator over the values of a StateColumns field of the
+        visible snapshots, for player 'bot' or 'opp' from this log
+        perspective, from the oldest to the newest one unless reversed.
+        """
+        length = len(self)
+        return self.__storage.columns.iterate(
+            (player == 'opp') != self.is_mirrored, field,
+            self.__storage.end - self.frames_ago - length, length, reverse
+        )
+
+    def iterate_moves(self, player):
+        """
+        Return an iterator over the MoveSpan of player 'bot' or 'opp', from
+        this log perspective, covering the visible snapshots from the newest
+        to the oldest one. Their first and last attributes are negative
+        indexes of this log.
+        """
+        end = self.__storage.end - self.frames_ago
+        return self.__storage.move_index.iterate(
+            (player == 'opp') != self.is_mirrored, end - len(self), end
+        )
+
+    def travel(self, frames_ago):
+        """
+        Hide the newest frames_ago snapshots, 0 returns to the present.
+        """
+        if frames_ago < 0:
+            raise ValueError('cannot travel to the future')
+        self.frames_ago = frames_ago
+
+    def clear(self):
+        """
+        """
+        storage = self.__storage
+        storage.buffer = [None] * storage.capacity
+        if storage.columns is not None:
+            storage.columns = StateColumns(storage.capacity)
+        if storage.move_index is not None:
+            storage.move_index.clear()
+        storage.end = 0
+        storage.size = 0
+        self.frames_ago = 0
+
+    def __get_state(self, position):
+        state = self.__storage.buffer[position % self.__storage.capacity]
+        if self.is_mirrored:
+            return state.from_mirrored()
+        return state
+
+    def __len__(self):
+        return max(0, self.__storage.size - self.frames_ago)
+
+    def __getitem__(self, index):
+        length = len(self)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(length))]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('state log index out of range')
+        return self.__get_state(
+            self.__storage.end - self.frames_ago - length + index
+        )
+
+    def __iter__(self):
+        length = len(self)
+        start = self.__storage.end - self.frames_ago - length
+        for position in range(start, start + length):
+            yield self.__get_state(position)
+
+    def __reversed__(self):
+        length = len(self)
+        start = self.__storage.end - self.frames_ago - length
+        for position in range(start + length - 1, start - 1, -1):
+            yield self.__get_state(position)
+
+    def __repr__(self):
+        return 'StateLog({}, capacity={}, frames_ago={}, mirrored={})'.format(
+            len(self), self.capacity, self.frames_ago, self.is_mirrored
+        )
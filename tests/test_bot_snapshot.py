@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Tests of the player snapshots built by the game reader.
+"""
+import random
+import unittest
+
+from config import ReloadableConfig
+from memory.source import NullMemorySource
+from tekken.bot_snapshot import BotSnapshot
+from tekken.game_reader import TekkenGameReader
+
+from benchmarks.synthetic_frames import get_bot_data_dict
+
+class TestMovelistToUse(unittest.TestCase):
+    """
+    """
+    P1_MOVELIST = 0x1000
+    P2_MOVELIST = 0x2000
+
+    def setUp(self):
+        self.config = ReloadableConfig('data/memory_address.ini', parse=True)
+        self.generator = random.Random(0)
+
+    def get_data_dict(self, movelist_to_use):
+        data_dict = get_bot_data_dict(self.config, self.generator, 0, False)
+        data_dict['PlayerDataAddress.movelist_to_use'] = movelist_to_use
+        return data_dict
+
+    def test_get_movelist_to_use_returns_the_read_value(self):
+        snapshot = BotSnapshot(self.get_data_dict(self.P1_MOVELIST))
+        self.assertEqual(snapshot.get_movelist_to_use(), self.P1_MOVELIST)
+
+    def test_use_opponent_movelist_compares_the_movelists(self):
+        reader = TekkenGameReader(
+            self.config, -1, module_address=0,
+            memory_source=NullMemorySource()
+        )
+        reader.p1_movelist_to_use = self.P1_MOVELIST
+        reader.p2_movelist_to_use = self.P2_MOVELIST
+        # player one copies the movelist of player two
+        p1_bot, p2_bot = reader.initialize_bots(
+            self.get_data_dict(self.P2_MOVELIST),
+            self.get_data_dict(self.P2_MOVELIST), 1, 1
+        )
+        self.assertTrue(p1_bot.use_opponents_movelist)
+        self.assertFalse(p2_bot.use_opponents_movelist)
+
+        p1_bot, p2_bot = reader.initialize_bots(
+            self.get_data_dict(self.P1_MOVELIST),
+            self.get_data_dict(self.P2_MOVELIST), 1, 2
+        )
+        self.assertFalse(p1_bot.use_opponents_movelist)
+        self.assertFalse(p2_bot.use_opponents_movelist)
+
+if __name__ == '__main__':
+    unittest.main()
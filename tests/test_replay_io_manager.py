@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2019, Alchemy Meister
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     * Redistributions of source code must retain the above copyright notice,
+#       this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice,this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the copyright holder nor the names of its
+#       contributors may be used to endorse or promote products derived from
+#       this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Tests of the checks done before replaying a recording.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from config import ReloadableConfig
+from memory.source import MemorySource
+from tekken.read_plan import ReadPlan
+from tekken.recording import RecordingReader, ReplayGameReader
+from tekken.recording import recording_format
+
+class TestReplayConfig(unittest.TestCase):
+    """
+    """
+    MEMORY_ADDRESS_PATH = 'data/memory_address.ini'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config = ReloadableConfig(
+            TestReplayConfig.MEMORY_ADDRESS_PATH, parse=True
+        )
+        self.readers = list()
+
+    def tearDown(self):
+        for recording_reader in self.readers:
+            recording_reader.close()
+        shutil.rmtree(self.directory)
+
+    def write_recording(self, config):
+        read_plan = ReadPlan.from_config(config)
+        path = os.path.join(
+            self.directory, 'match' + recording_format.FILE_EXTENSION
+        )
+        with open(path, 'wb') as file:
+            file.write(
+                recording_format.pack_file_header({
+                    'encoding': recording_format.Encoding.RAW.value,
+                    'compression': recording_format.Compression.ZLIB.value,
+                    'config_hash': recording_format.get_config_hash(config),
+                    'read_plan': read_plan.ranges,
+                    'read_plan_size': read_plan.size,
+                    'char_ids': [0, 0],
+                    'movelist_digests': [None, None],
+                    'created': 0
+                })
+            )
+        recording_reader = RecordingReader(path)
+        self.readers.append(recording_reader)
+        return recording_reader
+
+    def get_swapped_config(self):
+        # same read ranges, but each field at the offset of the other
+        with open(TestReplayConfig.MEMORY_ADDRESS_PATH) as file:
+            text = file.read()
+        text = text.replace('move_timer = ', 'move_timer_ = ', 1)
+        text = text.replace('move_id = ', 'move_timer = ', 1)
+        text = text.replace('move_timer_ = ', 'move_id = ', 1)
+        path = os.path.join(self.directory, 'memory_address.ini')
+        with open(path, 'w') as file:
+            file.write(text)
+        return ReloadableConfig(path, parse=True)
+
+    def test_same_config_is_replayed(self):
+        ReplayGameReader(self.config, self.write_recording(self.config))
+
+    def test_replay_on_an_unsupported_platform(self):
+        with mock.patch.object(
+                MemorySource, 'for_platform', side_effect=ValueError
+        ):
+            ReplayGameReader(self.config, self.write_recording(self.config))
+
+    def test_moved_offsets_are_rejected(self):
+        swapped_config = self.get_swapped_config()
+        self.assertEqual(
+            ReadPlan.from_config(swapped_config).ranges,
+            ReadPlan.from_config(self.config).ranges
+        )
+        with self.assertRaises(ValueError):
+            ReplayGameReader(self.config, self.write_recording(swapped_config))
+
+if __name__ == '__main__':
+    unittest.main()
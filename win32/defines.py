@@ -33,6 +33,7 @@ Common definitions.
 
 import ctypes
 import functools
+import sys
 
 # =============================================================================
 # This is used later on to calculate the list of exported symbols.
@@ -46,7 +47,17 @@ _ALL = set(vars().keys())
 BY_REF = ctypes.byref
 SIZE_OF = ctypes.sizeof
 POINTER = ctypes.POINTER
-WINDLL = ctypes.windll
+
+class _UnavailableLibrary():
+    """
+    Stands in for ctypes.windll on hosts without the Win32 API (e.g. Tekken
+    running under Proton on Linux). Any call fails with an OSError, the same
+    way a failed Win32 call would.
+    """
+    def __getattr__(self, name):
+        raise OSError('Win32 API not available on {}'.format(sys.platform))
+
+WINDLL = getattr(ctypes, 'windll', _UnavailableLibrary())
 
 class Structure(ctypes.Structure):
     """
@@ -878,6 +878,37 @@ def read_process_memory(h_process, lp_base_address, n_size):
         raise ctypes.WinError()
     return bytes(lp_buffer.raw)[:lp_number_of_bytes_read.value]
 
+def read_process_memory_into(h_process, lp_base_address, lp_buffer):
+    """
+    BOOL WINAPI ReadProcessMemory(
+        __in   HANDLE hProcess,
+        __in   LPCVOID lpBaseAddress,
+        __out  LPVOID lpBuffer,
+        __in   SIZE_T nSize,
+        __out  SIZE_T* lpNumberOfBytesRead
+    );
+
+    Reads directly into the given writable buffer (bytearray, memoryview...)
+    instead of allocating a new one. Returns the number of bytes read.
+    """
+
+    _read_process_memory = WINDLL.kernel32.ReadProcessMemory
+    _read_process_memory.argtypes = [
+        HANDLE, LPVOID, LPVOID, SIZE_T, POINTER(SIZE_T)
+    ]
+    _read_process_memory.restype = bool
+
+    n_size = len(lp_buffer)
+    c_buffer = (ctypes.c_char * n_size).from_buffer(lp_buffer)
+    lp_number_of_bytes_read = SIZE_T(0)
+    success = _read_process_memory(
+        h_process, lp_base_address, c_buffer,
+        n_size, BY_REF(lp_number_of_bytes_read)
+    )
+    if not success and get_last_error() != ERROR_PARTIAL_COPY:
+        raise ctypes.WinError()
+    return lp_number_of_bytes_read.value
+
 def write_process_memory(h_process, lp_base_address, lp_buffer, n_size=None):
     """
     BOOL WINAPI WriteProcessMemory(
@@ -1173,7 +1204,7 @@ def wait_for_single_object(h_handle, dw_milliseconds=INFINITE):
                 break
     return result
 
-WAIT_OR_TIMER_CALLBACK = ctypes.WINFUNCTYPE(
+WAIT_OR_TIMER_CALLBACK = getattr(ctypes, 'WINFUNCTYPE', ctypes.CFUNCTYPE)(
     None, PVOID, BOOL
 )
 
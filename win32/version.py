@@ -232,8 +232,13 @@ def _get_ntddi(osvi):
 # Current integer size in bits. See L{_get_bits} for more details.
 BITS = _get_bits()
 
-_OSVI = GET_VERISON_EX()
-
 # Current operating system as an NTDDI constant.
 # See L{_get_ntddi} for more details.
-NTDDI_VERSION = _get_ntddi(_OSVI)
+try:
+    _OSVI = GET_VERISON_EX()
+    NTDDI_VERSION = _get_ntddi(_OSVI)
+except OSError:
+    # No Win32 API available (non Windows host), Wine/Proton processes are
+    # handled as the newest supported version.
+    _OSVI = None
+    NTDDI_VERSION = NTDDI_VISTA